@@ -0,0 +1,354 @@
+"""Check that the point-in-triangle and point-to-line functions in
+pyglops agree (with an exact answer made using fractions) on random and
+degenerate inputs, and time each of them (no Kivy required).
+
+Usage (from the repo folder):
+python benchmarks/bench_geometry.py [case_count] [--seed n]
+The batched (numpy) versions are only checked and timed if numpy is
+installed. For each function, "wrong" counts clear cases (the point is
+not within 1e-5 of an edge, measured in barycentric coordinates) where
+the function disagrees with the exact answer, "near True" counts how
+many points near an edge were called inside, and "degenerate" shows
+what the function did for triangles with no area (errors are counted
+as "err").
+"""
+import os
+import sys
+import io
+import random
+import contextlib
+from fractions import Fraction
+from timeit import default_timer as best_timer
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_path)
+with contextlib.redirect_stdout(io.StringIO()):
+    from pyglops import *
+
+near_barycentric = 1e-5
+
+
+def random_vec3(size, offset=0.0):
+    return (random.uniform(-size, size) + offset,
+            random.uniform(-1.0, 1.0),
+            random.uniform(-size, size) + offset)
+
+
+def lerp_vec3(a, b, t):
+    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t,
+            a[2] + (b[2] - a[2]) * t)
+
+
+def barycentric_vec3(a, b, c, u, v):
+    w = 1.0 - u - v
+    return (a[0] * w + b[0] * u + c[0] * v,
+            a[1] * w + b[1] * u + c[1] * v,
+            a[2] * w + b[2] * u + c[2] * v)
+
+
+# Each case is (category, check_vec3, a_vec3, b_vec3, c_vec3).
+def new_cases(count):
+    results = []
+    for i in range(count):
+        a = random_vec3(10.0)
+        b = random_vec3(10.0)
+        c = random_vec3(10.0)
+        results.append(('random', random_vec3(12.0), a, b, c))
+        u = random.uniform(.01, .98)
+        v = random.uniform(.01, .99 - u)
+        results.append(('inside', barycentric_vec3(a, b, c, u, v),
+                        a, b, c))
+        # (same point, other winding)
+        results.append(('inside', barycentric_vec3(a, b, c, u, v),
+                        a, c, b))
+        results.append(('outside', barycentric_vec3(
+            a, b, c, random.uniform(-1.0, -.01), random.uniform(0, 1)),
+            a, b, c))
+        corner_i = random.randrange(3)
+        tri = (a, b, c)
+        results.append(('edge', lerp_vec3(
+            tri[corner_i], tri[(corner_i+1) % 3],
+            random.choice((0.0, .25, .5, 1.0))), a, b, c))
+        # a sliver (thin triangle) like the ones along walkmesh seams:
+        d = lerp_vec3(a, b, .5)
+        d = (d[0] + 1e-4, d[1], d[2] - 1e-4)
+        results.append(('sliver', barycentric_vec3(
+            a, b, d, random.uniform(0, 1), random.uniform(0, 1)),
+            a, b, d))
+        # far from the origin (where floats have less precision):
+        big = (random_vec3(1.0, 1e5), random_vec3(1.0, 1e5),
+               random_vec3(1.0, 1e5))
+        results.append(('far', random_vec3(1.0, 1e5), big[0], big[1],
+                        big[2]))
+        # no area (a repeated corner, or three corners on a line):
+        results.append(('degenerate', random_vec3(10.0), a, a, c))
+        # (nearly no area, since lerp rounds, so the exact answer
+        # depends on rounding that no float version can see):
+        results.append(('collinear', lerp_vec3(a, c, .5), a,
+                        lerp_vec3(a, c, .25), c))
+    return results
+
+
+# Get 'inside', 'outside', 'near' (within near_barycentric of an edge)
+# or 'degenerate' for the xz of check_vec3, using exact arithmetic.
+def get_exact_class(p, a, b, c):
+    p = (Fraction(p[0]), Fraction(p[2]))
+    a = (Fraction(a[0]), Fraction(a[2]))
+    b = (Fraction(b[0]), Fraction(b[2]))
+    c = (Fraction(c[0]), Fraction(c[2]))
+
+    def orient(p1, p2, p3):
+        return ((p2[0] - p1[0]) * (p3[1] - p1[1]) -
+                (p2[1] - p1[1]) * (p3[0] - p1[0]))
+
+    area = orient(a, b, c)
+    if area == 0:
+        return 'degenerate'
+    smallest = min(orient(b, c, p) / area, orient(c, a, p) / area,
+                   orient(a, b, p) / area)
+    if abs(smallest) <= near_barycentric:
+        return 'near'
+    if smallest > 0:
+        return 'inside'
+    return 'outside'
+
+
+def xz(v):
+    return (v[0], v[2])
+
+
+def get_triangle_functions():
+    # name: (function, convert case to args)
+    results = [
+        ('PointInTriangle', PointInTriangle,
+         lambda p, a, b, c: (xz(p), xz(a), xz(b), xz(c))),
+        ('is_in_triangle_HALFPLANES', is_in_triangle_HALFPLANES,
+         lambda p, a, b, c: (xz(p), xz(a), xz(b), xz(c))),
+        ('is_in_triangle_HALFPLANES_xz', is_in_triangle_HALFPLANES_xz,
+         lambda p, a, b, c: (p, a, b, c)),
+        ('is_in_triangle_coords', is_in_triangle_coords,
+         lambda p, a, b, c: (p[0], p[2], a[0], a[2], b[0], b[2], c[0],
+                             c[2])),
+        ('is_in_triangle_xz', is_in_triangle_xz,
+         lambda p, a, b, c: (p, a, b, c)),
+        ('is_in_triangle_vec2', is_in_triangle_vec2,
+         lambda p, a, b, c: (xz(p), xz(a), xz(b), xz(c))),
+    ]
+    if np is not None:
+        # (takes a numpy array since it uses tri[row, col])
+        results.insert(3, (
+            'PointInsideTriangle2_vec2', PointInsideTriangle2_vec2,
+            lambda p, a, b, c: (xz(p), np.array([xz(a), xz(b), xz(c)]))))
+    return results
+
+
+def get_best_time(fn, arg_lists, repeat_count):
+    best = None
+    for repeat_i in range(repeat_count):
+        start = best_timer()
+        for args in arg_lists:
+            try:
+                fn(*args)
+            except ZeroDivisionError:
+                pass
+        elapsed = best_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def check_triangle_functions(cases, repeat_count):
+    exact_classes = [get_exact_class(*case[1:]) for case in cases]
+    print("{:<30} {:>9} {:>6} {:>10} {:>17}".format(
+        "point in triangle", "ns/call", "wrong", "near True",
+        "degenerate T/F/err"))
+    vec2_results = None
+    for name, fn, to_args in get_triangle_functions():
+        arg_lists = [to_args(*case[1:]) for case in cases]
+        wrong_count = 0
+        near_true_count = 0
+        degenerate_counts = [0, 0, 0]
+        wrong_categories = set()
+        results = []
+        for case_i, args in enumerate(arg_lists):
+            exact_class = exact_classes[case_i]
+            try:
+                result = fn(*args)
+            except ZeroDivisionError:
+                result = None
+            results.append(result)
+            if exact_class == 'degenerate':
+                if result is None:
+                    degenerate_counts[2] += 1
+                elif result:
+                    degenerate_counts[0] += 1
+                else:
+                    degenerate_counts[1] += 1
+            elif exact_class == 'near':
+                if result:
+                    near_true_count += 1
+            elif (result is None) or \
+                    (bool(result) != (exact_class == 'inside')):
+                wrong_count += 1
+                wrong_categories.add(cases[case_i][0])
+        if name == 'is_in_triangle_vec2':
+            vec2_results = results
+        seconds = get_best_time(fn, arg_lists, repeat_count)
+        print("{:<30} {:>9.0f} {:>6} {:>10} {:>17}{}".format(
+            name, seconds / len(arg_lists) * 1e9, wrong_count,
+            near_true_count, "/".join(str(n) for n in degenerate_counts),
+            "" if len(wrong_categories) < 1 else
+            "  (" + ", ".join(sorted(wrong_categories)) + ")"))
+    if np is None:
+        print("numpy is not installed, so the batched versions were"
+              " not checked.")
+        return
+    points = np.array([xz(case[1]) for case in cases])
+    a_s = np.array([xz(case[2]) for case in cases])
+    b_s = np.array([xz(case[3]) for case in cases])
+    c_s = np.array([xz(case[4]) for case in cases])
+    batch_results = is_in_triangle_vec2_batch(points, a_s, b_s, c_s)
+    mismatch_count = 0
+    for case_i in range(len(cases)):
+        if bool(batch_results[case_i]) != bool(vec2_results[case_i]):
+            mismatch_count += 1
+    best = None
+    for repeat_i in range(repeat_count):
+        start = best_timer()
+        is_in_triangle_vec2_batch(points, a_s, b_s, c_s)
+        elapsed = best_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print("{:<30} {:>9.0f} (per row of {}; {} differ from"
+          " is_in_triangle_vec2)".format(
+        "is_in_triangle_vec2_batch", best / len(cases) * 1e9, len(cases),
+        mismatch_count))
+    # The walkmesh checks one point against the few triangles in a
+    # grid cell, so show where the batch starts being faster:
+    print("one point, n triangles:"
+          " is_in_triangle_vec2 loop vs batch (us)")
+    check_vec2 = xz(cases[0][1])
+    for tri_count in (1, 2, 4, 8, 16, 64, 256, 1024):
+        tris = [(xz(case[2]), xz(case[3]), xz(case[4]))
+                for case in cases[:tri_count]]
+        tri_array = np.array(tris)
+        loop_s = get_best_time(
+            lambda: [is_in_triangle_vec2(check_vec2, *tri)
+                     for tri in tris], [()], repeat_count)
+        batch_s = get_best_time(
+            lambda: is_in_triangle_vec2_batch(
+                check_vec2, tri_array[:, 0], tri_array[:, 1],
+                tri_array[:, 2]), [()], repeat_count)
+        print("  {:>5} {:>9.2f} {:>9.2f}".format(
+            len(tris), loop_s * 1e6, batch_s * 1e6))
+
+
+def check_line_functions(cases, repeat_count):
+    print("{:<30} {:>9} {:>6}".format("point to line", "ns/call",
+                                       "wrong"))
+    arg_lists = [(case[1], case[2], case[3]) for case in cases]
+
+    def exact_near_line_distance(p, b, c):
+        p = (Fraction(p[0]), Fraction(p[2]))
+        b = (Fraction(b[0]), Fraction(b[2]))
+        c = (Fraction(c[0]), Fraction(c[2]))
+        d = (c[0] - b[0], c[1] - b[1])
+        length_squared = d[0] * d[0] + d[1] * d[1]
+        t = Fraction(0)
+        if length_squared != 0:
+            t = ((p[0] - b[0]) * d[0] + (p[1] - b[1]) * d[1]) / \
+                length_squared
+            t = min(max(t, Fraction(0)), Fraction(1))
+        q = (b[0] + d[0] * t, b[1] + d[1] * t)
+        return float((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2)
+
+    def exact_line_distance(p, b, c):
+        pf = (Fraction(p[0]), Fraction(p[2]))
+        bf = (Fraction(b[0]), Fraction(b[2]))
+        cf = (Fraction(c[0]), Fraction(c[2]))
+        d = (cf[0] - bf[0], cf[1] - bf[1])
+        length_squared = d[0] * d[0] + d[1] * d[1]
+        if length_squared == 0:
+            return get_distance_vec3_xz(p, b)
+        cross = d[0] * (pf[1] - bf[1]) - d[1] * (pf[0] - bf[0])
+        return abs(float(cross)) / math.sqrt(float(length_squared))
+
+    def is_close(got, expected):
+        return abs(got - expected) <= 1e-6 * max(1.0, abs(expected))
+
+    near_expected = [exact_near_line_distance(*args) for args in arg_lists]
+    line_expected = [exact_line_distance(*args) for args in arg_lists]
+    near_results = [get_near_line_info_xz(*args) for args in arg_lists]
+    functions = [
+        ('get_near_line_info_xz', get_near_line_info_xz,
+         [near_result[1] for near_result in near_results],
+         near_expected),
+        ('get_distance_vec2_to_vec2line_xz',
+         get_distance_vec2_to_vec2line_xz,
+         [get_distance_vec2_to_vec2line_xz(*args) for args in arg_lists],
+         line_expected),
+    ]
+    for name, fn, results, expected in functions:
+        wrong_count = 0
+        for result_i in range(len(results)):
+            if not is_close(results[result_i], expected[result_i]):
+                wrong_count += 1
+        seconds = get_best_time(fn, arg_lists, repeat_count)
+        print("{:<30} {:>9.0f} {:>6}".format(
+            name, seconds / len(arg_lists) * 1e9, wrong_count))
+    if np is None:
+        return
+    # one point and many segments (as in walkmesh_grid_get_nearest_xz):
+    pos = cases[0][1]
+    b_s = np.array([case[2] for case in cases])
+    c_s = np.array([case[3] for case in cases])
+    points, distances = get_near_line_info_xz_batch(pos, b_s, c_s)
+    mismatch_count = 0
+    for case_i in range(len(cases)):
+        point, distance = get_near_line_info_xz(pos, cases[case_i][2],
+                                                cases[case_i][3])
+        if (distance != distances[case_i]) or \
+                (tuple(point) != tuple(points[case_i])):
+            mismatch_count += 1
+    loop_s = get_best_time(
+        lambda: [get_near_line_info_xz(pos, case[2], case[3])
+                 for case in cases], [()], repeat_count)
+    batch_s = get_best_time(
+        lambda: get_near_line_info_xz_batch(pos, b_s, c_s), [()],
+        repeat_count)
+    print("{:<30} {:>9.0f} (per row of {}, vs {:.0f} in a loop; {} differ"
+          " from get_near_line_info_xz)".format(
+        "get_near_line_info_xz_batch", batch_s / len(cases) * 1e9,
+        len(cases), loop_s / len(cases) * 1e9, mismatch_count))
+
+
+def main(args):
+    case_count = 2000
+    seed = 1
+    repeat_count = 5
+    while len(args) > 0:
+        if args[0] == "--seed" and len(args) > 1:
+            seed = int(args[1])
+            args = args[2:]
+        elif args[0].isdigit():
+            case_count = int(args[0])
+            args = args[1:]
+        else:
+            print("unknown argument: " + args[0])
+            return 1
+    random.seed(seed)
+    cases = new_cases(case_count)
+    print(str(len(cases)) + " cases (seed " + str(seed) + ", best of " +
+          str(repeat_count) + " runs):")
+    if np is not None:
+        # (PointInsideTriangle2_vec2 divides numpy floats by zero for
+        # degenerate triangles instead of raising ZeroDivisionError)
+        np.seterr(divide='ignore', invalid='ignore')
+    check_triangle_functions(cases, repeat_count)
+    print("")
+    check_line_functions(cases, repeat_count)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,253 @@
+"""Step scenes with N actors, items and projectiles without a window
+(see headlessglops) and report how fast the simulation runs.
+
+Usage (from the repo folder):
+python benchmarks/bench_scene.py [--scenes synthetic,stadium,...]
+    [--counts 10,50,100,200] [--ticks 600] [--memory-ticks 120]
+    [--csv path] [--json path]
+For each scene and N, the scene gets N chimps (with ai_enable, chasing
+the player) and N rocks (items), and for every 50 chimps one of them
+throws a rock each tick. The results are ticks per second, the median
+and 95th percentile of each step phase (see new_frame_profile), the
+memory allocated while stepping (peak, using tracemalloc) and the net
+change in allocated blocks.
+"""
+import os
+import sys
+import io
+import gc
+import json
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from timeit import default_timer as best_timer
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_path)
+from headlessglops import *
+
+# name: (OBJ path, part of the name of the walkmesh object)
+scene_infos = {
+    'synthetic': (None, "walkmesh"),
+    'stadium': (os.path.join(repo_path, "meshes",
+                             "stadium,primitive-simpler.obj"), "walkmesh"),
+    'forest': (os.path.join(repo_path, "meshes", "KivyForest.obj"),
+               "ground_cube"),
+    'office': (os.path.join(repo_path, "meshes",
+                            "OfficeInteriorWalkmesh.obj"), "floor"),
+}
+default_scene_names = ['synthetic', 'stadium', 'forest', 'office']
+default_counts = [10, 50, 100, 200]
+phase_names = ['ai', 'bump', 'movement', 'clip', 'frame']
+    # shown in the table (all phases are in the json file)
+
+
+def write_synthetic_obj(path, cells=40, cell_size=2.0):
+    # a flat grid (so the walkmesh has many triangles, as in a level)
+    lines = ["o Walkmesh_Plane"]
+    half = cells * cell_size / 2.0
+    for z_i in range(cells + 1):
+        for x_i in range(cells + 1):
+            lines.append("v %f 0.0 %f" % (x_i * cell_size - half,
+                                          z_i * cell_size - half))
+    for z_i in range(cells):
+        for x_i in range(cells):
+            a = z_i * (cells + 1) + x_i + 1  # (OBJ counts from 1)
+            b = a + 1
+            c = a + cells + 1
+            d = c + 1
+            lines.append("f %d %d %d" % (a, c, b))
+            lines.append("f %d %d %d" % (b, c, d))
+    with open(path, 'w') as outs:
+        outs.write("\n".join(lines) + "\n")
+
+
+def new_rock_item_dict():
+    item_dict = {}
+    item_dict['name'] = "rock"
+    item_dict['bump'] = "hide; obtain"
+    item_dict['uses'] = ['throw_arc']
+    item_dict['hit_damage'] = .3
+    item_dict['projectile_keys'] = ['hit_damage']
+    return item_dict
+
+
+def build_scene(obj_path, walkmesh_name, count, seed):
+    random.seed(seed)
+    scene = HeadlessGlops()
+    scene.load_obj(obj_path)
+    walkmesh_glop = None
+    for index in scene.get_indices_of_similar_names(walkmesh_name):
+        scene.use_walkmesh_at(index)
+        walkmesh_glop = scene.glops[index]
+        break
+    if walkmesh_glop is None:
+        raise ValueError("There is no '" + walkmesh_name + "' in " +
+                         obj_path)
+    walkmesh_glop.recalculate_bounds()
+    min_x = walkmesh_glop.get_min_x()
+    max_x = walkmesh_glop.get_max_x()
+    min_z = walkmesh_glop.get_min_z()
+    max_z = walkmesh_glop.get_max_z()
+    top_y = walkmesh_glop.get_max_y() + 1.0
+
+    def random_pos():
+        return (random.uniform(min_x, max_x), top_y,
+                random.uniform(min_z, max_z))
+
+    scene.player_glop.set_pos(random_pos())
+    player_index = scene.get_player_glop_index(1)
+    chimp_indices = []
+    for i in range(count):
+        chimp = scene.new_glop_method()
+        chimp.name = "chimp" + str(i)
+        chimp.properties['hit_radius'] = .5
+        chimp.set_pos(random_pos())
+        scene.ui.add_glop(chimp)
+        scene.set_as_actor_at(chimp.glop_index, {'ai_enable': True,
+                                                 'hp': 1.0})
+        chimp.actor_dict['target_index'] = player_index
+        chimp_indices.append(chimp.glop_index)
+    for i in range(count):
+        rock = scene.new_glop_method()
+        rock.name = "rock" + str(i)
+        rock.properties['hit_radius'] = .25
+        rock.set_pos(random_pos())
+        scene.ui.add_glop(rock)
+        scene.set_as_item_at(rock.glop_index, new_rock_item_dict())
+        scene.set_physics_enable_at(rock.glop_index, True)
+    # what is thrown (a copy of it, see throw_glop):
+    projectile = scene.new_glop_method()
+    projectile.name = "thrown rock"
+    projectile.properties['hit_radius'] = .25
+    scene.ui.add_glop(projectile, set_visible_enable=False)
+    throw_item_dict = new_rock_item_dict()
+    throw_item_dict['fires_glops'] = [projectile]
+    return scene, chimp_indices, throw_item_dict
+
+
+def run_ticks(scene, chimp_indices, throw_item_dict, tick_count,
+              first_tick=0):
+    tick_s = 1.0 / 60.0
+    throws_per_tick = (len(chimp_indices) + 49) // 50
+    for tick in range(first_tick, first_tick + tick_count):
+        for throw_i in range(throws_per_tick):
+            chimp = scene.glops[chimp_indices[
+                (tick * throws_per_tick + throw_i) % len(chimp_indices)]]
+            scene.throw_glop(chimp, throw_item_dict, None,
+                             this_use='throw_arc')
+        scene.update(tick_s)
+
+
+def bench_scene(scene_name, obj_path, walkmesh_name, count, tick_count,
+                memory_tick_count, seed):
+    result = {'scene': scene_name, 'n': count, 'ticks': tick_count}
+    settings['globals']['profile_frame_count'] = tick_count
+    # (hide the engine's messages)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = best_timer()
+        scene, chimp_indices, throw_item_dict = build_scene(
+            obj_path, walkmesh_name, count, seed)
+        result['build_s'] = best_timer() - start
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        start = best_timer()
+        run_ticks(scene, chimp_indices, throw_item_dict, tick_count)
+        elapsed = best_timer() - start
+        result['net_blocks'] = sys.getallocatedblocks() - blocks
+        # (read the frame profile now, since traced frames are slower
+        # and would replace timed frames in the rolling window)
+        result['phases'] = get_frame_profile_percentiles(
+            scene._frame_profile, percentiles=(50, 95, 99))
+        tracemalloc.start()
+        run_ticks(scene, chimp_indices, throw_item_dict,
+                  memory_tick_count, first_tick=tick_count)
+        result['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024.0
+        tracemalloc.stop()
+    result['ticks_per_s'] = tick_count / elapsed
+    result['glops'] = len(scene.glops)
+    return result
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the simulation without a window.")
+    parser.add_argument('--scenes', default=",".join(default_scene_names),
+                        help="any of " + ", ".join(scene_infos))
+    parser.add_argument('--counts',
+                        default=",".join(str(n) for n in default_counts),
+                        help="numbers of chimps (and of rocks)")
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--memory-ticks', type=int, default=120,
+                        help="ticks to run again while tracing memory")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--csv', help="also save the table here")
+    parser.add_argument('--json', help="also save all results here")
+    options = parser.parse_args(args)
+    counts = [int(n) for n in options.counts.split(",")]
+    synthetic_path = None
+    results = []
+    header = ("{:<10} {:>5} {:>6} {:>9} " +
+              " ".join(["{:>11}"] * len(phase_names)) +
+              " {:>10} {:>10}").format(
+        "scene", "n", "glops", "ticks/s",
+        *[name + " ms" for name in phase_names],
+        "peak KiB", "net blocks")
+    print(header)
+    print("{:<33} (each phase is p50/p95)".format(""))
+    for scene_name in options.scenes.split(","):
+        if scene_name not in scene_infos:
+            print("unknown scene '" + scene_name + "' (use any of " +
+                  ", ".join(scene_infos) + ")")
+            return 1
+        obj_path, walkmesh_name = scene_infos[scene_name]
+        if obj_path is None:
+            if synthetic_path is None:
+                synthetic_path = os.path.join(
+                    tempfile.mkdtemp(prefix="bench_scene-"),
+                    "synthetic.obj")
+                write_synthetic_obj(synthetic_path)
+            obj_path = synthetic_path
+        for count in counts:
+            result = bench_scene(scene_name, obj_path, walkmesh_name,
+                                 count, options.ticks,
+                                 options.memory_ticks, options.seed)
+            results.append(result)
+            phase_texts = []
+            for name in phase_names:
+                phase = result['phases'][name]
+                phase_texts.append("{:.2f}/{:.2f}".format(
+                    phase['p50'], phase['p95']))
+            print(("{:<10} {:>5} {:>6} {:>9.1f} " +
+                   " ".join(["{:>11}"] * len(phase_names)) +
+                   " {:>10.0f} {:>10}").format(
+                scene_name, count, result['glops'],
+                result['ticks_per_s'], *phase_texts,
+                result['peak_kib'], result['net_blocks']))
+    if synthetic_path is not None:
+        shutil.rmtree(os.path.dirname(synthetic_path))
+    if options.csv is not None:
+        with open(options.csv, 'w') as outs:
+            columns = ['scene', 'n', 'glops', 'ticks', 'build_s',
+                       'ticks_per_s', 'peak_kib', 'net_blocks']
+            phase_columns = []
+            for name in results[0]['phases']:
+                phase_columns += [name + "_p50_ms", name + "_p95_ms"]
+            outs.write(",".join(columns + phase_columns) + "\n")
+            for result in results:
+                values = [str(result[column]) for column in columns]
+                for name in result['phases']:
+                    values.append("%.4f" % result['phases'][name]['p50'])
+                    values.append("%.4f" % result['phases'][name]['p95'])
+                outs.write(",".join(values) + "\n")
+    if options.json is not None:
+        with open(options.json, 'w') as outs:
+            json.dump(results, outs, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""Time WObjFile.load on OBJ files (no Kivy required).
+
+Usage (from the repo folder):
+python benchmarks/bench_wobjfile.py [repeat_count] [obj_path ...]
+If no paths are given, the larger meshes in the meshes folder are used.
+"""
+import os
+import sys
+import io
+import contextlib
+from timeit import default_timer as best_timer
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_path)
+from wobjfile import WObjFile
+
+default_paths = [
+    os.path.join(repo_path, "meshes", "KivyForest.obj"),
+    os.path.join(repo_path, "meshes", "spaceship,simple-denapes.obj"),
+    os.path.join(repo_path, "meshes", "stadium,primitive.obj"),
+]
+
+
+def time_load(path, repeat_count):
+    best = None
+    for i in range(repeat_count):
+        # (hide the loader's per-object messages)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = best_timer()
+            wobjfile = WObjFile()
+            wobjfile.load(path)
+            elapsed = best_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main(args):
+    repeat_count = 10
+    if len(args) > 0 and args[0].isdigit():
+        repeat_count = int(args[0])
+        args = args[1:]
+    paths = args
+    if len(paths) < 1:
+        paths = default_paths
+    print("best of " + str(repeat_count) + " loads:")
+    for path in paths:
+        best = time_load(path, repeat_count)
+        size_mb = os.path.getsize(path) / 1024.0 / 1024.0
+        print("  {:<32} {:8.4f}s {:7.2f} MB/s".format(
+            os.path.basename(path), best, size_mb / best))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
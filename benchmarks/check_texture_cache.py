@@ -0,0 +1,62 @@
+"""Check that a texture in the texture cache (see acquire_texture in
+kivyglops) is shared by a glop and its copies, and can be evicted once
+the last of them is released. Requires Kivy (kivyglops opens a window).
+
+Usage (from the repo folder):
+python benchmarks/check_texture_cache.py [texture_path]
+"""
+import os
+import sys
+
+repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_path)
+from kivyglops import *
+
+default_path = os.path.join(repo_path, "meshes", "KivyForest-tree.png")
+
+
+def check(name, got, expected):
+    if got != expected:
+        print("FAILED: " + name + " is " + str(got) + " (expected " +
+              str(expected) + ")")
+        return False
+    print("ok: " + name + " is " + str(got))
+    return True
+
+
+def main(args):
+    path = default_path
+    if len(args) > 0:
+        path = args[0]
+    start_stats = get_texture_cache_stats()
+    this_glop = KivyGlop()
+    this_glop.set_texture_diffuse(path)
+    copy_glop = this_glop.copy_as_mesh_instance()
+    results = []
+    stats = get_texture_cache_stats()
+    results.append(check("textures added", stats['count'] -
+                         start_stats['count'], 1))
+    results.append(check("copy texture key",
+                         copy_glop._texture_cache_key,
+                         this_glop._texture_cache_key))
+    this_glop.release_resources()
+    trim_texture_cache(0)
+    stats = get_texture_cache_stats()
+    results.append(check("textures kept while the copy uses it",
+                         stats['count'] - start_stats['count'], 1))
+    copy_glop.release_resources()
+    stats = get_texture_cache_stats()
+    results.append(check("unused textures after releasing all",
+                         stats['unused_count'] -
+                         start_stats['unused_count'], 1))
+    trim_texture_cache(0)
+    stats = get_texture_cache_stats()
+    results.append(check("textures after trim_texture_cache(0)",
+                         stats['count'], 0))
+    if False in results:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
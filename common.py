@@ -7,6 +7,21 @@ import inspect
 verbose_enable = False
 debug_dict = dict()  # constantly-changing variables, for visual debug
 
+# A debug_dict value that is only formatted when the debug text is made
+# (push_yaml_text calls str on it), such as
+# DebugText(fixed_width, xyz, 6, " "), so a value that changes every
+# frame can be set every frame without formatting it every frame.
+class DebugText:
+    fn = None
+    args = None
+
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+
+    def __str__(self):
+        return str(self.fn(*self.args))
+
 def get_verbose_enable():
     return verbose_enable
 
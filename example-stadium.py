@@ -31,6 +31,10 @@ else:
 class MainScene(KivyGlops):
 
     def on_load_glops(self):
+        # To load several OBJ files, pass them all to self.load_objs and
+        # set settings['globals']['load_worker_count'] (see testing.py)
+        # so the uncached ones are converted in worker processes at the
+        # same time.
         self.load_obj("meshes/stadium,primitive.obj")
 
         walkmesh_enable = False
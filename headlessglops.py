@@ -0,0 +1,312 @@
+"""
+This module is a headless implementation of PyGlops (no window, GPU or
+Kivy). The transforms are plain objects with the same members as the
+Kivy instructions used by KivyGlop, so PyGlops step (ai, bumps, physics
+and walkmesh clipping) runs the same way as in KivyGlops, but can be
+run as fast as possible such as for tests and benchmarks:
+    scene = HeadlessGlops()
+    scene.load_obj("meshes/stadium,primitive.obj")
+    for i in range(10000):
+        scene.update(1.0 / 60.0)
+(update is step plus ending the frame for the frame profiler--see
+save_frame_profile).
+"""
+__author__ = 'Jake Gustafson'
+
+import copy
+import uuid
+from pyglops import *
+
+
+# same members as kivy.graphics.Translate (that PyGlops uses)
+class HeadlessTranslate:
+    x = None
+    y = None
+    z = None
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @property
+    def xyz(self):
+        return (self.x, self.y, self.z)
+
+    @xyz.setter
+    def xyz(self, value):
+        self.x, self.y, self.z = value
+
+
+# same members as kivy.graphics.Rotate (that PyGlops uses)
+class HeadlessRotate:
+    angle = None
+    axis = None
+
+    def __init__(self, angle=0.0, x=0.0, y=0.0, z=1.0):
+        self.angle = angle
+        self.axis = (x, y, z)
+
+
+class HeadlessGlop(PyGlop):
+    _t_ins = None
+    _r_ins_x = None
+    _r_ins_y = None
+    _r_ins_z = None
+
+    def __init__(self, default_templates=None):
+        super(HeadlessGlop, self).__init__(
+            default_templates=default_templates)
+        self._pivot_point = 0.0, 0.0, 0.0
+        self._t_ins = HeadlessTranslate(0.0, 0.0, 0.0)
+        self._r_ins_x = HeadlessRotate(0.0, 1.0, 0.0, 0.0)
+        self._r_ins_y = HeadlessRotate(0.0, 0.0, 1.0, 0.0)
+        self._r_ins_z = HeadlessRotate(0.0, 0.0, 0.0, 1.0)
+
+    def __str__(self):
+        return (str(type(self)) + " named " + str(self.name) + " at " +
+                str(self._t_ins.xyz))
+
+    def get_class_name(self):
+        return "HeadlessGlop"
+
+    def new_glop_method(self):
+        return HeadlessGlop()
+
+    def get_context(self):
+        return None  # nothing to draw
+
+    def get_pos(self):
+        return self._t_ins.xyz
+
+    def set_pos(self, pos):
+        self._t_ins.x = pos[0]
+        self._t_ins.y = pos[1]
+        self._t_ins.z = pos[2]
+        self._on_change_pos()
+
+    def set_coord(self, index, value):
+        if index == 0:
+            self._t_ins.x = value
+        elif index == 1:
+            self._t_ins.y = value
+        elif index == 2:
+            self._t_ins.z = value
+        else:
+            print("[ HeadlessGlop ] ERROR in set_coord: bad index " +
+                  str(index))
+            return
+        self._on_change_pos()
+
+    def get_coord(self, index):
+        if index == 0:
+            return self._t_ins.x
+        elif index == 1:
+            return self._t_ins.y
+        elif index == 2:
+            return self._t_ins.z
+        else:
+            print("[ HeadlessGlop ] ERROR in get_coord: bad index " +
+                  str(index))
+        return None
+
+    def get_angles(self):
+        return (self._r_ins_x.angle,
+                self._r_ins_y.angle,
+                self._r_ins_z.angle)
+
+    def set_angles(self, angles):
+        self._r_ins_x.angle = angles[0]
+        self._r_ins_y.angle = angles[1]
+        self._r_ins_z.angle = angles[2]
+
+    def get_angle(self, axis_index):
+        if axis_index == 0:
+            return self._r_ins_x.angle
+        elif axis_index == 1:
+            return self._r_ins_y.angle
+        elif axis_index == 2:
+            return self._r_ins_z.angle
+        return None
+
+    def set_angle(self, axis_index, angle):
+        if axis_index == 0:
+            self._r_ins_x.angle = angle
+        elif axis_index == 1:
+            self._r_ins_y.angle = angle
+        elif axis_index == 2:
+            self._r_ins_z.angle = angle
+        else:
+            print("[ HeadlessGlop ] ERROR in set_angle: " +
+                  str(axis_index) + " is out of range (dimension" +
+                  " should be 0, 1, or 2)")
+
+    def set_from_glop_data(self, glop_data):
+        super(HeadlessGlop, self).set_from_glop_data(glop_data)
+        if self.vertices is not None and self.get_has_hit_range():
+            self.calculate_hit_range()
+
+    def _on_change_pivot(self, previous_point=(0.0,0.0,0.0)):
+        super(HeadlessGlop, self)._on_change_pivot(
+            previous_point=previous_point, class_name="HeadlessGlop")
+        if self.get_has_hit_range():
+            self.calculate_hit_range()
+
+    def copy_as_mesh_instance(self, depth=0, ref_vertices_enable=True):
+        result = HeadlessGlop()
+        result.name = self.name
+        if ref_vertices_enable:
+            result.vertex_format = self.vertex_format
+            result.on_vertex_format_change()
+            result.vertices = self.vertices
+            result.indices = self.indices
+        else:
+            result.vertex_format = copy.deepcopy(self.vertex_format)
+            result.on_vertex_format_change()
+        result.properties['hit_radius'] = self.properties['hit_radius']
+        result.properties['hitbox'] = self.properties['hitbox']
+        result.set_pos(self.get_pos())
+        result.set_angles(self.get_angles())
+        return result
+
+
+# Stands in for KivyGlopsWindow (the methods PyGlops calls on ui).
+class HeadlessGlopsWindow:
+    scene = None
+    dummy_glop = None
+
+    def __init__(self):
+        self.dummy_glop = HeadlessGlop()
+
+    def get_keycode(self, key_name):
+        return None  # no keyboard
+
+    def set_debug_label(self, text):
+        pass
+
+    def update_debug_label(self):
+        pass
+
+    def suspend_debug_label_update(self, enable):
+        pass
+
+    def set_primary_item_caption(self, text):
+        pass
+
+    def spawn_pex_particles(self, path, pos, radius=1.0,
+                            duration_seconds=None):
+        pass
+
+    def add_glop(self, this_glop, set_visible_enable=None):
+        if this_glop.name is None:
+            this_glop.name = str(uuid.uuid4())
+        if set_visible_enable is not None:
+            this_glop.state['visible_enable'] = set_visible_enable
+        if self.scene.glops is None:
+            self.scene.glops = []
+        self.scene._claim_glop_index(this_glop)
+        self.scene.update_active_sets_at(this_glop.glop_index)
+
+
+class HeadlessGlops(PyGlops):
+
+    def __init__(self, new_ui=None):
+        self.ui = new_ui
+        if self.ui is None:
+            self.ui = HeadlessGlopsWindow()
+        self.ui.scene = self
+        super(HeadlessGlops, self).__init__(self.new_glop_method)
+        # (so runs are the same on any machine--see ai_budget_count)
+        self._ai_time_budget_enable = False
+        # same player as KivyGlops, but without a mesh:
+        self.player_glop = self.new_glop_method()
+        self.player_glop.name = "Player 1"
+        self.player_glop.properties['eye_height'] = 1.7
+        self.player_glop.properties['hit_radius'] = .2
+        self.player_glop.properties['reach_radius'] = 2.5
+        self.player_glop.set_pos((0.0, 0.0, 25.0))
+        self.player_glop.set_angles((0.0, math.radians(-90.0), 0.0))
+        self.player_glop.properties['bump_enable'] = True
+        self.set_camera_mode(self.CAMERA_FIRST_PERSON())
+        self.ui.add_glop(self.camera_glop)
+        self.ui.add_glop(self.player_glop)
+        self._player_glop_index = self.player_glop.glop_index
+        self.after_selected_item({'glop_index': self._player_glop_index})
+        self.set_as_actor_at(self._player_glop_index, None)
+
+    def new_glop_method(self):
+        return HeadlessGlop()
+
+    def get_class_name(self):
+        return "HeadlessGlops"
+
+    # Run one frame (there is no view to update).
+    def update(self, got_frame_delay=1.0/60.0):
+        start_s = best_timer()
+        self.step(got_frame_delay)
+        if self._frame_profile is not None:
+            frame_profile_add(self._frame_profile, 'frame',
+                              best_timer() - start_s)
+            frame_profile_end_frame(self._frame_profile)
+
+    def hide_glop(self, this_glop):
+        this_glop.state['visible_enable'] = False
+        self.update_active_sets_at(this_glop.glop_index)
+
+    def show_glop(self, this_glop_index):
+        self.glops[this_glop_index].state['visible_enable'] = True
+        self.update_active_sets_at(this_glop_index)
+
+    def on_explode_glop(self, pos, radius, attacked_index,
+                        projectile_dict):
+        pass
+
+    # Load the objects in an OBJ file as glops (see load_obj_glop_data)
+    # and return a list of their indices, or None if the file could not
+    # be loaded.
+    def load_obj(self, source_path, swapyz_enable=False, centered=False,
+                 pivot_to_g_enable=True):
+        results = None
+        load_obj_start_s = best_timer()
+        if swapyz_enable:
+            print("[ HeadlessGlops ] (load_obj)"
+                  " swapyz_enable is NOT YET IMPLEMENTED")
+        lp = self._load_profile
+        load_profile_begin_file(lp, source_path)
+        glop_datas = load_obj_glop_data(
+            source_path,
+            vertex_format_name=settings['globals']['vertex_format_name'],
+            pivot_to_g_enable=pivot_to_g_enable,
+            weld_enable=settings['globals']['weld_vertices_enable'])
+        if glop_datas is None:
+            print("[ HeadlessGlops ] (load_obj) FAILED TO LOAD '" +
+                  str(source_path) + "'")
+            load_profile_end_file(lp, best_timer() - load_obj_start_s, 0,
+                                  False)
+            return results
+        results = []
+        favorite_pivot_point = None
+        for glop_data in glop_datas:
+            new_glop = self.new_glop_method()
+            new_glop._load_times = dict(glop_data.get('load_times') or {})
+            new_glop.set_from_glop_data(glop_data)
+            new_glop.original_path = source_path
+            if favorite_pivot_point is None:
+                favorite_pivot_point = glop_data['pivot']
+            new_glop.set_pos(glop_data['pivot'])
+            if centered:
+                new_glop.set_pos((
+                    glop_data['pivot'][0] - favorite_pivot_point[0],
+                    glop_data['pivot'][1] - favorite_pivot_point[1],
+                    glop_data['pivot'][2] - favorite_pivot_point[2]))
+            nested_s = get_nested_load_s(new_glop._load_times)
+            start_s = best_timer()
+            self.ui.add_glop(new_glop)
+            add_load_time_since(new_glop._load_times, 'add_glop', start_s,
+                                nested_s)
+            load_profile_add_times(lp, new_glop._load_times)
+            new_glop._load_times = None
+            results.append(new_glop.glop_index)
+        load_profile_end_file(lp, best_timer() - load_obj_start_s,
+                              len(results), False)
+        return results
@@ -193,8 +193,9 @@ void main (void){
         #context.add(PopMatrix())
 
 
-        self.scene.glops.append(this_glop)
-        this_glop.glop_index = len(self.scene.glops) - 1
+        this_glop.state["visible_enable"] = True
+        self.scene._claim_glop_index(this_glop)
+            # (reuses a slot freed by remove_glop_at if there is one)
         if self.scene.glops[this_glop.glop_index] is not this_glop:
             # deal with multithreading paranoia:
             print("[ ishadereditor.py ] glop_index was wrong, correcting...")
@@ -207,8 +208,8 @@ void main (void){
                 print("                      ERROR: unable to correct index")
         # this_glop.glop_index = len(self.scene.glops) - 1
         this_glop.state["glop_index"] = this_glop.glop_index
-        self._contexts.add(self.scene.glops[len(self.scene.glops)-1].get_context())  # _contexts is a visible instruction group
-        self.scene.glops[len(self.scene.glops)-1].state["visible_enable"] = True
+        self.scene.update_active_sets_at(this_glop.glop_index)
+        self._contexts.add(this_glop.get_context())  # _contexts is a visible instruction group
 
         if get_verbose_enable():
             print("Appended Glop (count:"+str(len(self.scene.glops))+").")
@@ -5,6 +5,8 @@ It provides features that are specific to display method
 """
 __author__ = 'Jake Gustafson'
 import hashlib
+import json
+from collections import OrderedDict
 from pyglops import *
 import uuid
 import ast
@@ -39,29 +41,140 @@ from common import *
 import time
 import random
 
-nearest_not_found_warning_enable = True
 _multicontext_enable = False  # only should be set while not running
+glop_cache_version = 3  # increase when load_obj's cache output changes
+                        # (it is part of every cache folder's hash)
+glop_cache_extension = ".glop"  # binary (see write_glop_bin); set to
+                                # ".glop.yml" for a human-readable
+                                # cache (slower to load)
+glop_cache_manifest_name = "glops.yml"  # written last by load_obj, so
+                                        # a folder without it is not
+                                        # a usable cache
+texture_cache_max_bytes = 256 * 1024 * 1024  # textures no glop uses
+                        # are kept (for reuse) until the total size of
+                        # cached textures is over this (see
+                        # acquire_texture)
 print("[ kivyglops.py ] default _multicontext_enable: " +
       str(_multicontext_enable))
-# region changed automatically after showing error only once
-tltf = " (this is the last time this message will be shown for "
-tlt = "this is the last time this message will be shown"
-bounds_warning_enable = True
-look_at_none_warning_enable = True
-look_at_pos_none_warning_enable = True
-missing_bumpable_warning_enable = True
-missing_bumper_warning_enable = True
-missing_radius_warning_enable = True
-no_bounds_warning_enable = True
-# out_of_hitbox_note_enable = True
-show_zero_degrees_pf_warning_enable = True  # pf is per frame
-show_zero_walk_upf_warning_enable = True  # upf is units per frame
-# endregion changed automatically after showing error only once
-
-def get_distance_kivyglops(a_glop, b_glop):
-    return math.sqrt((b_glop._t_ins.x - a_glop._t_ins.x)**2 +
-                     (b_glop._t_ins.y - a_glop._t_ins.y)**2 +
-                     (b_glop._t_ins.z - a_glop._t_ins.z)**2)
+
+# region texture cache
+# One Image per resolved path is shared by every glop that uses it, so
+# each texture file is decoded (and uploaded to the GPU) once. Each
+# entry counts the glops using it (see acquire_texture and
+# release_texture); unused entries stay cached in least-recently-used
+# order until the total is over texture_cache_max_bytes.
+_texture_cache = OrderedDict()  # key: (see get_texture_cache_key)
+                                # value: {'image', 'refs', 'bytes'}
+_texture_cache_bytes = 0
+
+# returns a key for _texture_cache, or None if path can't be found
+def get_texture_cache_key(path):
+    if path is None:
+        return None
+    if not os.path.isfile(path):
+        path = resource_find(path)
+        if path is None:
+            return None
+    return os.path.realpath(path)
+
+def get_texture_bytes(this_image):
+    # (estimated as RGBA, since the size of the GPU copy isn't known)
+    this_texture = this_image.texture
+    if this_texture is None:
+        return 0
+    return int(this_texture.width) * int(this_texture.height) * 4
+
+# Get the shared Image for path, decoding it only if not cached. Every
+# call must be paired with a release_texture call (using the key
+# returned) when the caller stops using the Image.
+# returns (key, Image) or (None, None) if path can't be found
+def acquire_texture(path):
+    global _texture_cache_bytes
+    key = get_texture_cache_key(path)
+    if key is None:
+        return None, None
+    entry = _texture_cache.get(key)
+    if entry is None:
+        this_image = Image(key)
+        entry = {}
+        entry['image'] = this_image
+        entry['refs'] = 0
+        entry['bytes'] = get_texture_bytes(this_image)
+        _texture_cache[key] = entry
+        _texture_cache_bytes += entry['bytes']
+    else:
+        _texture_cache.move_to_end(key)
+    entry['refs'] += 1
+    trim_texture_cache()
+    return key, entry['image']
+
+def release_texture(key):
+    entry = _texture_cache.get(key)
+    if entry is None:
+        print("[ KivyGlops ] WARNING in release_texture: '" +
+              str(key) + "' is not cached")
+        return
+    if entry['refs'] > 0:
+        entry['refs'] -= 1
+    else:
+        print("[ KivyGlops ] WARNING in release_texture: '" +
+              str(key) + "' was already released by all users")
+    trim_texture_cache()
+
+# Remove unused textures, least recently used first, until the cache
+# is not over max_bytes (texture_cache_max_bytes if None).
+def trim_texture_cache(max_bytes=None):
+    global _texture_cache_bytes
+    if max_bytes is None:
+        max_bytes = texture_cache_max_bytes
+    if _texture_cache_bytes <= max_bytes:
+        return
+    for key in list(_texture_cache.keys()):
+        entry = _texture_cache[key]
+        if entry['refs'] < 1:
+            del _texture_cache[key]
+            _texture_cache_bytes -= entry['bytes']
+            if _texture_cache_bytes <= max_bytes:
+                break
+
+def get_texture_cache_stats():
+    results = {}
+    results['count'] = len(_texture_cache)
+    results['bytes'] = _texture_cache_bytes
+    results['unused_count'] = 0
+    for key in _texture_cache:
+        if _texture_cache[key]['refs'] < 1:
+            results['unused_count'] += 1
+    return results
+# endregion texture cache
+
+# region fixed step
+# A tick transform is (x, y, z, x angle, y angle, z angle) of a glop's
+# translate and rotate instructions (see KivyGlops update).
+def get_tick_transform(this_glop):
+    return (this_glop._t_ins.x, this_glop._t_ins.y, this_glop._t_ins.z,
+            this_glop._r_ins_x.angle, this_glop._r_ins_y.angle,
+            this_glop._r_ins_z.angle)
+
+def set_tick_transform(this_glop, transform):
+    this_glop._t_ins.x = transform[0]
+    this_glop._t_ins.y = transform[1]
+    this_glop._t_ins.z = transform[2]
+    this_glop._r_ins_x.angle = transform[3]
+    this_glop._r_ins_y.angle = transform[4]
+    this_glop._r_ins_z.angle = transform[5]
+
+def lerp_tick_transform(a, b, alpha):
+    results = []
+    for i in range(6):
+        if i > 2 and abs(b[i] - a[i]) > math.pi:
+            # the angle wrapped around (see PyGlops step), so
+            # don't spin the long way
+            results.append(b[i])
+        else:
+            results.append(a[i] + (b[i] - a[i]) * alpha)
+    return tuple(results)
+# endregion fixed step
 
 # def get_distance_vec3(a_vec3, b_vec3):
    # return math.sqrt((b_vec3[0] - a_vec3[0])**2 +
@@ -103,6 +216,8 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
     _s_ins = None
     _color_instruction = None
     _context_instruction = None
+    _texture_cache_key = None  # texture held by this glop (see
+                               # acquire_texture)
 
     _axes_mesh = None  # InstructionGroup for axes
 
@@ -210,6 +325,7 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
         self._t_ins.x = pos[0]
         self._t_ins.y = pos[1]
         self._t_ins.z = pos[2]
+        self._on_change_pos()
 
     def get_angle(self, axis_index):
         if axis_index == 0:
@@ -233,10 +349,11 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                   " should be 0, 1, or 2)")
 
     def append_wobject(self, this_wobject,
-                       pivot_to_g_enable=True):
+                       pivot_to_g_enable=True, weld_enable=None):
         super(KivyGlop, self).append_wobject(
             this_wobject,
-            pivot_to_g_enable=pivot_to_g_enable)
+            pivot_to_g_enable=pivot_to_g_enable,
+            weld_enable=weld_enable)
         if self.material is not None:
             self._color_instruction = Color(
                 self.material['diffuse_color'][0],
@@ -247,7 +364,47 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
             print("[ KivyGlop ] WARNING in append_wobject:" +
                   " self.material is None for " + str(self.name))
 
+    def set_from_glop_data(self, glop_data):
+        super(KivyGlop, self).set_from_glop_data(glop_data)
+        if self.material is not None:
+            self._color_instruction = Color(
+                self.material['diffuse_color'][0],
+                self.material['diffuse_color'][1],
+                self.material['diffuse_color'][2],
+                self.material['diffuse_color'][3])
+        if self.vertices is not None:
+            # (same as transform_pivot_to_geometry in append_wobject)
+            self._on_change_s_ins()  # does calculate_hit_range
+
+    # Save as yaml if path ends with .yml or .yaml (human-readable, for
+    # debugging), otherwise as binary glop (see write_glop_bin).
     def save(self, path):
+        if is_yaml_path(path):
+            self.save_yaml(path)
+            return
+        try:
+            header = {}
+            header['name'] = self.name
+            header['vertex_format'] = []
+            if self.vertex_format is not None:
+                for element in self.vertex_format:
+                    name = element[0]
+                    if isinstance(name, bytes):
+                        name = name.decode('utf-8')
+                    header['vertex_format'].append(
+                        [name, element[1], element[2]])
+            header['vertex_depth'] = self.vertex_depth
+            header['material'] = self.material  # (all of it, so a
+                                                # cached glop matches
+                                                # one from the OBJ)
+            header['translate'] = list(self._t_ins.xyz)
+            write_glop_bin(path, header, self.vertices, self.indices)
+        except:
+            print("[ KivyGlop ] ERROR--could not finish save to '" +
+                  path + "':")
+            view_traceback()
+
+    def save_yaml(self, path):
         lines = []
         self.emit_yaml(lines, "")
         try:
@@ -260,12 +417,81 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                   path + "':")
             view_traceback()
 
-    #load yaml-formatted glop file
+    # Load a glop saved by save (yaml if the path ends with .yml or
+    # .yaml, otherwise binary). Raises ValueError if a binary glop is
+    # incomplete (see read_glop_bin), so that load_obj can reload the
+    # OBJ file instead of using a corrupt cache.
     def load(self, source_path, original_path=None):
+        if source_path is not None and not is_yaml_path(source_path):
+            self.load_bin(source_path)
+            return
+        self.load_yaml(source_path, original_path=original_path)
+
+    def load_bin(self, source_path):
+        if self.vertices is not None and len(self.vertices) > 0:
+            print("[ KivyGlop ] WARNING: vertices are already "
+                  "present during load, overwriting")
+        found_path = source_path
+        if not os.path.isfile(found_path):
+            found_path = resource_find(source_path)
+        if found_path is None or not os.path.isfile(found_path):
+            print("[ KivyGlop ] ERROR in load_bin: missing '" +
+                  source_path + "'")
+            return
+        header, vertices, indices = read_glop_bin(found_path)
+        # The arrays are used directly (no per-element conversion).
+        # Kivy's Mesh accepts any sequence of numbers.
+        self.vertices = vertices
+        self.indices = indices
+        self.name = header.get('name')
+        vertex_format = []
+        for element in header.get('vertex_format', []):
+            vertex_format.append((element[0].encode('utf-8'),
+                                  element[1], element[2]))
+        if len(vertex_format) > 0:
+            self.vertex_format = vertex_format
+            self.on_vertex_format_change()
+        material = header.get('material')
+        if material is not None:
+            # (set_texture_diffuse is done by _generate_kivy_mesh)
+            self._set_material_from_json_dict(material)
+        else:
+            # (saved before the whole material was saved)
+            diffuse_path = header.get('diffuse_path')
+            if diffuse_path is not None:
+                self.material['properties']['diffuse_path'] = \
+                    diffuse_path
+            diffuse_color = header.get('diffuse_color')
+            if diffuse_color is not None and len(diffuse_color) == 4:
+                self.material['diffuse_color'] = tuple(diffuse_color)
+                self._color_instruction = Color(
+                    diffuse_color[0], diffuse_color[1],
+                    diffuse_color[2], diffuse_color[3])
+        translate = header.get('translate')
+        if translate is not None:
+            self.set_pos(translate)
+
+    # Set material from one saved by save (see
+    # get_material_from_json_dict).
+    def _set_material_from_json_dict(self, material):
+        self.material = get_material_from_json_dict(material)
+        diffuse_color = self.material.get('diffuse_color')
+        if diffuse_color is not None and len(diffuse_color) == 4:
+            self._color_instruction = Color(
+                diffuse_color[0], diffuse_color[1],
+                diffuse_color[2], diffuse_color[3])
+
+    #load yaml-formatted glop file
+    def load_yaml(self, source_path, original_path=None):
         specified_path = source_path
-        if self.vertices is not None:
+        if self.vertices is not None and len(self.vertices) > 0:
             print("[ KivyGlop ] WARNING: vertices are already "
                   "present during load, overwriting")
+        self.vertices = []
+        self.indices = []
+        vertex_format = []
+        translate = list(self._t_ins.xyz)
+        diffuse_color = []
         if specified_path is not None:
             if original_path is None:
                 original_path = source_path
@@ -284,7 +510,10 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                     line = ins.readline()
                     if line:
                         line_strip = line.strip()
-                        indent = find_any_not(line, " \t")
+                        if len(line_strip) < 1:
+                            line_number += 1
+                            continue
+                        indent = line[:find_any_not(line, " \t")]
                         depth = int(len(indent)/2)  # assumes "  "
                                                     # yaml indent
                         while len(scopes)<=depth:
@@ -307,6 +536,13 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                                     elif scopes[depth-1].name == \
                                             "indices":
                                         self.indices.append(int(val))
+                                    elif scopes[depth-1].name == \
+                                            "vertex_format":
+                                        vertex_format.append(
+                                            ast.literal_eval(val))
+                                    elif scopes[depth-1].name == \
+                                            "diffuse_color":
+                                        diffuse_color.append(float(val))
                                     else:
                                         if scopes[depth-1].name not in \
                                                 nyi_names:
@@ -318,7 +554,7 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                                                 "array " +
                                                 scopes[depth-1].name +
                                                 " not implemented" +
-                                                ttl +
+                                                " (array " +
                                                 scopes[depth-1].name +
                                                 ")"
                                             )
@@ -337,9 +573,27 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                                     name = line_strip[:op_i]
                                     val = get_literal_value_from_yaml(
                                         line_strip[op_i+1:])
-                                    if name == \
+                                    if depth > 0:
+                                        pass
+                                    elif name == "material":
+                                        # (JSON, which is also YAML)
+                                        self._set_material_from_json_dict(
+                                            json.loads(
+                                                line_strip[op_i+1:]))
+                                    elif name == \
                                             "get_texture_diffuse_path()":
-                                        self.set_texture_diffuse(val)
+                                        # (set_texture_diffuse is done
+                                        # by _generate_kivy_mesh)
+                                        self.material['properties'][
+                                            'diffuse_path'] = val
+                                    elif name == "name":
+                                        self.name = val
+                                    elif name == "translate_x":
+                                        translate[0] = float(val)
+                                    elif name == "translate_y":
+                                        translate[1] = float(val)
+                                    elif name == "translate_z":
+                                        translate[2] = float(val)
                                 else:
                                     print(
                                         specified_path + "(" +
@@ -352,6 +606,16 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
                         prev_indent = indent
                     line_number += 1
                 ins.close()
+                if len(vertex_format) > 0:
+                    self.vertex_format = vertex_format
+                    self.on_vertex_format_change()
+                self.set_pos(translate)
+                if len(diffuse_color) == 4:
+                    self.material['diffuse_color'] = \
+                        tuple(diffuse_color)
+                    self._color_instruction = Color(
+                        diffuse_color[0], diffuse_color[1],
+                        diffuse_color[2], diffuse_color[3])
             else:
                 print("[ KivyGlop ] ERROR in load: missing '" +
                       specified_path + "")
@@ -362,6 +626,15 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
 
     def emit_yaml(self, lines, min_tab_string):
         super(KivyGlop, self).emit_yaml(lines, min_tab_string)
+        if self.material is not None and \
+                self.material.get('diffuse_color') is not None:
+            lines.append(min_tab_string + "diffuse_color:")
+            standard_emit_yaml(lines, min_tab_string + tab_string,
+                               list(self.material['diffuse_color']))
+        if self.material is not None:
+            # (on one line, so load_yaml can read all of it back)
+            lines.append(min_tab_string + "material: " +
+                         json.dumps(self.material))
         lines.append(min_tab_string +
                      "translate_x: " +
                      get_yaml_from_literal_value(self._t_ins.x))
@@ -382,6 +655,8 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
         else:
             print("[ KivyGlop ] ERROR in set_coord: bad index " +
                   str(index))
+            return
+        self._on_change_pos()
 
     def get_coord(self, index):
         if index == 0:
@@ -407,7 +682,7 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
         # cannot be translated (!):
         if self.vertex_format[self.POSITION_INDEX][VFORMAT_VECTOR_LEN_INDEX] > 3:
             vertex_components[self._POSITION_OFFSET+3] = 1.0
-        if set_color is not None:
+        if set_color is not None and self.COLOR_OFFSET >= 0:
             for i in range(0, len(set_color)):
                 vertex_components[self.COLOR_OFFSET+i] = set_color[i]
             if (len(set_color)) < 4 and (self.vertex_depth > 3):
@@ -416,8 +691,9 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
         for i in range(0, 3):
             normals[i] = set_coords[i]
         normalize_3d_by_ref(normals)
-        for i in range(0, 3):
-            vertex_components[self._NORMAL_OFFSET+i] = normals[i]
+        if self._NORMAL_OFFSET >= 0:
+            for i in range(0, 3):
+                vertex_components[self._NORMAL_OFFSET+i] = normals[i]
         # print("  #* made new vertex " + str(vertex_components) +
         #       " (color at " + str(self.COLOR_OFFSET) + ")")
         return vertex_components
@@ -442,15 +718,7 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
             if self._POSITION_OFFSET<0:
                 IS_SELF_VFORMAT_OK = False
                 print(fail_prefix + "'pos' or 'position'" + fail_suffix)
-            if self._NORMAL_OFFSET<0:
-                IS_SELF_VFORMAT_OK = False
-                print(fail_prefix + "'normal'" + fail_suffix)
-            if self._TEXCOORD0_OFFSET<0:
-                IS_SELF_VFORMAT_OK = False
-                print(fail_prefix + " 'texcoord'" + fail_suffix)
-            if self.COLOR_OFFSET<0:
-                IS_SELF_VFORMAT_OK = False
-                print(fail_prefix + " 'color'" + fail_suffix)
+            # (normal, texcoord and color are optional)
         except:
             IS_SELF_VFORMAT_OK = False
             print("[ KivyGlop ] ERROR in " + f_name + ":" +
@@ -499,15 +767,8 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
             if self._POSITION_OFFSET<0:
                 IS_SELF_VFORMAT_OK = False
                 print(fail_prefix + "'pos' or 'position'" + fail_suffix)
-            if self._NORMAL_OFFSET<0:
-                IS_SELF_VFORMAT_OK = False
-                print(fail_prefix + "'normal'" + fail_suffix)
-            if self._TEXCOORD0_OFFSET<0:
-                IS_SELF_VFORMAT_OK = False
-                print(fail_prefix + "'texcoord'" + fail_suffix)
-            if self.COLOR_OFFSET<0:
-                IS_SELF_VFORMAT_OK = False
-                print(fail_prefix + "'color'" + fail_suffix)
+            # (normal, texcoord and color are optional, though the
+            # axes are only colored if the vertex format has color)
         except:
             IS_SELF_VFORMAT_OK = False
             print("[ KivyGlop ] ERROR in " + f_name + ":" +
@@ -683,59 +944,6 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
     def get_class_name(self):
         return "KivyGlop"
 
-    def look_at(self, target_glop):
-        if target_glop is not None:
-            self.look_at_pos(target_glop._t_ins.xyz)
-            # pitch = 0.0
-            # pitch = get_angle_between_points(self._t_ins.y,
-            #                                  self._t_ins.z,
-            #                                  target_glop._t_ins.y,
-            #                                  target_glop._t_ins.z)
-            # self._r_ins_x.angle = pitch
-            # yaw = get_angle_between_points(self._t_ins.x,
-            #                                self._t_ins.z,
-            #                                target_glop._t_ins.x,
-            #                                target_glop._t_ins.z)
-            # self._r_ins_y.angle = yaw
-            # print("look at pitch,yaw: " +
-            #     str(int(math.degrees(pitch))) + "," +
-            #     str(int(math.degrees(yaw))))
-        else:
-            global look_at_none_warning_enable
-            if look_at_none_warning_enable:
-                print("[ KivyGlop ] look_at got None for target_glop")
-                look_at_none_warning_enable = False
-
-    def look_at_pos(self, pos):
-        if pos is not None:
-            pitch = self._r_ins_x.angle
-            yaw = self._r_ins_y.angle
-            if len(pos) > 2:
-                pitch = get_angle_between_points(self._t_ins.y,
-                                                 self._t_ins.z,
-                                                 pos[1], pos[2])
-                yaw = get_angle_between_points(self._t_ins.x,
-                                               self._t_ins.z,
-                                               pos[0], pos[2])
-            else:
-                yaw = get_angle_between_points(self._t_ins.x,
-                                               self._t_ins.z,
-                                               pos[0], pos[1])
-                if get_verbose_enable():
-                    print("[ KivyGlop ]"
-                          " WARNING: look_at_pos got 2D coords")
-            self._r_ins_x.angle = pitch
-            self._r_ins_y.angle = yaw
-            # print("look at pitch,yaw: " +
-            #     str(int(math.degrees(pitch))) + "," +
-            #     str(int(math.degrees(yaw))))
-        else:
-            global look_at_none_warning_enable
-            if look_at_pos_none_warning_enable:
-                print(
-                    "[ KivyGlop ] ERROR: look_at_pos got None for pos")
-                look_at_pos_none_warning_enable = False
-
     def copy_as_mesh_instance(self, depth=0, ref_vertices_enable=True):
         result = KivyGlop()
         result.name = self.name
@@ -749,6 +957,10 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
             result.on_vertex_format_change()
         result.properties['hit_radius'] = self.properties['hit_radius']
         result.properties['hitbox'] = self.properties['hitbox']
+        if self._texture_cache_key is not None:
+            # (the copy draws the same mesh, so it holds the texture too)
+            result._texture_cache_key, _ = \
+                acquire_texture(self._texture_cache_key)
         context = result.get_context()
         result._t_ins.x = self._t_ins.x
         result._t_ins.y = self._t_ins.y
@@ -785,78 +997,6 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
 
         return result
 
-    def calculate_hit_range(self):
-        # TODO: re-implement super method, changing hitbox taking
-        # rotation & scale into account
-        # NOTE: index is set by add_glop so None if done earlier:
-        glop_msg = "new glop"
-        if self.glop_index is not None:
-            glop_msg = str(self.glop_index)
-        if self.name is not None:
-            glop_msg += " '" + self.name + "'"
-        if get_verbose_enable():
-            print("[ KivyGlop ] calculate_hit_range (hitbox) for " +
-                  glop_msg + "...")
-        if self.vertices is None:
-            self.properties['hitbox'] = None  # avoid 0-size hitbox
-                                # which would prevent bumps
-            if self.properties['hit_radius'] is None:
-                self.properties['hit_radius'] = new_flag_f()
-            print("[ KivyGlop ] hitbox skipped since vertices None.")
-            return None
-        vertex_count = int(len(self.vertices)/self.vertex_depth)
-        if vertex_count>0:
-            v_offset = 0
-            self.properties['hit_radius'] = 0.0
-            hb = self.properties.get('hitbox')
-            hr = self.properties.get('hit_radius')
-            PO = self._POSITION_OFFSET
-            if hb is None:
-                hb = new_hitbox()
-                self.properties['hitbox'] = hb
-            for i in range(0,3):
-                # intentionally set to rediculously far in opposite
-                # direction:
-                hb['minimums'][i] = sys.maxsize
-                hb['maximums'][i] = -sys.maxsize
-            for v_number in range(0, vertex_count):
-                for i in range(0,3):
-                    if self.vertices[v_offset + PO + i] < \
-                            hb['minimums'][i]:
-                        hb['minimums'][i] = \
-                            self.vertices[v_offset+PO+i]
-                    if (self.vertices[v_offset +
-                            PO+i]) > \
-                            hb['maximums'][i]:
-                        hb['maximums'][i] = \
-                            self.vertices[v_offset+PO+i]
-                this_vertex_relative_distance = get_distance_vec3(
-                    self.vertices[v_offset+PO:v_offset+PO+3],
-                    self._pivot_point)
-                if this_vertex_relative_distance > hr:
-                    hr = this_vertex_relative_distance
-                v_offset += self.vertex_depth
-            self.properties['hit_radius'] = hr
-            phi_eye_height = 86.5 * hb['maximums'][1]
-            if 'eye_height' not in self.properties:
-                self.properties['eye_height'] = phi_eye_height
-            if self.properties['eye_height'] > phi_eye_height:
-                print("[ KivyGlop ]" +
-                      " WARNING in calculate_hit_range:" +
-                      " eye_height " +
-                      str(self.properties['eye_height']) +
-                      " is beyond phi_eye_height" +
-                      str(phi_eye_height) +
-                      " so is being set to that value")
-                self.properties['eye_height'] = hb['maximums'][1]
-            print("    done calculate_hit_range")
-        else:
-            self.properties['hitbox'] = None  # avoid 0-size hitbox
-                                # which would prevent bumps
-            if self.properties.get('hit_radius') is None:
-                self.properties['hit_radius'] = new_flag_f()
-            print("    skipped (0 vertices).")
-
     def rotate_x_relative(self, angle):
         self._r_ins_x.angle += angle
 
@@ -868,12 +1008,15 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
 
     def move_x_relative(self, distance):
         self._t_ins.x += distance
+        self._on_change_pos()
 
     def move_y_relative(self, distance):
         self._t_ins.y += distance
+        self._on_change_pos()
 
     def move_z_relative(self, distance):
         self._t_ins.z += distance
+        self._on_change_pos()
 
     def transform_pivot_to_geometry(self):
         previous_point = self._pivot_point
@@ -935,27 +1078,20 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
         if self.get_has_hit_range():
             self.calculate_hit_range()
 
-    def apply_translate(self):
-        vertex_count = int(len(self.vertices)/self.vertex_depth)
-        v_offset = 0
-        for v_number in range(0, vertex_count):
-            self.vertices[v_offset+self._POSITION_OFFSET+0] -= \
-                self._t_ins.x
-            self.vertices[v_offset+self._POSITION_OFFSET+1] -= \
-                self._t_ins.y
-            self.vertices[v_offset+self._POSITION_OFFSET+2] -= \
-                self._t_ins.z
-            self._pivot_point = (self._pivot_point[0] - self._t_ins.x,
-                                 self._pivot_point[1] - self._t_ins.y,
-                                 self._pivot_point[2] - self._t_ins.z)
-            self._t_ins.x = 0.0
-            self._t_ins.y = 0.0
-            self._t_ins.z = 0.0
-            v_offset += self.vertex_depth
-        self.apply_pivot()
-        if self.get_has_hit_range():
-            self.calculate_hit_range()
+    # Stop using the texture from set_texture_diffuse, so the texture
+    # cache can free it if no other glop uses it.
+    def release_texture_diffuse(self):
+        if self._texture_cache_key is not None:
+            release_texture(self._texture_cache_key)
+            self._texture_cache_key = None
 
+    def release_resources(self):
+        super(KivyGlop, self).release_resources()
+        self.release_texture_diffuse()
+        self._mesh = None
+
+    # The Image is shared with other glops that use the same file (see
+    # acquire_texture), so don't modify its texture's pixels.
     def set_texture_diffuse(self, path):
         self.last_loaded_path = path
         this_texture_image = None
@@ -963,13 +1099,19 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
             participle = "getting image filename"
             try:
                 participle = "loading "+self.last_loaded_path
-                if os.path.isfile(self.last_loaded_path):
-                    this_texture_image = Image(self.last_loaded_path)
+                prev_key = self._texture_cache_key
+                self._texture_cache_key, this_texture_image = \
+                    acquire_texture(self.last_loaded_path)
+                if prev_key is not None:
+                    # (after acquire, so a reload of the same path
+                    # doesn't let trim_texture_cache free it)
+                    release_texture(prev_key)
+                if this_texture_image is None:
+                    print("[ KivyGlop ] ERROR--texture not found: " +
+                          str(self.last_loaded_path))
                 else:
-                    this_texture_image = Image(
-                        resource_find(self.last_loaded_path))
-                print("[ KivyGlop ] Loaded texture '" +
-                      str(self.last_loaded_path) + "'")
+                    print("[ KivyGlop ] Loaded texture '" +
+                          str(self.last_loaded_path) + "'")
             except:
                 print(
                     "[ KivyGlop ] ERROR--" +
@@ -1005,7 +1147,12 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
             print("[ KivyGlop ] WARNING in generate_kivy_mesh:"
                   " self._mesh is not None, overriding")
         self._mesh = None
+        texture_start_s = best_timer()
         this_texture_image = self.set_texture_diffuse(self.get_texture_diffuse_path())
+        if self._load_times is not None:
+            self._load_times['texture'] = \
+                (self._load_times.get('texture', 0.0) + best_timer() -
+                 texture_start_s)
         participle = "assembling kivy Mesh"
         this_texture = None
         if self.vertices is not None:
@@ -1070,6 +1217,7 @@ class KivyGlop(PyGlop):  # formerly KivyGlop(Widget, PyGlop)
         # self.generate_axes()
         # self.generate_plane()
         self.set_uniform("texture0_enable", False)
+        self.set_uniform("vertex_color_disable", self.COLOR_OFFSET < 0)
         for i in range(len(use_meshes)):
             use_mesh = use_meshes[i]
             # self._axes_mesh.
@@ -1174,7 +1322,6 @@ class KivyGlops(PyGlops):
     selected_glop_index = None
     mode = None
     controllers = None
-    player1_controller = None
     _previous_world_light_dir = None
     _previous_camera_rotate_y_angle = None
     _world_cube = None
@@ -1182,6 +1329,7 @@ class KivyGlops(PyGlops):
     world_boundary_max = None
     _sounds = None
     # endregion moved from ui
+    _cached_favorite_pivot_point = None  # set by _load_obj_cache
     # camera_glop = None  # inherited from PyGlops (so are many other
                         # member variables)
 
@@ -1267,17 +1415,13 @@ class KivyGlops(PyGlops):
                 # TODO: separate into two objects and make camera
                 # follow player
             self.player_glop.properties['bump_enable'] = True
-            self.camera_glop.glop_index = len(self.glops)
-            self.camera_glop.state['glop_index'] = \
-                self.camera_glop.glop_index
-            self.glops.append(self.camera_glop)
+            self._claim_glop_index(self.camera_glop)
+            self.update_active_sets_at(self.camera_glop.glop_index)
             self.player_glop.name = "Player 1"
             # sg['fly_enables'][self.player_glop.name] = True
             if generate_p1_enable:
-                self.player_glop.glop_index = len(self.glops)
-                self.player_glop.state['glop_index'] = \
-                    self.player_glop.glop_index
-                self.glops.append(self.player_glop)
+                self._claim_glop_index(self.player_glop)
+                self.update_active_sets_at(self.player_glop.glop_index)
                 if get_verbose_enable():
                     print("[ KivyGlopsWindow ] (verbose message in" +
                           " in __init__) generated player glop at " +
@@ -1324,37 +1468,12 @@ class KivyGlops(PyGlops):
     def hide_glop(self, this_glop):
         self.ui._contexts.remove(this_glop.get_context())
         this_glop.state['visible_enable'] = False
+        self.update_active_sets_at(this_glop.glop_index)
 
     def show_glop(self, this_glop_index):
         self.ui._contexts.add(self.glops[this_glop_index].get_context())
         self.glops[this_glop_index].state['visible_enable'] = True
-
-    def use_walkmesh_at(self, index, hide=True):
-        if self.glops[index] not in self._walkmeshes:
-            self._walkmeshes.append(self.glops[index])
-            sw = self.settings['world']
-            if sw.get('gravity_enable') is None:
-                sw['gravity_enable'] = True
-                print("[ KivyGlops ] use_walkmesh_at set "
-                      "world gravity_enable to True "
-                      "in settings dict since was None")
-            print("[ KivyGlops ] Applying walkmesh translate " +
-                  str(self.glops[index]._t_ins.xyz))
-            self.glops[index].apply_translate()
-            print("[ KivyGlops ]   pivot:" +
-                  str(self.glops[index]._pivot_point))
-            if hide:
-                self.hide_glop(self.glops[index])
-
-    def use_walkmesh(self, name, hide=True):
-        result = False
-        #for this_glop in self.glops:
-        for index in range(0, len(self.glops)):
-            if self.glops[index].name == name:
-                result = True
-                self.use_walkmesh_at(index, hide=hide)
-                break
-        return result
+        self.update_active_sets_at(this_glop_index)
 
     def set_hud_background(self, path):
         self.ui.set_hud_background(path)
@@ -1398,14 +1517,6 @@ class KivyGlops(PyGlops):
                 print("loading " + path)
                 self._sounds[path]['loader'] = SoundLoader.load(path)
 
-    def explode_glop_at(self, index, weapon_dict=None):
-        self.on_explode_glop( \
-            self.glops[index]._t_ins.xyz, \
-            self.glops[index].properties['hit_radius'], \
-            index,
-            weapon_dict)
-        self.kill_glop_at(index, weapon_dict)
-
     def on_explode_glop(self, pos, radius, attacked_index, weapon_dict):
         print("[ KivyGlops ] NOTICE: there is no default "
               "on_explode_glop in this version, so nothing will "
@@ -1426,14 +1537,194 @@ class KivyGlops(PyGlops):
     def play_music(self, path, loop=True):
         self.play_sound(path, loop=loop)
 
+    # Get the name of the cache folder for an obj file: a hash of the
+    # obj, its mtl file(s), and loader options (anything that changes
+    # the resulting glops), so changing any of them is a cache miss.
+    def get_obj_cache_name(self, source_path, options):
+        # 20 like SHA-1, but blake2b is more secure:
+        try:
+            path_hash = hashlib.blake2b(digest_size=20)
+        except:
+            path_hash = hashlib.sha1()
+        path_hash.update(("glop_cache_version:" +
+                          str(glop_cache_version) + "\n").encode())
+        for option in options:
+            path_hash.update((str(option) + "\n").encode())
+        ins = open(source_path, 'rb')
+        obj_bytes = ins.read()
+        ins.close()
+        path_hash.update(obj_bytes)
+        this_mesh_folder_path = os.path.dirname(
+            os.path.abspath(source_path))
+        for line in obj_bytes.splitlines():
+            line = line.strip()
+            if not line.startswith(b"mtllib"):
+                continue
+            # find mtl the same way as WObjFile load:
+            this_mtl_filename = line[6:].strip().decode(
+                errors='replace')
+            if (this_mtl_filename[:2]=="./") or \
+                    (this_mtl_filename[:2]==".\\"):
+                this_mtl_filename = this_mtl_filename[2:]
+            this_mtl_path = this_mtl_filename
+            if not os.path.isfile(this_mtl_path):
+                this_mtl_path = os.path.join(this_mesh_folder_path,
+                                             this_mtl_filename)
+            if os.path.isfile(this_mtl_path):
+                ins = open(this_mtl_path, 'rb')
+                path_hash.update(ins.read())
+                ins.close()
+            else:
+                # still hash name so adding the mtl later is a miss:
+                path_hash.update(this_mtl_filename.encode())
+        # NOTE: len is 40 (since is a hexdigest of a 20-value hash)
+        return path_hash.hexdigest()
+
+    # Get (and create if missing) the cache folder for glops loaded
+    # from the OBJ file at source_path (see get_obj_cache_name).
+    def _get_obj_cache_path(self, source_path, swapyz_enable,
+                            pivot_to_g_enable):
+        # NOTE: centered isn't part of the key since it is
+        # applied after loading either way
+        cache_name = self.get_obj_cache_name(
+            source_path,
+            ["swapyz_enable:" + str(swapyz_enable),
+             "pivot_to_g_enable:" + str(pivot_to_g_enable),
+             "weld_vertices_enable:" + str(
+                 settings['globals']['weld_vertices_enable']),
+             "vertex_format_name:" +
+                 settings['globals']['vertex_format_name'],
+             "glop_class:" + type(self.new_glop_method()).__name__])
+        caches_path = "cache"
+        if not os.path.isdir(caches_path):
+            os.mkdir(caches_path)
+        glop_caches_path = os.path.join(caches_path, 'glop')
+        if not os.path.isdir(glop_caches_path):
+            os.mkdir(glop_caches_path)
+        cache_path = os.path.join(glop_caches_path, cache_name)
+        if not os.path.isdir(cache_path):
+            os.mkdir(cache_path)
+        return cache_path
+
+    # Load glops saved by load_obj (see glop_cache_manifest_name), or
+    # return None if the cache is missing or incomplete.
+    def _load_obj_cache(self, cache_path, source_path, original_path):
+        manifest_path = os.path.join(cache_path,
+                                     glop_cache_manifest_name)
+        if not os.path.isfile(manifest_path):
+            return None
+        manifest = {}
+        list_name = None
+        ins = open(manifest_path, 'r')
+        for line in ins:
+            line_strip = line.strip()
+            if len(line_strip) < 1 or line_strip[:1] == "#":
+                continue
+            if line_strip[:2] == "- " and list_name is not None:
+                manifest[list_name].append(
+                    get_literal_value_from_yaml(line_strip[2:]))
+            else:
+                op_i = line_strip.find(":")
+                if op_i > -1:
+                    name = line_strip[:op_i].strip()
+                    val = line_strip[op_i+1:].strip()
+                    if len(val) > 0:
+                        manifest[name] = get_literal_value_from_yaml(val)
+                        list_name = None
+                    else:
+                        manifest[name] = []
+                        list_name = name
+        ins.close()
+        glop_names = manifest.get('glop_files')
+        if glop_names is None or len(glop_names) < 1:
+            return None
+        new_glops = []
+        for glop_name in glop_names:
+            glop_path = os.path.join(cache_path, glop_name)
+            if not os.path.isfile(glop_path):
+                print("[ KivyGlops ] (load_obj) WARNING: cache is" +
+                      " missing '" + glop_path + "', so reloading '" +
+                      str(original_path) + "'")
+                return None
+            new_glop = self.new_glop_method()
+            new_glop.load(glop_path)
+            new_glop.source_path = source_path
+            new_glop._pivot_point = (0.0, 0.0, 0.0)
+                # (pivot was already applied before save)
+            new_glops.append(new_glop)
+        fpp = manifest.get('favorite_pivot_point')
+        if fpp is not None and len(fpp) == 3:
+            self._cached_favorite_pivot_point = \
+                (float(fpp[0]), float(fpp[1]), float(fpp[2]))
+        else:
+            self._cached_favorite_pivot_point = None
+        return new_glops
+
+    # Load several OBJ files (see load_obj) and return a list of the
+    # results of load_obj (in the same order as source_paths). If
+    # settings['globals']['load_worker_count'] is not 0, the files
+    # that are not cached yet are converted to glop data by a process
+    # pool (see load_obj_glop_datas) so that only Kivy mesh creation
+    # happens in this thread.
+    def load_objs(self, source_paths, swapyz_enable=False,
+                  centered=False, pivot_to_g_enable=True):
+        results = []
+        worker_count = settings['globals']['load_worker_count']
+        glop_datas_by_path = {}
+        found_paths = []
+        for source_path in source_paths:
+            found_path = None
+            if source_path is not None:
+                found_path = resource_find(source_path)
+            found_paths.append(found_path)
+        if worker_count is None or worker_count > 0:
+            uncached_paths = []
+            for found_path in found_paths:
+                if found_path is None or \
+                        not os.path.isfile(found_path) or \
+                        found_path in uncached_paths:
+                    continue
+                cache_path = self._get_obj_cache_path(
+                    found_path, swapyz_enable, pivot_to_g_enable)
+                if not os.path.isfile(os.path.join(
+                        cache_path, glop_cache_manifest_name)):
+                    uncached_paths.append(found_path)
+            if len(uncached_paths) > 1:
+                self.ui.set_debug_label(
+                    "converting " + str(len(uncached_paths)) +
+                    " OBJ file(s)...")
+                glop_datas_by_path = load_obj_glop_datas(
+                    uncached_paths, worker_count=worker_count,
+                    pivot_to_g_enable=pivot_to_g_enable)
+        for index in range(len(source_paths)):
+            results.append(self.load_obj(
+                source_paths[index], swapyz_enable=swapyz_enable,
+                centered=centered, pivot_to_g_enable=pivot_to_g_enable,
+                glop_datas=glop_datas_by_path.get(found_paths[index])))
+        return results
+
+    # Write the seconds spent in each stage of loading a file (see
+    # load_profile_begin_file) as yaml to the open file outs.
+    def _write_load_stages(self, outs, lp_file):
+        if lp_file is None:
+            return
+        outs.write("stages_s:\n")
+        for stage in LOAD_STAGES:
+            outs.write("  " + stage + ": " +
+                       repr(lp_file['stages'].get(stage, 0.0)) + "\n")
+
+    # glop_datas: list made by load_obj_glop_data for source_path, to
+    # use instead of loading the OBJ file if there is no cache (see
+    # load_objs)
     def load_obj(self, source_path, swapyz_enable=False, centered=False,
-            pivot_to_g_enable=True):
+            pivot_to_g_enable=True, glop_datas=None):
         self.ui.suspend_debug_label_update(True)
         load_obj_start_s = best_timer()
+        lp = self._load_profile
+        lp_file = None  # see load_profile_begin_file
         results = None
         cache_path = None
         cached_count = 0
-        cache_path = None
         original_path = source_path
         if swapyz_enable:
             print("[ KivyGlops ] (load_obj)"
@@ -1442,36 +1733,47 @@ class KivyGlops(PyGlops):
             source_path = resource_find(source_path)
             if source_path is not None:
                 if os.path.isfile(source_path):
-                    # cache_name = \
-                    #     hashlib.sha224(source_path).hexdigest()
-                    # path_hash = hashlib.new('ripemd160')
-                    # cache_name = path_hash.hexdigest()
-                    # cache_name = \
-                    #    hashlib.ripemd160(source_path).hexdigest()
-                    # 20 like SHA-1, but blake2b is more secure:
+                    lp_file = load_profile_begin_file(lp, source_path)
+                    cache_path = self._get_obj_cache_path(
+                        source_path, swapyz_enable, pivot_to_g_enable)
+                    new_glops = None
+                    favorite_pivot_point = None
+                    applied_pivots = None
+                        # (pivots already applied by load_obj_glop_data)
+                    cache_load_start_s = best_timer()
                     try:
-                        cache_name = \
-                            hashlib.blake2b(digest_size=20).hexdigest()
+                        new_glops = self._load_obj_cache(
+                            cache_path, source_path, original_path)
                     except:
-                        cache_name = hashlib.sha1().hexdigest()
-                    # NOTE: at this point, len(cache_name) should be 40
-                    # (since is a hexdigest of a 20-value hash)
-                    caches_path = "cache"
-                    if not os.path.isdir(caches_path):
-                        os.mkdir(caches_path)
-                    glop_caches_path = os.path.join(caches_path, 'glop')
-                    if not os.path.isdir(glop_caches_path):
-                        os.mkdir(glop_caches_path)
-                    cache_path = os.path.join(glop_caches_path,
-                                              cache_name)
-                    cache_path_enable = False
-                    if not os.path.isdir(cache_path):
-                        os.mkdir(cache_path)
-                        cache_path_enable = True
-                    new_glops = self.get_glop_list_from_obj(
-                        source_path,
-                        self.new_glop_method
-                    )
+                        print("[ KivyGlops ] (load_obj) WARNING: " +
+                              "could not finish loading cache '" +
+                              cache_path + "', so reloading '" +
+                              str(original_path) + "':")
+                        view_traceback()
+                        new_glops = None
+                    load_profile_add(lp, 'cache_load',
+                                     best_timer() - cache_load_start_s)
+                    if new_glops is not None:
+                        cached_count = len(new_glops)
+                        favorite_pivot_point = \
+                            self._cached_favorite_pivot_point
+                    elif glop_datas is not None:
+                        new_glops = []
+                        applied_pivots = []
+                        for glop_data in glop_datas:
+                            new_glop = self.new_glop_method()
+                            new_glop._load_times = \
+                                dict(glop_data.get('load_times') or {})
+                            new_glop.set_from_glop_data(glop_data)
+                            new_glops.append(new_glop)
+                            applied_pivots.append(glop_data['pivot'])
+                        if len(applied_pivots) > 0:
+                            favorite_pivot_point = applied_pivots[0]
+                    else:
+                        new_glops = self.get_glop_list_from_obj(
+                            source_path,
+                            self.new_glop_method
+                        )
                     if new_glops is None:
                         print("[ KivyGlops ] (load_obj) " +
                               "FAILED TO LOAD '" + str(source_path) +
@@ -1485,34 +1787,41 @@ class KivyGlops(PyGlops):
                             self.glops = list()
 
                         #for index in range(0,len(self.glops)):
-                        favorite_pivot_point = None
                         for index in range(0,len(new_glops)):
                             new_glops[index].original_path = \
                                 original_path
-                            # this_glop = new_glops[index]
-                            # this_glop = \
-                            #     KivyGlop(pyglop=self.glops[index])
-                            # if len(self.glops<=index):
-                                # self.glops.append(this_glop)
-                            # else:
-                                # self.glops[index]=this_glop
-                            # print("")
+                            if new_glops[index]._load_times is None:
+                                new_glops[index]._load_times = {}
+                                    # (cached, so only later stages)
+                            if cached_count > 0:
+                                continue
                             if favorite_pivot_point is None:
                                 favorite_pivot_point = \
                                     new_glops[index]._pivot_point
                         if favorite_pivot_point is None:
                             favorite_pivot_point = (0.0, 0.0, 0.0)
-                        folder_path = cache_path
-                        for sub_name in os.listdir(folder_path):
-                            sub_path = os.path.join(folder_path,
-                                                    sub_name)
-                            if sub_name[:1] != ".":
-                                if len(sub_name) == 40 and \
-                                   sub_name[:-5] == ".glop":
-                                    # Remove uuid hex digest-named files
+                        if cached_count < 1:
+                            # remove any stale or partial cache
+                            # (manifest is written last, so it is
+                            # missing if the cache is incomplete):
+                            for sub_name in os.listdir(cache_path):
+                                sub_path = os.path.join(cache_path,
+                                                        sub_name)
+                                if sub_name.endswith(".glop") or \
+                                        sub_name.endswith(".glop.yml"):
                                     os.remove(sub_path)
+                        glop_file_names = []
                         for index in range(0,len(new_glops)):
-                            if pivot_to_g_enable:
+                            load_times = new_glops[index]._load_times
+                            if applied_pivots is not None:
+                                prev_pivot = applied_pivots[index]
+                                new_glops[index]._t_ins.x = \
+                                    prev_pivot[0]
+                                new_glops[index]._t_ins.y = \
+                                    prev_pivot[1]
+                                new_glops[index]._t_ins.z = \
+                                    prev_pivot[2]
+                            elif pivot_to_g_enable and cached_count < 1:
                                 # apply pivot point (so that glop's
                                 # _t_ins is actually the center)
                                 some_name = ""
@@ -1529,35 +1838,73 @@ class KivyGlops(PyGlops):
                                     new_glops[index]._pivot_point[1],
                                     new_glops[index]._pivot_point[2]
                                 )
+                                nested_s = get_nested_load_s(load_times)
+                                start_s = best_timer()
                                 new_glops[index].apply_pivot()
-                                # print(
-                                    # "    moving from " +
-                                    # str((new_glops[index]._t_ins.x,
-                                      # new_glops[index]._t_ins.y,
-                                      # new_glops[index]._t_ins.z) ))
+                                add_load_time_since(load_times, 'pivot',
+                                                    start_s, nested_s)
                                 new_glops[index]._t_ins.x = \
                                     prev_pivot[0]
                                 new_glops[index]._t_ins.y = \
                                     prev_pivot[1]
                                 new_glops[index]._t_ins.z = \
                                     prev_pivot[2]
+                            nested_s = get_nested_load_s(load_times)
+                            start_s = best_timer()
                             new_glops[index].prepare_canvas()
                                 # does generate_kivy_mesh() if needed
+                            add_load_time_since(load_times, 'mesh',
+                                                start_s, nested_s)
+                            nested_s = get_nested_load_s(load_times)
+                            start_s = best_timer()
                             self.ui.add_glop(new_glops[index])
+                            add_load_time_since(load_times, 'add_glop',
+                                                start_s, nested_s)
                             if results is None:
                                 results = list()
-                            results.append(len(self.glops)-1)
-                            if (new_glops[index].name is None) and \
-                               (cache_path_enable):
-                                # ok since deleted uuid-named files
-                                # already:
-                                new_glops[index].name = \
-                                    str(uuid.uuid4())
-                            if new_glops[index].name is not None:
+                            results.append(new_glops[index].glop_index)
+                            if cached_count < 1:
+                                # (add_glop names it if name is None)
+                                glop_file_name = (
+                                    str(index) + "-" +
+                                    good_path_name(
+                                        str(new_glops[index].name)) +
+                                    glop_cache_extension)
+                                start_s = best_timer()
                                 new_glops[index].save(
-                                    os.path.join(
-                                        cache_path,
-                                        good_path_name(new_glops[index].name)+".glop"))
+                                    os.path.join(cache_path,
+                                                 glop_file_name))
+                                load_times['cache_save'] = (
+                                    load_times.get('cache_save', 0.0) +
+                                    best_timer() - start_s)
+                                glop_file_names.append(glop_file_name)
+                            load_profile_add_times(lp, load_times)
+                            new_glops[index]._load_times = None
+                                # (stop timing hit range etc)
+                        if cached_count < 1:
+                            manifest_path = os.path.join(
+                                cache_path, glop_cache_manifest_name)
+                            manifest_start_s = best_timer()
+                            try:
+                                outs = open(manifest_path, 'w')
+                                outs.write("source_path: " +
+                                           source_path + "\n")
+                                outs.write("favorite_pivot_point:\n")
+                                for v in favorite_pivot_point:
+                                    outs.write("  - " + repr(v) + "\n")
+                                outs.write("glop_files:\n")
+                                for glop_file_name in glop_file_names:
+                                    outs.write("  - " + glop_file_name +
+                                               "\n")
+                                outs.close()
+                            except:
+                                print("[ KivyGlops ] ERROR in load_obj" +
+                                      "--could not finish saving '" +
+                                      manifest_path + "'")
+                                view_traceback()
+                            load_profile_add(
+                                lp, 'cache_save',
+                                best_timer() - manifest_start_s)
                         if centered:
                             # TODO: apply pivot point instead (change
                             # vertices as if pivot point were 0,0,0) to
@@ -1597,10 +1944,19 @@ class KivyGlops(PyGlops):
             print("[ KivyGlops ] (load_obj) ERROR: source_path is"
                   " None for load_obj")
         load_obj_s = best_timer() - load_obj_start_s
+        if lp_file is not None:
+            glops_count = 0
+            if results is not None:
+                glops_count = len(results)
+            load_profile_end_file(lp, load_obj_s, glops_count,
+                                  cached_count > 0)
         if results is not None:
+            via_msg = ""
+            if cached_count > 0:
+                via_msg = " (from cache)"
             print("[ KivyGlops ] (load_obj) Loaded '" +
                   original_path + "' in " + str(load_obj_s) +
-                  " seconds.")
+                  " seconds" + via_msg + ".")
             if cache_path is not None:
                 stats_name = "stats.yml"
                 stats_path = os.path.join(cache_path, stats_name)
@@ -1609,24 +1965,30 @@ class KivyGlops(PyGlops):
                     outs.write("original_path: " + original_path + "\n")
                     outs.write("path: " + source_path + "\n")
                     outs.close()
+                    # overwrite each time so stats are for the latest
+                    # load of each kind:
                     if cached_count > 0:
                         stats_name = "stats-cached.yml"
                         stats_path = os.path.join(cache_path,
                                                   stats_name)
-                        if not os.path.isfile(stats_path):
-                            outs = open(stats_path, 'w')
-                            outs.write("cached_load_time_s: " +
-                                       str(load_obj_s) + "\n")
-                            outs.close()
+                        outs = open(stats_path, 'w')
+                        outs.write("cached_load_time_s: " +
+                                   str(load_obj_s) + "\n")
+                        outs.write("glops_count: " +
+                                   str(cached_count) + "\n")
+                        self._write_load_stages(outs, lp_file)
+                        outs.close()
                     else:
                         stats_name = "stats-notcached.yml"
                         stats_path = os.path.join(cache_path,
                                                   stats_name)
-                        if not os.path.isfile(stats_path):
-                            outs = open(stats_path, 'w')
-                            outs.write("not_cached_load_time_s: " +
-                                       str(load_obj_s) + "\n")
-                            outs.close()
+                        outs = open(stats_path, 'w')
+                        outs.write("not_cached_load_time_s: " +
+                                   str(load_obj_s) + "\n")
+                        outs.write("glops_count: " +
+                                   str(len(results)) + "\n")
+                        self._write_load_stages(outs, lp_file)
+                        outs.close()
                 except:
                     print("[ KivyGlops ] ERROR in load_obj--could" +
                           " not finish saving stats to '" +
@@ -1649,123 +2011,13 @@ class KivyGlops(PyGlops):
         # and that is the method to find the keycode
         return False
 
-    # def constrain_glop_to_walkmesh(self,
-    #                                this_glop,
-    #                                height_only_enable=False):
-    # these_radii[0] is used to push against side if
-    # height_only_enable=False (to push x,z away from wall)
-    # these_radii[1] is used to push against floor (new y will be
-    # increased by this amount)
-    def get_walk_info(self, this_pos, these_radii,
-            height_only_enable=False):
-        walk_info = {}
-        walk_info['pos'] = [ this_pos[0], this_pos[1], this_pos[2] ]
-        walk_info['change_enable'] = False
-        if len(self._walkmeshes)>0:
-            walkmesh_result = \
-                self.get_walkmesh_info_xz(this_pos)
-            corrected_pos = None
-            if walkmesh_result is None:
-                # if self.prev_inbounds_camera_translate is not None:
-                     # # this would cause glop to stick to wall
-                     # # against which it pushed
-                     # walk_info['pos'] = \
-                        # [self.prev_inbounds_camera_translate[0]
-                         # self.prev_inbounds_camera_translate[1]
-                         # self.prev_inbounds_camera_translate[2] ]
-                # else:
-                corrected_pos = \
-                    self.get_nearest_walkmesh_vec3_using_xz(this_pos)
-                if corrected_pos is not None:
-                    # Push away from wall (edge of walkmesh), but allow
-                    # sliding along:
-                    pushed_angle = \
-                        get_angle_between_two_vec3_xz(this_pos,
-                                                      corrected_pos)
-                    corrected_pos = \
-                        get_pushed_vec3_xz_rad(corrected_pos,
-                                               these_radii[0],
-                                               pushed_angle)
-                else:
-                    global nearest_not_found_warning_enable
-                    if nearest_not_found_warning_enable:
-                        nearest_not_found_warning_enable = False
-                        print("[ KivyGlops ] ERROR in get_walk_info" +
-                              ": could not find point to bring" +
-                              " player in bounds.")
-                walk_info['walkmesh_via'] = "nearest"
-            else:
-                # In bounds, so only change y
-                w_glop = \
-                    self._walkmeshes[walkmesh_result['walkmesh_index']]
-                X_i = w_glop._POSITION_OFFSET + 0
-                Y_i = w_glop._POSITION_OFFSET + 1
-                Z_i = w_glop._POSITION_OFFSET + 2
-                ground_tri = list()
-                # TODO: use vertext format of w_glop for ground_tri
-                # instead of assuming first 3 entries in vertext are
-                # 3D pos
-                wgv = w_glop.vertices
-                wgi = w_glop.indices
-                wrpo = walkmesh_result['polygon_offset']
-                ground_tri.append(
-                    (w_glop.vertices[w_glop.indices[wrpo]*w_glop.vertex_depth+X_i],
-                    w_glop.vertices[w_glop.indices[wrpo]*w_glop.vertex_depth+Y_i],
-                    w_glop.vertices[w_glop.indices[wrpo]*w_glop.vertex_depth+Z_i]) )
-                ground_tri.append(
-                    (w_glop.vertices[w_glop.indices[wrpo+1]*w_glop.vertex_depth+X_i],
-                     w_glop.vertices[w_glop.indices[wrpo+1]*w_glop.vertex_depth+Y_i],
-                     w_glop.vertices[w_glop.indices[wrpo+1]*w_glop.vertex_depth+Z_i]) )
-                ground_tri.append(
-                    (w_glop.vertices[w_glop.indices[wrpo+2]*w_glop.vertex_depth+X_i],
-                     w_glop.vertices[w_glop.indices[wrpo+2]*w_glop.vertex_depth+Y_i],
-                     w_glop.vertices[w_glop.indices[wrpo+2]*w_glop.vertex_depth+Z_i]) )
-                ground_y = get_y_from_xz(ground_tri[0], ground_tri[1], ground_tri[2], this_pos[0], this_pos[2])
-                corrected_pos = [this_pos[0], ground_y + these_radii[1], this_pos[2]]
-                if self._world_min_y is None or ground_y < self._world_min_y:
-                    self._world_min_y = ground_y
-                # if self.prev_inbounds_camera_translate is None or \
-                #    this_pos[1] != \
-                #    self.prev_inbounds_camera_translate[1]:
-                    # print("y:"+str(this_pos[1]))
-                walk_info['walkmesh_via'] = "under"
-            if corrected_pos is not None:
-                if not height_only_enable:
-                    walk_info['change_enable'] = True
-                    walk_info['pos'][0] = corrected_pos[0]
-                    walk_info['pos'][2] = corrected_pos[2]
-                        # TODO: check y (vertical) axis against
-                        # eye height and jump height etc
-                if walk_info['pos'][1] - corrected_pos[1] <= kEpsilon:
-                    walk_info['on_ground_enable'] = True
-                elif walk_info['pos'][1] - corrected_pos[1] > kEpsilon:
-                    # use kEpsilon as a deadzone so that floating
-                    # point errors don't cause physics and hence many
-                    # at_rest events
-                    walk_info['on_ground_enable'] = False
-                    pass
-
-                if corrected_pos[1] > walk_info['pos'][1]:
-                    walk_info['change_enable'] = True
-                    walk_info['pos'][1] = corrected_pos[1]
-                else:
-                    # Hovering, but previous if-else flags for physics
-                    pass
-            global bounds_warning_enable
-            if bounds_warning_enable:
-                print("[ KivyGlops ] (verbose message) walkmesh used")
-                bounds_warning_enable = False
-        else:
-            global no_bounds_warning_enable
-            if no_bounds_warning_enable:
-                print("[ KivyGlops ] (verbose message) no walkmesh")
-                no_bounds_warning_enable = False
-            pass
-        walk_info['feet_y'] = walk_info['pos'][1] - these_radii[1]
-        return walk_info
-
+    # Set the values of debug_dict that are from the view, then update
+    # the debug label, but only if the label is due (see
+    # get_debug_label_due).
     def update_view_visual_debug(self):
         global debug_dict
+        if not self.ui.get_debug_label_due():
+            return
         # ensure essential dicts exist to avoid needing checks later:
         if 'camera_glop' not in debug_dict:
             debug_dict['camera_glop'] = {}
@@ -1802,1121 +2054,105 @@ class KivyGlops(PyGlops):
                     debug_dict['Player']['hp'] = pgad['hp']
             debug_dict['Player']['clip_enable'] = \
                 self.player_glop.properties['clip_enable']
+        fp = self._frame_profile
+        if fp is not None:
+            # (only when due, since sorting the kept frames every
+            # frame would be a spike)
+            ddp = {}
+            debug_dict['Profile ms (p50 p95 max)'] = ddp
+            percentiles = get_frame_profile_percentiles(fp)
+            for phase in fp['phases']:
+                pp = percentiles[phase]
+                if pp['max'] is not None:
+                    ddp[phase] = "%.2f %.2f %.2f" % (
+                        pp['p50'], pp['p95'], pp['max'])
         self.ui.update_debug_label()
 
+    # KivyGlops.update is called once per frame by
+    # KivyGlopsWindow.update_glsl. If settings['world']
+    # ['fixed_step_enable'], the simulation runs in ticks of
+    # 1/ticks_per_second (as many as the time since the last frame
+    # allows), and glops that moved during the last tick are drawn
+    # part of the way from where they were before it (see
+    # _interpolate_tick_transforms).
     def update(self):
-        VMSG = " (verbose message in update) "
-        pgp = self.player_glop.properties
-        dd = debug_dict
-        sg = self.settings['globals']
         sw = self.settings['world']
-        # KivyGlops.update is called by KivyGlopsWindow.*update*
-        # such as update_glsl
-        # super(KivyGlops, self).update()
-        # region pre-bump ops
-        # NOT: tried to move regions "pre-bump ops" and
-        # "bump loop" to pyglops but didn't work well
-        # print("coords:"+str(Window.mouse_pos))
-        # see also asp and clip_top in init
-        # screen_w_arc_theta = 32.0
-        #     # actual number is fromprojectionMatrix matrix
-        # screen_h_arc_theta = 18.0
-        #     # actual number is from projectionMatrix matrix
-
-        global missing_bumper_warning_enable
-        global missing_bumpable_warning_enable
-        global missing_radius_warning_enable
-        for a_i_i in range(0,len(self._actor_indices)):
-            a_index = self._actor_indices[a_i_i]
-            if a_index is None:
-                continue
-            actor_glop = self.glops[a_index]
-            ags = actor_glop.state
-            agp = actor_glop.properties
-            agad = actor_glop.actor_dict
-            a_name = actor_glop.name
-            if agad is None:
-                print("[ KivyGlops ] error in update: " +
-                      "actor_dict is None for bumper named '" +
-                      str(actor_glop.name) + "'")
-                continue
-            if agad.get("ai_enable") is not None:
-                self.on_process_ai(a_index)
-                # NOTE: moveto_index and target_index are guaranteed
-                # to exist by set_as_actor_at
-                if agad['target_index'] is not None:
-                    agad['target_pos'] = \
-                        self.glops[agad['target_index']]._t_ins.xyz
-                elif agad['moveto_index'] is not \
-                        None:
-                    if not self.glops[agad['moveto_index']].state['visible_enable']:
-                        agad['moveto_index'] = None
-                        if get_verbose_enable():
-                            print("[ KivyGlops ] (verbose "
-                                  "message) actor"
-                                  " lost target since glop at"
-                                  " moveto_index is now invisible")
-                    else:
-                        agad['target_pos'] = \
-                            self.glops[agad['moveto_index']]._t_ins.xyz
-                if agad['target_pos'] is not None:
-
-                    ags['acquire_radius'] = agp['reach_radius']
-
-                    src_pos = actor_glop._t_ins.xyz
-                    dst_pos = agad['target_pos']
-                    # acquire_radius is changed below if using
-                    # ranged weapon
-                    distance = get_distance_vec3_xz(src_pos,
-                                                    dst_pos)
-
-                    ags['desired_use'] = None
-                    ags['choice_ii'] = -1  # inventory index
-                    if agad.get('target_index') is not None:
-                        weapon_index = None
-                        # NOTE: uses is determined by item_dict,
-                        # ranges is by actor_dict (unless use contains
-                        # "shoot_", then ranges are determined by
-                        # item_dict)
-                        # Start desired_* as None in case item is no
-                        # longer in inventory.
-                        if agad['inventory_index'] >= 0:
-                            try_item = agad['inventory_items'][agad['inventory_index']]
-                            if 'uses' in try_item:
-                                for this_use in try_item['uses']:
-                                    if this_use in sg['attack_uses']:
-                                        ags['desired_use'] = this_use
-                                        # attack guarantees
-                                        # attack_types exists
-                                        # (via set_as_item)
-                                        ags['choice_ii'] = \
-                                            agad['inventory_index']  # guaranteed to exist by set_as_actor_at
-                                # TODO: loop again and look for melee
-                            #else item has no use
-                        if agad['choice_ii'] < 0:
-                            # If weapon is not selected, choose
-                            # random weapon even if selected a slot.
-                            dii, du = actor_glop.find_item_with_any_use(
-                                sg['attack_uses'])
-                            ags['choice_ii'] = \
-                                dii
-                            ags['desired_use'] = \
-                                du
-                        if ags['choice_ii'] >= 0:
-                            if "shoot_" in this_use:
-                                if 'ranges' in try_item and \
-                                        (try_item['ranges'].get(this_use) is not None):
-                                    ags['acquire_radius'] = \
-                                        try_item['ranges'][this_use]
-                                else:
-                                    # TODO: predict arc to determine
-                                    # range instead
-                                    ags['acquire_radius'] = \
-                                        20.
-                                    if get_verbose_enable():
-                                        print("[ KivyGlops ]" +
-                                            VMSG + "used " +
-                                            "default acquire " +
-                                            "radius " +
-                                            str(ags['acquire_radius']) +
-                                            " since item['ranges']['" +
-                                            this_use +
-                                            "'] was not set")
-                            else:
-                                if this_use in agad['ranges']:
-                                    ags['acquire_radius'] = \
-                                        agad['ranges'][this_use]
-                                else:
-                                    # TODO: predict arc to determine
-                                    # range instead
-                                    ags['acquire_radius'] = 20.
-                                    if get_verbose_enable():
-                                        print(
-                                            "[ KivyGlops ] " +
-                                            "(verbose message " +
-                                            "in update) used" +
-                                            " default acquire " +
-                                            "radius " +
-                                            str(ags['acquire_radius']) +
-                                            ' since ' +
-                                            "actor_dict['ranges']['" +
-                                            this_use +
-                                            "'] was not set")
-                        else:
-                            ags['acquire_radius'] = agp['reach_radius']
-                    # ACTUAL MOVEMENT is done further down, in
-                    # # region choice-based movement and physics
-        # end for a_i_i (actor)
-        self.on_update_glops()
-        # endregion pre-bump ops
-
-        # NOTE: (ANOTHER non-nested LOOP is at end of update,
-        # for physics and unit movement)
-        # region nested bump loop
-        for bumpable_i_i in range(0,
-                len(self._bumpable_indices)):
-            bumpable_index = \
-                self._bumpable_indices[bumpable_i_i]
-            if bumpable_index is None:
-                continue
-            e_glop = self.glops[bumpable_index]
-            egn = e_glop.name
-            igp = e_glop.properties
-            igs = e_glop.state
-            if not igp['bump_enable']:
-                continue
-            for bumper_i_i in range(0, len(self._bumper_indices)):
-                bumper_index = self._bumper_indices[bumper_i_i]
-                if bumper_index is None:
-                    continue
-                actor_glop = self.glops[bumper_index]
-                agp = actor_glop.properties
-                rgn = actor_glop.name
-                distance = get_distance_kivyglops(e_glop,
-                                                  actor_glop)
-                if igp['hit_radius'] is None:
-                    if missing_radius_warning_enable:
-                        print("[ KivyGlops ] WARNING in" +
-                            " update: Missing radius " +
-                            "while bumped bumpable " +
-                            "named " +
-                            str(egn))
-                        missing_radius_warning_enable = \
-                            False
-                    continue
-                total_hit_radius = 0.0
-                if e_glop.projectile_dict is not \
-                        None:
-                    total_hit_radius = (
-                        igp['hit_radius'] +
-                        agp['hit_radius']
-                    )
-                else:
-                    try:
-                        total_hit_radius = (
-                            igp['hit_radius'] +
-                            agp['reach_radius']
-                        )
-                    except KeyError:
-                        total_hit_radius = igp['hit_radius']
-                        print("ERROR in bumpable_i_i loop: " +
-                              "reach_radius is " +
-                              str(agp.get('reach_radius')) +
-                              " for glop named " + rgn +
-                              " but actor's should never be None")
-                if distance <= total_hit_radius:
-                    # print("total_hit_radius:" +
-                    #     str(total_hit_radius))
-                    if bumper_index in igs['in_range_indices']:
-                        #print("not out of range yet")
-                        continue
-                    # (only bump if ever moved out of range of it)
-                    if bumper_index == bumpable_index:
-                        # can't bump self
-                        continue
-                    if get_verbose_enable():
-                        print("[ KivyGlops ]" +
-                            VMSG + "'" +
-                            str(actor_glop.name) +
-                            "' in range of '" +
-                            str(e_glop.name) +
-                            "'")
-                    if agp['bump_enable']:
-                        if (e_glop.projectile_dict is None) or \
-                           (agp['hitbox'] is None) or \
-                           hitbox_contains_vec3(agp['hitbox'],
-                                e_glop._t_ins.xyz):
-                            igs['bumped_by_index'] = bumper_index
-                            igs['at_rest_event_enable'] = True
-                        else:
-                            # global out_of_hitb
-                            # ox_note_enable
-                            # if out_of_hitbox_n
-                            # ote_enable:
-                            print(
-                                "[ KivyGlops ]" +
-                                " (debug only--this" +
-                                " is normal) within" +
-                                " total_hit_radius," +
-                                " but bumpable at " +
-                                str(e_glop.get_pos()) + " is" +
-                                " not in bumper's" +
-                                " hitbox: " +
-                                str(agp['hitbox']))
-                            # out_of_hitbox_n
-                            # ote_enable = False
-                    else:
-                        if get_verbose_enable():
-                            print(
-                                "[ KivyGlops ]" +
-                                VMSG + "'" +
-                                str(actor_glop.name) +
-                                "' is not a bumper.")
-                    if not bumper_index in \
-                            igs['in_range_indices']:
-                        igs['in_range_indices'].append(
-                            bumper_index)
-                else:
-                    if bumper_index in igs['in_range_indices']:
-                        igs['in_range_indices'].remove(bumper_index)
-            # end for bumper
-        # end for bumpable
-        # endregion nested bump loop
-        # (ANOTHER non-nested LOOP is at end of update,
-        # for physics and unit movement)
-
-        # NOTE: hit detection above (such as item hitting enemy)
-        # can make the item no longer bumpable or bumper,
-        # so check for None:
-        for j in reversed(range(len(self._bumpable_indices))):
-            if self._bumpable_indices[j] == None:
-                del(self._bumpable_indices[j])
-        for j in reversed(range(len(self._bumper_indices))):
-            if self._bumper_indices[j] == None:
-                del(self._bumper_indices[j])
-
-        # region choice-based movement and physics
-        # --in that order, so you don't go through stuff
-        got_frame_delay = 0.0  # do NOT move this to anywhere before hit
-                               # detection is finished--otherwise
-                               # invisible movement could occur (ones
-                               # using got_frame_delay) before hit
-                               # detection
+        now_s = best_timer()
+        got_frame_delay = 0.0
         if self.last_update_s is not None:
-            got_frame_delay = best_timer() - self.last_update_s
-        self.last_update_s = best_timer()
+            got_frame_delay = now_s - self.last_update_s
+        self.last_update_s = now_s
         if not self._delay_is_available_enable:
             # prevent useless work and 0 movement warnings
-            # by stopping here if got_frame_delay 0 is expected
+            # by skipping the simulation if got_frame_delay 0 is
+            # expected
             self._delay_is_available_enable = True
-            return
-        pgi = self.get_player_glop_index(1)
-        for motivated_index in range(len(self.glops)):
-            if motivated_index is None:
+        elif sw['fixed_step_enable']:
+            self._restore_tick_transforms()
+            tick_s = 1.0 / sw['ticks_per_second']
+            max_ticks = sw['max_ticks_per_frame']
+            self._tick_accumulator_s += got_frame_delay
+            if self._tick_accumulator_s > tick_s * max_ticks:
+                # drop time that can't be caught up on, so that one
+                # slow frame doesn't make the following ones slower
+                self._tick_accumulator_s = tick_s * max_ticks
+            while self._tick_accumulator_s >= tick_s:
+                self._tick_prev_transforms = []
+                for this_glop in self.glops:
+                    if this_glop is None:
+                        self._tick_prev_transforms.append(None)
+                        continue  # removed
+                    self._tick_prev_transforms.append(
+                        get_tick_transform(this_glop))
+                self.step(tick_s)
+                self._tick_accumulator_s -= tick_s
+            if sw['tick_interpolation_enable']:
+                self._interpolate_tick_transforms(
+                    self._tick_accumulator_s / tick_s)
+        else:
+            self.step(got_frame_delay)
+        self.update_view()
+        if self._frame_profile is not None:
+            frame_profile_add(self._frame_profile, 'frame',
+                              best_timer() - now_s)
+            frame_profile_end_frame(self._frame_profile)
+
+    # Undo _interpolate_tick_transforms, except for glops moved since
+    # (such as by an event handler), so the simulation continues from
+    # the result of the last tick.
+    def _restore_tick_transforms(self):
+        for index in self._tick_shown_transforms:
+            shown, ticked = self._tick_shown_transforms[index]
+            if index < len(self.glops) and \
+                    self.glops[index] is not None:
+                this_glop = self.glops[index]
+                if get_tick_transform(this_glop) == shown:
+                    set_tick_transform(this_glop, ticked)
+        self._tick_shown_transforms = {}
+
+    # Show each glop that moved during the last tick at alpha (0.0 to
+    # 1.0) of the way from where it was before the tick to where it
+    # is now (glops created during the tick are not interpolated).
+    def _interpolate_tick_transforms(self, alpha):
+        prevs = self._tick_prev_transforms
+        for index in range(min(len(prevs), len(self.glops))):
+            this_glop = self.glops[index]
+            prev = prevs[index]
+            if this_glop is None or prev is None:
+                continue  # removed or added during the tick
+            ticked = get_tick_transform(this_glop)
+            if ticked == prev:
                 continue
-            p1_enable = False
-            if motivated_index == pgi:
-                p1_enable = True
-            m_glop = self.glops[motivated_index]
-            mgs = m_glop.state
-            mgp = m_glop.properties
-            mgid = m_glop.item_dict
-            mgad = m_glop.actor_dict
-            sta = self.settings['templates']['actor']
-            lups = None  # land units per second
-            if mgad is not None:
-                lups = mgad.get('land_speed')
-            if lups is None:
-                lups = sta['land_speed']
-            # land units per frame:
-            lupf = lups * got_frame_delay
-            if lupf <= 0.:
-                lupf = 0.
-                global show_zero_walk_upf_warning_enable
-                # TODO: why does next line show exception if not
-                # declared as global manually??
-                if show_zero_walk_upf_warning_enable:
-                    print("[ KivyGlops ] WARNING in update: zero " +
-                          "land units per frame (" + tltf + ")")
-                    show_zero_walk_upf_warning_enable = False
-
-            laps = None  # land acceleration units per second squared
-            if mgad is not None:
-                laps = mgad.get('land_accel')
-            if laps is None:
-                laps = sta['land_accel']
-            lapf = laps * got_frame_delay  # land accel per frame
-
-            ldps = None  # land degrees per second
-            if mgad is not None:
-                ldps = mgad.get('land_degrees_per_second')
-            if ldps is None:
-                ldps = sta['land_degrees_per_second']
-            # land radians per frame:
-            lrpf = math.radians(ldps) * got_frame_delay
-            if lrpf <= 0.:
-                lrpf = 0.
-                global show_zero_degrees_pf_warning_enable
-                if show_zero_degrees_pf_warning_enable:
-                    print("[ KivyGlops ] WARNING in update: zero "
-                          "land degrees per frame (this is the last "
-                          "time this message will be shown)")
-                    show_zero_degrees_pf_warning_enable = False
-
-            # NOTE: Increased z should move object closer to viewer
-            # in right-handed coordinate system
-            choice_local_vel_mult = [0., 0., 0.] # 1.0 is max
-                                                 # joystick tilt:
-                                                 # normally [0],[2]
-            if 'dst_angles' not in mgs:
-                mgs['dst_angles'] = None
-            # mgs['look_theta_multipliers'] = [0., 0., 0.]
-            mgas = m_glop.get_angles()
-            if mgad is not None and mgad.get('target_pos') is not None:
-                # If has target_pos, auto-move to target without
-                # intervention even if is player-controlled glop.
-                src_pos = m_glop.get_pos()
-                dst_pos = mgad['target_pos']
-                mgs['dst_angles'] = get_angles_vec3(
-                    src_pos,
-                    dst_pos,
-                    m_glop.get_angles()
-                )
-                distance = get_distance_vec3_xz(src_pos, dst_pos)
-                tilt = .5
-                run_enable = False
-                sneak_enable = False
-
-                if mgs.get('acquire_radius') is not None:
-                    # if mgad['target_index'] is None:
-                    run_enable = True
-                    if run_enable:
-                        tilt *= 2.
-                    if sneak_enable:
-                        tilt /= 2.
-                    if distance > mgs['acquire_radius']:
-                        # # global velocity
-                        # vmx, vmy = get_rect_from_polar_rad(
-                            # tilt, mgas[1])
-                            # # use current y angle
-                            # # to prevent instant strafe
-                        # choice_local_vel_mult[0] = vmx
-                        # choice_local_vel_mult[2] = vmy
-                        # local velocity
-                        choice_local_vel_mult[2] = tilt
-                    if mgad['target_index'] is not None:
-                        # If has weapon and attack target, auto-attack
-                        # even if is player-controlled glop
-                        if mgs['choice_ii'] >= 0:
-                            try:
-                                self.use_item_at(m_glop,
-                                    mgs['choice_ii'],
-                                    this_use=mgs['desired_use'])
-                            except:
-                                print("[ KivyGlops ] " +
-                                    "ERROR in update--" +
-                                    "could not finish" +
-                                    " using item " +
-                                    str(mgs.get('choice_ii')))
-                                view_traceback()
-                        else:
-                            if not mgad['unarmed_melee_enable']:
-                                mgad['target_index'] = None
-                else:
-                    print("[ KivyGlops ] ERROR in update:"
-                          " 'target_pos' was set but the engine"
-                          " forgot to calculate 'acquire_radius'")
-            elif p1_enable:
-                # for keycode strings, see
-                # http://kivy.org/docs/_modules/kivy/core/window.html
-                # TODO: make a virtual joystick for touch, and
-                # (set mgs['look_theta_multipliers'] or
-                # do math right away and) set look_dest_theta
-                # (and the longer you press before tilting, the faster
-                # the speed; start moving automatically at .5 sec
-                # OPTION 2: double-tap to not move--but start
-                # accelerating immediately while down even then)
-                tilt = .5
-                if self.player1_controller.get_pressed(
-                        self.ui.get_keycode("ctrl")):
-                    tilt /= 2.
-                if self.player1_controller.get_pressed(
-                        self.ui.get_keycode("shift")):
-                    tilt *= 2.
-                if self.player1_controller.get_pressed(
-                        self.ui.get_keycode("a")):
-                    choice_local_vel_mult[0] = -1.  # full speed
-                                                   # so same as
-                                                   # virtual
-                                                   # shoulder button
-                elif self.player1_controller.get_pressed(
-                        self.ui.get_keycode('d')):
-                    choice_local_vel_mult[0] = 1.  # full speed
-                                                   # so same as
-                                                   # virtual
-                                                   # shoulder button
-                if self.player1_controller.get_pressed(
-                        self.ui.get_keycode("w")):
-                    # if self.get_fly_by_name(m_glop.name):
-                        # # intentionally use z,y:
-                        # vmz, vmy = get_rect_from_polar_rad(
-                            # tilt, m_glop._r_ins_x.angle)
-                        # choice_local_vel_mult[2] = vmz
-                        # choice_local_vel_mult[1] = vmy
-                    # else:
-                    choice_local_vel_mult[2] = tilt
-
-                elif self.player1_controller.get_pressed(
-                        self.ui.get_keycode('s')):
-                    # if self.get_fly_by_name(m_glop.name):
-                        # # intentionally use z,y:
-                        # opposite = math.radians(-180)
-                        # if m_glop._r_ins_x.angle < 0:
-                            # opposite *= -1.
-                        # vmz, vmy = get_rect_from_polar_rad(
-                            # tilt, m_glop._r_ins_x.angle + opposite)
-                        # choice_local_vel_mult[2] = vmz
-                        # choice_local_vel_mult[1] = vmy
-                    # else:
-                    choice_local_vel_mult[2] = -tilt
-
-                if self.player1_controller.get_pressed(
-                        self.ui.get_keycode("enter")):
-                    self.use_selected(m_glop)
-
-                if self.player1_controller.get_pressed(
-                        self.ui.get_keycode("spacebar")):
-                    if mgs['on_ground_enable']:
-                        # TODO: make double-jump event handler
-                        choice_local_vel_mult[1] = 1.
-                        # if get_verbose_enable():
-                            # print("[ KivyGlops ] (verbose message"
-                                  # " in update: jumped (maximum try)")
-                    else:
-                        # if get_verbose_enable():
-                            # print("[ KivyGlops ] (verbose message"
-                                  # " in update: can't jump while"
-                                  # " not on ground.")
-                        pass
-            ## DO NO MORE HIT DETECTION SINCE 1ST CHANGE IS BELOW
-
-            # ACTUAL MOVEMENT is done only if the object is at rest
-            # (see else case below).
-            check_pos_enable = False
-            choice_moved_enable = False
-            choice_world_vel = [0.0, 0.0, 0.0]
-
-            # if m_glop.look_target_glop is not None:
-               # m_glop.look_at(m_glop.look_target_glop)
-                # print(str(m_glop.name) + " looks at " +
-                #       str(m_glop.look_target_glop.name))
-                # print(
-                #     "  at " +
-                #     str(
-                #         get_vec3_from_point(self.camera_glop._t_ins))
-            mgsv = None
-            try:
-                mgsv = mgs['velocity']
-            except KeyError:
-                raise KeyError("(FATAL) state template was not" +
-                      " applied to glop named " + str(m_glop.name) +
-                      " from file '" + str(m_glop.source_path) + "'" +
-                      " but physics-enabled glop must always have" +
-                      " velocity")
-            ar_enable = False
-            if mgs['on_ground_enable'] or \
-                    self.get_fly_by_name(m_glop.name):
-                ar_enable = True
-                # can control own movement
-                # (do not use look_dest_theta directly since wasn't
-                # turned all the way in that direction until after the
-                # movement below could have taken place)
-                # xz coords of edges of 16x16 square are:
-                # move in the direction you are facing
-
-                choice_world_vel_mult = [0., 0., 0.]
-                if choice_local_vel_mult[0] != 0.0 or \
-                        choice_local_vel_mult[1] != 0.0 or \
-                        choice_local_vel_mult[2] != 0.0:
-                    # makes movement relative to rotation
-                    # (which also limits speed when moving diagonally):
-                    moving_r_multiplier = \
-                        math.sqrt((choice_local_vel_mult[0] *
-                                   choice_local_vel_mult[0]) +
-                                  (choice_local_vel_mult[2] *
-                                   choice_local_vel_mult[2]))
-                    if moving_r_multiplier > 1.0:
-                        moving_r_multiplier = 1.0
-                            # Limited so that you can't move faster
-                            # when moving diagonally
-                        # print("[ KivyGlops ] WARNING in update:"
-                              # " clipped >100% movement")
-                    choice_world_vel_mult[0] = (moving_r_multiplier *
-                                                math.cos(mgas[1]))
-                    # TODO: (?) make relative to rotation for fly mode:
-                    choice_world_vel_mult[1] = choice_local_vel_mult[1]
-                    choice_world_vel_mult[2] = (moving_r_multiplier *
-                                                math.sin(mgas[1]))
-                    # choice_local* VARS SHOULD NOT BE USED AFTER THIS
-                    # SINCE THEY ARE NOT NEEDED FOR ANYTHING ELSE.
-
-                    choice_world_r_vel = lapf * moving_r_multiplier
-                    radial_xz_velocity = (
-                        math.sqrt((mgsv[0] * mgsv[0]) +
-                                  (mgsv[2] * mgsv[2]))
-                    )
-                    if choice_world_r_vel + radial_xz_velocity < -lapf:
-                        choice_world_r_vel = 0.
-                        # choice_world_r_vel += (
-                            # (choice_world_r_vel +
-                             # radial_xz_velocity) -
-                            # lapf
-                        # )
-                    elif choice_world_r_vel + radial_xz_velocity > lapf:
-                        choice_world_r_vel = 0.
-                        # choice_world_r_vel -= (
-                            # (choice_world_r_vel +
-                             # radial_xz_velocity) -
-                            # lapf
-                        # )
-                    if choice_world_r_vel < kEpsilon:
-                        choice_world_r_vel = 0.0
-
-                    # TODO: reprogram so adding math.radians(-90)
-                    # is not needed (?) or remove these comments if
-                    # works now
-                    # choice_world_vel[0] = \
-                        # lapf*moving_r_multiplier * \
-                        #     math.cos(
-                        #         m_glop._r_ins_y.angle +
-                        #         mgas[1] +
-                        #         math.radians(-90))
-                    # choice_world_vel[1] = \
-                        # lapf * \
-                        #     choice_world_vel_mult[1]
-                    # choice_world_vel[2] = \
-                        # lapf * moving_r_multiplier * \
-                        # math.sin(m_glop._r_ins_y.angle +
-                        #     mgas[1] +
-                        #     math.radians(-90))
-                    for a_i in range(3):
-                        choice_world_vel[a_i] = (
-                            choice_world_vel_mult[a_i] *
-                            lapf  # land accel per frame
-                        )
-                    # choice_world_vel[0] = (choice_world_r_vel *
-                                              # math.cos(mgas[1])
-                    # )
-                    # choice_world_vel[1] = (lapf *
-                                              # choice_world_vel_mult[1]
-                    # )
-                    # choice_world_vel[2] = (choice_world_r_vel *
-                                              # math.sin(mgas[1])
-                    # )
-                    # if (m_glop._t_ins.x + move_by_x > \
-                            # self._world_cube.get_max_x()):
-                        # move_by_x = \
-                            # self._world_cube.get_max_x() - \
-                            # m_glop._t_ins.x
-                        # print(str(m_glop._t_ins.x) + " of max_x:" +
-                            # str(self._world_cube.get_max_x()))
-                    # if (m_glop._t_ins.z + move_by_z > \
-                            # self._world_cube.get_max_z()):
-                        # move_by_z = self._world_cube.get_max_z() - \
-                                    # m_glop._t_ins.z
-                        # print(str(m_glop._t_ins.z) + " of max_z:" +
-                              # str(self._world_cube.get_max_z()))
-                    # if (m_glop._t_ins.x + move_by_x < \
-                            # self._world_cube.get_min_x()):
-                        # move_by_x = self._world_cube.get_min_x() - \
-                                    # m_glop._t_ins.x
-                        # print(str(m_glop._t_ins.x) + " of max_x:" +
-                              # str(self._world_cube.get_max_x()))
-                    # if (m_glop._t_ins.z + move_by_z < \
-                            # self._world_cube.get_min_z()):
-                        # move_by_z = self._world_cube.get_min_z() - \
-                                    # m_glop._t_ins.z
-                        # print(str(m_glop._t_ins.z) + " of max_z:" +
-                              # str(self._world_cube.get_max_z()))
-
-                    # print(str(m_glop._t_ins.xz) + " each " +
-                          # "coordinate should be between matching" +
-                          # " one in " +
-                          # str(self._world_cube.get_min_x()) + "," +
-                          # str(self._world_cube.get_min_z()) +
-                          # " and " +
-                          # str(self._world_cube.get_max_x()) + "," +
-                          # str(self._world_cube.get_max_z()))
-                    # print(str(m_glop._t_ins.xyz) + " each " +
-                          # "coordinate should be between matching" +
-                          # " one in " +
-                          # str(self.world_boundary_min) +
-                          # " and " +
-                          # str(self.world_boundary_max))
-                for axis_i in range(0,3):
-                    if choice_world_vel[axis_i] != 0.0:
-                        choice_moved_enable = True
-                        mgsv[axis_i] += choice_world_vel[axis_i]
-                # for axis_i in range(0,3):
-                    if mgsv[axis_i] != 0.0:
-                        # set _t_ins via set_coord:
-                        m_glop.set_coord(axis_i, mgsv[axis_i])
-
-                # self.prev_inbounds_camera_translate = \
-                    # self.camera_glop._t_ins.x,
-                    # self.camera_glop._t_ins.y,
-                    # self.camera_glop._t_ins.z
-
-                # else:
-                    # self.camera_glop._t_ins.x += \
-                        # self.lupf * \
-                        # choice_local_vel_mult[0]
-                    # self.camera_glop._t_ins.z += \
-                        # self.lupf * \
-                        # choice_local_vel_mult[2]
-
-
-                # TODO:? if mgs['look_theta_multipliers'][1] != 0.0:
-                    # delta_y = lrpf * choice_try_theta_multipliers[1]
-                    # m_glop._r_ins_y.angle += delta_y
-                # if choice_try_theta_multipliers is not None:
-                    # choice_world_turn_theta = \
-                        # choice_try_theta_multipliers[1]
-
-                if mgs['dst_angles'] is not None:
-                    for a_i in range(3):
-                    #if lupf is not None:
-                        delta_theta = mgs['dst_angles'][a_i] - mgas[a_i]
-                        if delta_theta > lrpf:
-                            delta_theta = lrpf
-                        elif delta_theta < -lrpf:
-                            delta_theta = -lrpf
-                        # check kEpsilon to prevent jitter while stopped
-                        if delta_theta > kEpsilon or \
-                                delta_theta < -kEpsilon:
-                            new_a = mgas[a_i] + delta_theta
-                            m_glop.set_angle(a_i, new_a)
-                            if p1_enable and a_i == 1:
-                                if not fequals(m_glop.get_angle(a_i),
-                                               new_a):
-                                    # print(
-                                        # "FAILED to set angle " +
-                                        # str(math.degrees(
-                                          # m_glop.get_angle(a_i))) +
-                                        # " to " +
-                                        # str(math.degrees(new_a)))
-                                    print(
-                                        "FAILED to set angle " +
-                                        str(m_glop.get_angle(a_i)) +
-                                        " to " +
-                                        str(new_a))
-                            # TODO: m_glop._r_ins_y.angle = \
-                                # angle_trunc(m_glop._r_ins_y.angle)
-                            # m_glop._t_ins.x += \
-                                # choice_local_vel_mult[0]
-                            # m_glop._t_ins.z += \
-                                # choice_local_vel_mult[2]
-                    # else:
-                        # print("[ KivyGlops ] ERROR in update:"
-                              # " choice_world_turn_theta was set"
-                              # " for unit, but engine forgot to set"
-                              # " lupf")
-
-            # end if on_ground_enable or flying can control own movement
-
-            pcgs = None  # player-controlled glop state
-            if p1_enable:
-                if sg['camera_perspective_number'] == \
-                        self.CAMERA_FIRST_PERSON():
-                    # player-controlled glop
-                    pcgs = self.player_glop.state
-                else:
-                    pcgs = self.camera_glop.state
-
-                if pcgs is not None and \
-                        pcgs.get('dst_angles') is not None:
-                    if 'Player' not in debug_dict:
-                        debug_dict['Player'] = {}
-                    pcg = None
-                    if pcgs.get('glop_index') is not None:
-                        pcg = self.glops[pcgs['glop_index']]
-                        debug_dict['Player']['name'] = pcg.name
-                        debug_dict['Player']['angles'] = \
-                            fixed_width(
-                                degrees_list(
-                                    pcg.get_angles()), 6, " ")
-                    debug_dict['Player']['dst_angles'] = \
-                        fixed_width(
-                            degrees_list(
-                                pcgs['dst_angles']), 6, " ")
-                    debug_dict['Player']['free'] = ar_enable
-
-            if choice_moved_enable:
-                check_pos_enable = True
-            #if (not mgs['on_ground_enable']) or \
-            #   choice_moved_enable:
-            # if not mgs['on_ground_enable']:
-            # if m_glop._cached_floor_y is None:
-                # m_glop._cached_floor_y = self._world_min_y
-                # # TODO: get from walkmesh instead and
-                # # eliminate _cached_floor_y
-            # (this part is under no outer conditions)
-            if mgp['physics_enable']:
-                if mgs.get('show_physics_msg_enable') is None:
-                    if get_verbose_enable():
-                        print("[ KivyGlops ] (verbose message " +
-                            "in update) processing first run of" +
-                            " physics for " + m_glop.name)
-                    mgs['show_physics_msg_enable'] = True
-                # walk_info = \
-                    # self.constrain_glop_to_walkmesh(m_glop)
-                # on_ground_enable = \
-                    # walk_info.get('on_ground_enable')
-                # if on_ground_enable is not None:
-                    # if mgs['on_ground_enable'] != \
-                            # on_ground_enable:
-                        # mgs['on_ground_enable'] = \
-                # on_ground_enable
-                        # mgs['at_rest_event_enable'] = \
-                            # True
-                # deprecated this_glop_free_enable = False
-                # if m_glop._cached_floor_y is not None:
-                    # if m_glop._t_ins.y - mgp['hit_radius'] - \
-                       # kEpsilon > m_glop._cached_floor_y:
-                        # # this_glop_free_enable = True
-                        # pass
-                    # else: # STOP object
-                          # # (remove owner and projectile_dict)
-                        # mgs['on_ground_enable'] = True
-                # else:
-                    # pass
-                    # # no cached floor, so move without regard to
-                    # # ground
-                    # # this_glop_free_enable = True
-
-                if mgs['at_rest_event_enable']:
-                        # HIT GROUND (or target if
-                        # mgs.get('bumped_by_index') \
-                        # is not None
-                    mgs['at_rest_event_enable'] = False
-                    bumper_index = mgs.get('bumped_by_index')
-                    e_glop = None
-                    r_glop = None
-                    egp = None
-                    rgp = None
-                    if bumper_index is not None:
-                        self.on_bump(motivated_index, bumper_index)
-                        bumpable_index = motivated_index
-                        e_glop = self.glops[bumpable_index]
-                        r_glop = self.glops[bumper_index]
-                        egp = e_glop.properties
-                        rgp = r_glop.properties
-                    else:
-                        self.on_bump_world(motivated_index, 'ground')
-                        bumper_index = motivated_index
-                        bumpable_index = None
-                        r_glop = self.glops[bumper_index]
-                        rgp = r_glop.properties
-                    # TODO: optionally, such as for bottom-heavy
-                    # items: m_glop._r_ins_x.angle = 0.
-                    # if mgsv[2] > kEpsilon:
-                    # if (mgsv[1] < 0.0 - \
-                    #         (kEpsilon + mgp['hit_radius'])):
-                    # print("  HIT GROUND Y:" +
-                    #       str(m_glop._cached_floor_y))
-                    # bump_sound_paths is guaranteed by PyGlop
-                    # _init_glop to exist in glop's properties
-                    if e_glop is not None:
-                        bsps = egp['bump_sound_paths']
-                        if len(bsps) > 0:
-                            rand_i = random.randrange(
-                                0, len(bsps))
-                            self.play_sound(bsps[rand_i])
-                        igpd = e_glop.projectile_dict
-                        # NOTE: already checked
-                        # bumpable_index bump_enable above
-                        # print("distance:" + str(total_hit_radius) +
-                        # " <= total_hit_radius:" +
-                        # str(total_hit_radius))
-                        if igpd is None or \
-                           ('owner' not in igpd) or \
-                           (igpd['owner'] != r_glop.name):
-                            self._internal_bump_glop(bumpable_index,
-                                                     bumper_index)
-                            if get_verbose_enable():
-                                if e_glop is not None:
-                                    print("[ KivyGlops ]" + VMSG +
-                                          str(r_glop.name) +
-                                          " bumped " +
-                                          str(e_glop.name))
-                                elif r_glop is not None:
-                                    print("[ KivyGlops ]" + VMSG +
-                                          str(r_glop.name) +
-                                          " bumped world")
-                        else:
-                            if get_verbose_enable():
-                                print("[ KivyGlops ]" + VMSG +
-                                      "cannot bump own projectile")
-
-                    # NOTE: projectile_dict is already removed above
-                    # by _internal_bump_glop if relevant
-                    if mgid is not None:
-                        if mgid['state'].get('owner') is not None:
-                            del mgid['state']['owner']
-                        if mgid['state'].get('owner_key') is not None:
-                            del mgid['state']['owner_key']
-
-                    # m_glop._t_ins.y = m_glop._cached_floor_y +
-                    #                   mgp['hit_radius']
-                    # check_pos_enable = True
-                    # if mgsv[0] != 0. or \
-                       # mgsv[1] != 0. or \
-                       # mgsv[2] != 0.:
-                        # if get_verbose_enable():
-                            # print("[ KivyGlops ] stopped glop" +
-                                  # "{hit_radius:" +
-                                  # str(mgp['hit_radius']) +
-                                  # "; glop._cached_floor_y:" +
-                                  # str(m_glop._cached_floor_y) +
-                                  # "}")
-                    mgsv[1] = 0.0
-                # end at_rest_event_enable
-                # (still inside `if...physics_enable`--and only that)
-                if mgs['on_ground_enable']:
-                    wfd = sw['friction_divisor']
-                    wfdp = wfd
-                    if mgsv[1] < -kEpsilon:
-                        wfdp = wfd + -mgsv[1]  # pressure increases friction
-                        # TODO: real physics for wfdp
-                    if mgsv[1] <= kEpsilon:
-                        # if no upward velocity, do friction
-                        if mgsv[0] > kEpsilon:
-                            mgsv[0] /= wfdp
-                        else:
-                            mgsv[0] = 0.
-                        # mgsv[1] is done later,
-                        # based on gravity
-                        if mgsv[2] > kEpsilon:
-                            mgsv[2] /= wfdp
-                        else:
-                            mgsv[2] = 0.
-                        # this_glop_free_enable = False
-                src_pos = m_glop.get_pos()
-                dst_pos = ( src_pos[0] + mgsv[0] * got_frame_delay,
-                             src_pos[1] + mgsv[1] * got_frame_delay,
-                             src_pos[2] + mgsv[2] * got_frame_delay
-                )
-                if get_verbose_enable():
-                    if mgad is not None and mgp['roll_enable']:
-                        print("[ KivyGlops ] WARNING in update:" +
-                              " roll_enable is True for actor" +
-                              " '" + m_glop.name + "'")
-
-                if mgs['on_ground_enable'] and \
-                   mgp.get('hit_radius') is not None and \
-                   mgp['hit_radius'] > 0 and\
-                   mgp['roll_enable']:
-                    # then roll, only if not actor (mgad is None)
-                    # TODO: rolling friction (here or elsewhere)
-                    # TODO: project into object space for accuracy
-                    angles = m_glop.get_angles()
-                    rolling_vec_indicies = (0, 2)
-                    rvtis = (2, 1)  # rolling vector theta indices
-                    rvps = ((0, 2), (1, 2))  # rolling vector planes
-                    for rvi in rolling_vec_indicies:
-                        src_2D_pos = (src_pos[rvps[rvi][0]],
-                                      src_pos[rvps[rvi][1]])
-                        dst_2D_pos = (dst_pos[rvps[rvi][0]],
-                                       dst_pos[rvps[rvi][1]])
-                        # first do trig to get angle from pos delta:
-                        offset_theta = get_angle_vec2(src_2D_pos,
-                                                      dst_2D_pos)
-                        # https://www.mathopenref.com/arclength.html
-                        al = (TAU * mgp['hit_radius'] *
-                              (offset_theta / TAU))
-                        # Simplifies if have radians & central angle
-                        # but central angle is always acute
-                        # so doesn't provide info useful to engine:
-                        # al = mgp['hit_radius'] * offset_c
-                        angles[rvi] += al
-                        # TODO: why does changing rotation
-                        # make things hit ground too high?
-                        if (angles[rvi] > TAU):
-                            angles[rvi] -= TAU
-                        elif (angles[rvi] < NEG_TAU):
-                            angles[rvi] += TAU
-                    m_glop.set_angles(angles)
-                # do even if 'on_ground_enable' since may be rolling
-                m_glop.set_pos(dst_pos)
-
-                if not mgs['on_ground_enable']:
-                    # process gravity only
-                    # (don't do hit detection again until user
-                    # [& ai at top of this method] sees this frame)
-                    if got_frame_delay > 0.0:
-                        check_pos_enable = True
-                        # print("[ KivyGlops ]" + VMSG +
-                            # "GRAVITY AFFECTED:" +
-                            # str(m_glop._t_ins.y) +
-                            # " += " + str(mgsv[1]))
-                        mgsv[1] -= sw['gravity'] * got_frame_delay
-                        # print("[ KivyGlops ]" + VMSG +
-                            # "THEN VELOCITY CHANGED TO:" +
-                            # str(mgsv[1]))
-                        # print("[ KivyGlops ]" + VMSG +
-                            # "FRAME INTERVAL:" +
-                            # str(got_frame_delay))
-                    else:
-                        if self._delay_is_available_enable:
-                            print("[ KivyGlops ] "
-                                  "WARNING in update: no frame"
-                                  " delay is detectable (update"
-                                  " normally runs automatically"
-                                  " once per frame but seems to"
-                                  " be running more often)")
-            # end if physics_enable
-            # AND FORMERLY end on_ground_enable or choice_moved_enable
-
-            # if choice_local_vel_mult[0] != 0.0 or \
-            #   # choice_local_vel_mult[1] != 0.0 or \
-            #   # choice_local_vel_mult[2] != 0.0:
-                # did NOT necessarily move (deltas already checked)
-            if (not mgs['on_ground_enable']):
-                if choice_world_vel[0] != 0.0 or \
-                   choice_world_vel[1] != 0.0 or \
-                   choice_world_vel[2] != 0.0:
-                    # then already did check_pos_enable when set
-                    if get_verbose_enable():
-                        prev_on_ground_enable = \
-                            mgs.get('prev_on_ground_enable')
-                        if prev_on_ground_enable != \
-                                mgs['on_ground_enable']:
-                            print("[ KivyGlops ]" + VMSG +
-                                  "glop " + m_glop.name +
-                                  " tried to move, but was not " +
-                                  "at rest (physics in control)")
-            mgs['prev_on_ground_enable'] = mgs['on_ground_enable']
-            mgs['constrained_enable'] = False
-            # deprecated this_glop_free_enable
-            # deprecated stop_this_bumpable_enable
-            for rel in mgs['links']:
-                if rel['r_type'] == "carry":
-                    if m_glop._t_ins.xyz != \
-                            rel['state']['parent_glop']._t_ins.xyz:
-                        m_glop._t_ins.x = \
-                            rel['state']['parent_glop']._t_ins.x
-                        m_glop._t_ins.y = \
-                            rel['state']['parent_glop']._t_ins.y
-                        m_glop._t_ins.z = \
-                            rel['state']['parent_glop']._t_ins.z
-                        check_pos_enable = True
-                    mgs['on_ground_enable'] = True
-                    mgs['constrained_enable'] = True
-                else:
-                    print("[ KivyGlops ] ERROR in update: " +
-                          "unknown link r_type " +
-                          str(rel.get('r_type')))
-
-            # if mgp['physics_enable']:
-            if p1_enable:
-                if not 'Player' in dd:
-                    dd['Player'] = {}
-                dd['Player']['check_pos_enable'] = \
-                    check_pos_enable
-            if check_pos_enable and mgp['clip_enable']:
-                const_ground_enable = True
-                walk_info = None
-                walkmesh_enable = True
-                if walkmesh_enable:
-                    if len(self._walkmeshes) > 0:
-                        const_ground_enable = False
-                        #constrained_pos = [m_glop._t_ins.x,
-                        #                   m_glop._t_ins.y,
-                        #                   m_glop._t_ins.z]
-                        if mgp['hitbox'] is not None:
-                            walk_info = self.get_walk_info(
-                                m_glop._t_ins.xyz,
-                                (mgp['hitbox']['maximums'][0],
-                                 -m_glop['minimums'][1]))
-                        else:
-                            walk_info = self.get_walk_info(
-                                m_glop._t_ins.xyz,
-                                (mgp['hit_radius'],
-                                 mgp['hit_radius']))
-                        if (motivated_index == \
-                                self.get_player_glop_index(1)):
-                            if 'Player' not in dd:
-                                dd['Player'] = {}
-                            dd['Player']['walkmesh_via'] = \
-                                walk_info['walkmesh_via']
-                            dd['Player']['feet_y'] = \
-                                walk_info['feet_y']
-
-                    else:
-                        walkmesh_enable = False
-                if const_ground_enable:
-                    walk_info = {}
-                    walk_info['pos'] = [
-                        m_glop._t_ins.x, \
-                        m_glop._t_ins.y, \
-                        m_glop._t_ins.z
-                        ]
-                    walk_info['change_enable'] = False
-                    height_only_enable = True
-                    corrected_pos = [
-                        m_glop._t_ins.x,
-                        m_glop._t_ins.y,
-                        m_glop._t_ins.z
-                        ]
-                    if corrected_pos[1] < sw['ground']:
-                        corrected_pos[1] = sw['ground']
-                    hit_ground_enable = None
-                    if not height_only_enable:
-                        walk_info['change_enable'] = True
-                        walk_info['pos'][0] = corrected_pos[0]
-                        walk_info['pos'][2] = corrected_pos[2]
-                            # TODO: check y (vertical) axis against
-                            # eye height and jump height etc
-                    # region pasted from get_walk_info
-                    if walk_info['pos'][1] - corrected_pos[1] < \
-                            kEpsilon:
-                        walk_info['on_ground_enable'] = True
-                    elif walk_info['pos'][1] - corrected_pos[1] > \
-                            kEpsilon:
-                        # Hovering higher than kEpsilon--
-                        # use kEpsilon as a deadzone so that
-                        # floating point errors don't cause physics
-                        # and hence many at_rest events
-                        walk_info['on_ground_enable'] = False
-
-                    if corrected_pos[1] > walk_info['pos'][1]:
-                        walk_info['change_enable'] = True
-                        walk_info['pos'][1] = corrected_pos[1]
-                    else:
-                        # Hovering, but previous if-else flags for
-                        # physics
-                        pass
-                    # endregion pasted from get_walk_info
-
-                on_ground_enable = walk_info.get('on_ground_enable')
-                if on_ground_enable is not None:
-                    if mgs['on_ground_enable'] != on_ground_enable:
-                        mgs['on_ground_enable'] = on_ground_enable
-                        if on_ground_enable:
-                            mgs['at_rest_event_enable'] = True
-                            # frame of hit is shown to player and ai
-                            # BEFORE event is handled
-                        else:
-                            pass
-                            # mgs[
-                            #     "not_at_rest_event_enable"
-                            #     ] = True
-                            # TODO: (?) make an on_not_at_rest event
-                if walk_info['change_enable']:
-                    # frame of hit is shown to player and ai
-                    # BEFORE event is handled
-                    m_glop._t_ins.x = walk_info['pos'][0]
-                    #if on_ground_enable is True:
-                    m_glop._t_ins.y = walk_info['pos'][1]
-                    m_glop._t_ins.z = walk_info['pos'][2]
-
-        # end for index in glops
-        # movitated_glop out of scope
-        # for index in self._bumper_indices:
-            # m_glop = self.glops[index]
-            # walk_info = self.constrain_glop_to_walkmesh(m_glop)
-            # on_ground_enable = walk_info.get('on_ground_enable')
-            # if on_ground_enable is not None:
-                # if mgs['on_ground_enable'] != on_ground_enable:
-                    # mgs['on_ground_enable'] = on_ground_enable
-                    # print(
-                        # "[ KivyGlops ] WARNING: update changed" +
-                        # " rest state of " + m_glop.name + " to " +
-                        # str(on_ground_enable) + " but at_rest " +
-                        # "events were not fired nor was manual" +
-                        # " programming done (not yet implemented)")
-        # endregion choice-based movement and physics
-
+            shown = lerp_tick_transform(prev, ticked, alpha)
+            set_tick_transform(this_glop, shown)
+            self._tick_shown_transforms[index] = (shown, ticked)
+
+    # Move the camera and set the matrices from the current transforms
+    # (done once per frame by update, after step).
+    def update_view(self):
+        view_start_s = best_timer()
+        pgp = self.player_glop.properties
+        sg = self.settings['globals']
         if sg['camera_perspective_number'] == \
                 self.CAMERA_FIRST_PERSON():
             self.camera_glop._t_ins.x = self.player_glop._t_ins.x
@@ -3104,9 +2340,14 @@ class KivyGlops(PyGlops):
                 self.ui.gl_widget.canvas['_world_light_dir'][1],
                 self.ui.gl_widget.canvas['_world_light_dir'][2]
                 )
-        self._delay_is_available_enable = True
+        debug_start_s = best_timer()
         self.update_view_visual_debug()
-    # end update
+        if self._frame_profile is not None:
+            frame_profile_add(self._frame_profile, 'view',
+                              debug_start_s - view_start_s)
+            frame_profile_add(self._frame_profile, 'debug',
+                              best_timer() - debug_start_s)
+    # end update_view
 
 
 class GLWidget(Widget):
@@ -3129,6 +2370,7 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
     _fps_accumulated_time = None
     _fps_accumulated_count = None
     _average_fps = None
+    _debug_label_next_s = None  # see get_debug_label_due
     _contexts = None # InstructionGroup so gl operations can be added in
                      # realtime (after resetCallback is added, but so
                      # resetCallback is on the stack after them)
@@ -3148,6 +2390,7 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
         # self.scene = KivyGlops()
         # self.scene.ui = self
         self.debug_label_suspended_level = 0
+        self._debug_label_next_s = 0.0
         self.dummy_glop = KivyGlop()
         self._fps_accumulated_time = 0.0
         self._fps_accumulated_count = 0
@@ -3346,6 +2589,9 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
         y_angle = (-(math.pi/2.0) +
                    (float(pos[1])/float(self.height-1)) *
                    (math.pi))
+        if not self.get_debug_label_due():
+            return x_angle, y_angle
+        # (the label is updated later by update_view_visual_debug)
         if 'camera_glop' not in debug_dict:
             debug_dict['camera_glop'] = {}
         if 'View' not in debug_dict:
@@ -3363,7 +2609,6 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
         else:
             if 'field of view' in debug_dict['View']:
                 debug_dict['View']['field of view'] = None
-        self.update_debug_label()
         return x_angle, y_angle
 
     def add_glop(self, this_glop, set_visible_enable=None):
@@ -3384,12 +2629,11 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
                 # self.scene.selected_glop = this_glop
             if self.scene.glops is None:
                 self.scene.glops = []
+            self.scene._claim_glop_index(this_glop)
             if self.scene.selected_glop_index is None or \
                 self.scene.selected_glop_index < 0:
-                self.scene.selected_glop_index = len(self.scene.glops)
+                self.scene.selected_glop_index = this_glop.glop_index
                 self.scene.selected_glop = this_glop
-            this_glop.glop_index = len(self.scene.glops)
-            self.scene.glops.append(this_glop)
             if self.scene.glops[this_glop.glop_index] is not this_glop:
                 # then deal with multithreading paranoia:
                 print("[ KivyGlopsWindow ] ERROR in add_glop"
@@ -3403,6 +2647,7 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
                     print("                      "
                           "ERROR: unable to correct index")
             this_glop.state['glop_index'] = this_glop.glop_index
+            self.scene.update_active_sets_at(this_glop.glop_index)
             # self.scene.glops[len(self.scene.glops)-1].glop_index = \
             #     len(self.scene.glops) - 1
             # this_glop.glop_index = len(self.scene.glops) - 1
@@ -3503,11 +2748,12 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
                 # set z from screen y:
                 pcgs['dst_angles'][1] = x_rad
                 pcgs['dst_angles'][0] = y_rad
-                if 'View' not in debug_dict:
-                    debug_dict['View'] = {}
-                # ONLY show 2D info (3D info is shown by update)
-                debug_dict['View']['screen_angles.xy'] = \
-                    fixed_width(degrees_list((x_rad, y_rad)), 5, " ")
+                if self.scene._visual_debug_enable:
+                    if 'View' not in debug_dict:
+                        debug_dict['View'] = {}
+                    # ONLY show 2D info (3D info is shown by update)
+                    debug_dict['View']['screen_angles.xy'] = DebugText(
+                        get_degrees_text, (x_rad, y_rad), 5)
             except:
                 # probably no mouse
                 if get_verbose_enable():
@@ -3666,11 +2912,14 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
                 # fixed_width(degrees_list(pgs['dst_angles']),
                             # 6, " ")
 
-        debug_dict['View']['camera xyz: '] = \
-            fixed_width(
-                self.scene.camera_glop._t_ins.xyz, 6, " ")
-        if self._average_fps is not None:
-            debug_dict['View']['fps'] = str(self._average_fps)
+        if self.scene._visual_debug_enable:
+            if 'View' not in debug_dict:
+                debug_dict['View'] = {}
+            debug_dict['View']['camera xyz: '] = DebugText(
+                fixed_width, self.scene.camera_glop._t_ins.xyz, 6, " ")
+            if self._average_fps is not None:
+                debug_dict['View']['fps'] = DebugText(
+                    str, self._average_fps)
         # global debug_dict
         # if 'Player' not in debug_dict:
         #     debug_dict['Player'] = {}
@@ -3706,13 +2955,27 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
                 try_glop = self.scene.glops[key]
                 for key2 in range(len(self.scene.glops)):
                     try2_glop = self.scene.glops[key2]
-                    if (key != key2) and (try_glop is try2_glop):
+                    if (key != key2) and (try_glop is try2_glop) and \
+                            (try_glop is not None):
                         print("[ KivyGlopsWindow ] WARNING in " +
                               "_deferred_load_glops: " +
                               "glop at " + str(key2) + " is a " +
                               "duplicate of glop at " + str(key))
         self.scene._loaded_glops_enable = True
         self.debug_label.text = ""
+        lp = self.scene._load_profile
+        if len(lp['files']) > 0:
+            for line in get_load_profile_lines(lp):
+                print("[ KivyGlopsWindow ] " + line)
+            lp_path = settings['globals']['load_profile_path']
+            if lp_path is not None:
+                try:
+                    self.scene.save_load_profile(lp_path)
+                except:
+                    print("[ KivyGlopsWindow ] ERROR in" +
+                          " _deferred_load_glops--could not finish" +
+                          " saving '" + lp_path + "'")
+                    view_traceback()
 
 
 
@@ -3731,8 +2994,11 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
         if not self.scene._visual_debug_enable:
             self.scene._visual_debug_enable = True
             self.debug_label.opacity = 1.0
+            self._debug_label_next_s = 0.0  # show the values now
             # self._contexts.clear()
             for this_glop in self.scene.glops:
+                if this_glop is None:
+                    continue  # removed
                 if this_glop._axes_mesh is not None:
                     this_glop.prepare_canvas(
                         [this_glop._axes_mesh], axes_index=0)
@@ -3748,6 +3014,8 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
             self.debug_label.opacity = 0.0
             # self._contexts.clear()
             for this_glop in self.scene.glops:
+                if this_glop is None:
+                    continue  # removed
                 this_glop.prepare_canvas([this_glop._mesh])
                 if this_glop._mesh is not None:
                     if this_glop._mesh.texture is not None:
@@ -3778,17 +3046,36 @@ class KivyGlopsWindow(ContainerForm):  # formerly a subclass of Widget
         else:
             self.debug_label_suspended_level -= 1
 
+    # Return True if the debug label is visible (see
+    # toggle_visual_debug), not suspended, and wasn't updated within
+    # debug_refresh_seconds, so the values for it only have to be set
+    # then (see update_debug_label).
+    def get_debug_label_due(self):
+        if not self.scene._visual_debug_enable:
+            return False
+        if self.debug_label_suspended_level > 0:
+            return False
+        return best_timer() >= self._debug_label_next_s
+
+    # Make the debug label text from debug_dict if due (see
+    # get_debug_label_due), and only change the label (which makes
+    # Kivy render the text again) if the text changed.
     def update_debug_label(self):
-        if self.debug_label_suspended_level <= 0:
-            yaml = ""
-            indent = ""
-            for key in debug_dict.keys():
-                yaml += indent + key + ":\n"
-                yaml = \
-                    push_yaml_text(yaml, key, debug_dict[key], indent)
-                # if debug_dict[key] is None:
-                #     self.debug_label.text = key + ": None"
-                # elif type(debug_dict[key]) is dict:
+        if not self.get_debug_label_due():
+            return
+        self._debug_label_next_s = (
+            best_timer() +
+            self.scene.settings['globals']['debug_refresh_seconds'])
+        yaml = ""
+        indent = ""
+        for key in debug_dict.keys():
+            yaml += indent + key + ":\n"
+            yaml = \
+                push_yaml_text(yaml, key, debug_dict[key], indent)
+            # if debug_dict[key] is None:
+            #     self.debug_label.text = key + ": None"
+            # elif type(debug_dict[key]) is dict:
+        if yaml != self.debug_label.text:
             self.debug_label.text = yaml
 
     # def canvasTouchDown(self, touch, *largs):
@@ -9,11 +9,20 @@ import sys
 TAU = math.pi * 2.
 NEG_TAU = -TAU
 import random
+import array
+import json
+import mmap
+import struct
 #from docutils.utils.math.math2html import VerticalSpace
 #import traceback
 from common import *
 #from pyrealtime import *
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy as np
+except ImportError:
+    np = None  # only required for soa_physics_enable
 
 import timeit
 from timeit import default_timer as best_timer
@@ -24,6 +33,33 @@ settings['globals']['attack_uses'] = \
     ['throw_arc', "throw_linear", 'melee']
 settings['globals']['camera_perspective_number'] = 1
     # is changed in PyGlops init
+settings['globals']['vertex_format_name'] = "standard"
+    # key in vertex_formats used by new glops ("compact" uses less
+    # than half the memory of "standard" but has no vertex color)
+settings['globals']['weld_vertices_enable'] = True
+    # share vertices between faces in append_wobject where position,
+    # texcoord, normal and color all match
+settings['globals']['load_worker_count'] = 0
+    # processes used by load_objs to convert uncached OBJ files (0 to
+    # load in the main thread, None for one per CPU); the main script
+    # must only start the app under if __name__ == "__main__": since
+    # each worker imports it on platforms that spawn processes
+settings['globals']['projectile_pool_max'] = 100
+    # how many copies of each glop throw_glop keeps (hidden ones are
+    # reused first; if all are shown, the oldest is moved and reused);
+    # None to make a new copy whenever none are hidden
+settings['globals']['remove_killed_enable'] = False
+    # remove_glop_at at the end of step for glops killed by
+    # kill_glop_at (except players), so their slots are reused
+settings['globals']['profile_frame_count'] = 300
+    # how many frames the frame profiler keeps the phase times of (see
+    # save_frame_profile); 0 to not profile
+settings['globals']['debug_refresh_seconds'] = .25
+    # how often the debug screen (F3) text is made (see
+    # update_debug_label), since making it every frame is slow
+settings['globals']['load_profile_path'] = None
+    # if not None, _deferred_load_glops saves the load profile there
+    # (see save_load_profile) after printing it
 settings['world'] = {}
 settings['world']['gravity_enable'] = True
     # formerly globals world_gravity_enable
@@ -44,9 +80,66 @@ settings['world']['friction_divisor'] = 1.2
     # formerly settings['globals']['world_friction_divisor']
 settings['world']['cor'] = 1.2  # coefficient of restitution
                                 # bounce_max_y_new / bounce_y_max_orig
+settings['world']['walkmesh_neighbor_depth'] = 2
+    # how many triangles away from the previous frame's walkmesh
+    # triangle to look before searching the whole walkmesh grid
+settings['world']['fixed_step_enable'] = False
+    # if True, update runs the simulation (ai, bumps and physics) in
+    # ticks of 1/ticks_per_second instead of once per frame using the
+    # frame's delay, and interpolates transforms between ticks
+settings['world']['ticks_per_second'] = 60.0
+settings['world']['max_ticks_per_frame'] = 5
+    # if frames are slower than this many ticks, the simulation slows
+    # down instead of taking even longer to catch up
+settings['world']['tick_interpolation_enable'] = True
+settings['world']['sleep_enable'] = True
+    # if True, step skips glops that haven't moved for sleep_seconds
+    # (see sleep_glop_at) until something wakes them
+settings['world']['sleep_seconds'] = 0.5
+settings['world']['sleep_speed'] = 0.01
+    # glops slower than this (units per second) are idle
+settings['world']['wake_radius'] = 1.0
+    # a moving glop wakes sleeping glops this close to its hit_radius
+settings['world']['soa_physics_enable'] = False
+    # if True (and numpy is installed), step does friction, movement
+    # and gravity for all free physics glops at once in a
+    # structure-of-arrays physics store (see new_physics_store)
+settings['world']['ai_think_seconds'] = 0.1
+    # how often an actor with ai_enable chooses its target and weapon
+    # (on_process_ai) if within ai_near_distance of the player
+settings['world']['ai_near_distance'] = 10.0
+    # farther actors think less often (in proportion to distance)
+settings['world']['ai_far_think_seconds'] = 1.0
+    # the longest time between thinks (however far away)
+settings['world']['ai_budget_seconds'] = 0.002
+    # the most time step spends on thinking (other due actors think
+    # first next time); None for no limit. Only used if the step size
+    # varies and there is a display, since it depends on how fast the
+    # machine is (see ai_budget_count)
+settings['world']['ai_budget_count'] = 100
+    # the most actors that think in one step (other due actors think
+    # first next time); None for no limit. Unlike ai_budget_seconds,
+    # the results are the same on any machine
 #settings['world']['gravity_enable'] = None  # None since
                                              # use_walkmesh_at
                                              # checks for None
+# region changed automatically after showing error only once
+tltf = " (this is the last time this message will be shown for "
+tlt = "this is the last time this message will be shown"
+bounds_warning_enable = True
+nearest_not_found_warning_enable = True
+look_at_none_warning_enable = True
+look_at_pos_none_warning_enable = True
+missing_bumpable_warning_enable = True
+missing_bumper_warning_enable = True
+missing_radius_warning_enable = True
+no_bounds_warning_enable = True
+no_numpy_warning_enable = True
+# out_of_hitbox_note_enable = True
+show_zero_degrees_pf_warning_enable = True  # pf is per frame
+show_zero_walk_upf_warning_enable = True  # upf is units per frame
+# endregion changed automatically after showing error only once
+
 settings['templates'] = {}
 # settings['templates']['properties']['hitbox'] = new_hitbox()
     # see further down (after hitbox_* functions) for hitbox
@@ -121,6 +214,17 @@ settings['templates']['state']['velocity'] = [0., 0., 0.]
 settings['templates']['state']['velocity'][0] = 0.0
 settings['templates']['state']['velocity'][1] = 0.0
 settings['templates']['state']['velocity'][2] = 0.0
+settings['templates']['state']['walkmesh_index'] = None
+    # walkmesh (index in _walkmeshes) under glop during previous frame
+settings['templates']['state']['walkmesh_polygon_offset'] = None
+    # polygon_offset (see get_walkmesh_info_xz) under glop during
+    # previous frame, checked first (then neighbors) next frame
+settings['templates']['state']['idle_s'] = 0.0
+    # how long the glop has been idle (see sleep_enable)
+settings['templates']['state']['ai_next_s'] = None
+    # when the actor thinks next (see ai_think_seconds)
+settings['templates']['state']['land_params'] = None
+    # set by update_land_params_at
 
 tab_string = "  "
 
@@ -152,9 +256,57 @@ VFORMAT_NAME_INDEX = 0
 VFORMAT_VECTOR_LEN_INDEX = 1
 VFORMAT_TYPE_INDEX = 2
 
+# region vertex formats
+# Each glop has its own vertex_format (see PyGlop set_vertex_format);
+# new glops get settings['globals']['vertex_format_name']. The offsets
+# of each element are found by name (see on_vertex_format_change),
+# and any element other than position may be omitted.
+vertex_formats = {}
+# a_position: Munshi prefers vec4 (Kivy prefers vec3)
+# a_texcoord0: Munshi prefers vec4 (Kivy prefers vec2);
+#  vTexCoord0; available if enable_tex[0] is true
+# a_texcoord1: Munshi prefers vec4 (Kivy prefers vec2);
+#  available if enable_tex[1] is true
+# a_color: vColor (diffuse color of vertex)
+# a_normal: vNormal; Munshi prefers vec3 (Kivy also
+#  prefers vec3)
+vertex_formats['standard'] = [(b'a_position', 4, 'float'),
+                              (b'a_texcoord0', 4, 'float'),
+                              (b'a_texcoord1', 4, 'float'),
+                              (b'a_color', 4, 'float'),
+                              (b'a_normal', 3, 'float')]
+    # 19 floats per vertex
+# (OpenGL fills in 1.0 for the w of a vec3 a_position)
+vertex_formats['compact'] = [(b'a_position', 3, 'float'),
+                             (b'a_texcoord0', 2, 'float'),
+                             (b'a_normal', 3, 'float')]
+    # 8 floats per vertex
+vertex_formats['compact_color'] = [(b'a_position', 3, 'float'),
+                                   (b'a_texcoord0', 2, 'float'),
+                                   (b'a_normal', 3, 'float'),
+                                   (b'a_color', 4, 'float')]
+    # 12 floats per vertex (for obj files with vertex colors)
+
+def new_vertex_format(name):
+    return list(vertex_formats[name])
+# endregion vertex formats
+
 EMPTY_ITEM = dict()
 EMPTY_ITEM['name'] = "Empty"
 
+def split_glop_commands(semicolon_separated_commands):
+    '''
+    Split a command string such as item_dict['bump'] ("hide; obtain")
+    into a tuple of command names (blank ones are skipped).
+    '''
+    results = []
+    if semicolon_separated_commands is not None:
+        for command in semicolon_separated_commands.split(";"):
+            command = command.strip()
+            if len(command) > 0:
+                results.append(command)
+    return tuple(results)
+
 def new_flag_f():
     return .4444
 
@@ -169,6 +321,10 @@ kEpsilon = 1.0E-6 # adjust to suit.  If you use floats, you'll
 # kEpsilon = 1.0E-7 # adjust to suit.  If you use floats, you'll
                   # probably want something like 1.0E-7 (added
                   # by Poikilos)
+kAreaEpsilon = 1.0E-12  # a triangle with less area than this times
+                        # its squared size is treated as a line (see
+                        # is_in_triangle_vec2), since a fixed minimum
+                        # would also skip small thin triangles
 
 # returns true if difference is between -kEpsilon and kEpsilon
 def fequals(f1, f2):
@@ -204,6 +360,10 @@ def degrees_list(vals):
         result.append(math.degrees(val))
     return result
 
+# get angles (in radians) as degrees in columns (see fixed_width)
+def get_degrees_text(vals, visible_width):
+    return fixed_width(degrees_list(vals), visible_width, " ")
+
 def get_fvec4_from_svec3(vals, last_value):
     results = None
     try:
@@ -427,31 +587,22 @@ def get_near_line_info_xz(a, b, c):
 
 #returns distance from point a to line bc, swizzled to 2d on xz plane
 def get_distance_vec2_to_vec2line_xz(a, b, c):
-    return (
-        math.sin(math.atan2(b[2] - a[2], b[0] - a[0]) -
-                 math.atan2(c[2] - a[2], c[0] - a[0])) *
-        math.sqrt((b[0] - a[0]) * (b[0] - a[0]) +
-                  (b[2] - a[2]) * (b[2] - a[2]))
-    )
-#returns distance from point a to line bc
+    return get_distance_vec2_to_vec2line((a[0], a[2]), (b[0], b[2]),
+                                         (c[0], c[2]))
+
+#returns distance from point a to line bc (the whole line, not only
+# the segment--see get_near_line_info_xz for that), or the distance
+# from a to b if b and c are the same point
 def get_distance_vec2_to_vec2line(a, b, c):
-    # from ADOConnection on stackoverflow answered Nov 18 '13 at 22:37
-    # this commented part is the expanded version of the same answer
-    # (both versions are given in answer)
-    # normalize points
-    # Point cn = new Point(c[0] - a[0], c[1] - a[1])
-    # Point bn = new Point(b[0] - a[0], b[1] - a[1])
-
-    # double angle = Math.Atan2(bn[1], bn[0]) - Math.Atan2(cn[1], cn[0])
-    # double abLength = Math.Sqrt(bn[0]*bn[0] + bn[1]*bn[1])
-
-    #return math.sin(angle)*abLength;
-    return (
-        math.sin(math.atan2(b[1] - a[1], b[0] - a[0]) -
-                 math.atan2(c[1] - a[1], c[0] - a[0])) *
-        math.sqrt((b[0] - a[0]) * (b[0] - a[0]) +
-                  (b[1] - a[1]) * (b[1] - a[1]))
-    )
+    # formerly from ADOConnection on stackoverflow answered Nov 18 '13
+    # at 22:37, but that was the distance from b to line ac (the angle
+    # version of |ab x ac| / |ac|)
+    dx = c[0] - b[0]
+    dy = c[1] - b[1]
+    length = math.sqrt(dx * dx + dy * dy)
+    if length <= kEpsilon:
+        return get_distance_vec2(a, b)
+    return abs(dx * (a[1] - b[1]) - dy * (a[0] - b[0])) / length
 #swizzle to 2d point on xz plane, then get distance
 def get_distance_vec3_xz(first_pt, second_pt):
     return math.sqrt((second_pt[0]-first_pt[0])**2 +
@@ -462,6 +613,11 @@ def get_distance_vec3(first_pt, second_pt):
                      (second_pt[1] - first_pt[1])**2 +
                      (second_pt[2] - first_pt[2])**2)
 
+def get_distance_glops(a_glop, b_glop):
+    return math.sqrt((b_glop._t_ins.x - a_glop._t_ins.x)**2 +
+                     (b_glop._t_ins.y - a_glop._t_ins.y)**2 +
+                     (b_glop._t_ins.z - a_glop._t_ins.z)**2)
+
 def get_distance_vec2(first_pt, second_pt):
     return math.sqrt((second_pt[0]-first_pt[0])**2 +
                      (second_pt[1]-first_pt[1])**2)
@@ -569,22 +725,110 @@ def is_in_triangle_xz(check_vec3, a_vec3, b_vec3, c_vec3):
     # /how-to-determine-a-point-in-a-2d-triangle )
     return  s>kEpsilon and t>kEpsilon and 1-s-t>kEpsilon
 
-#swizzled to xz (uses index 0 and 2 of vec3)
+#uses index 0 and 1 of each vec2 (pass xz of a vec3 as a vec2 for xz)
 def is_in_triangle_vec2(check_vec2, a_vec2, b_vec2, c_vec2):
-#    IsInTriangle_Barymetric
+    # IsInTriangle_Barymetric (the same math as is_in_triangle_coords,
+    # but with each coordinate read once and 1/(2*Area) computed once,
+    # since the walkmesh calls this the most--see
+    # benchmarks/bench_geometry.py)
     # kEpsilon = 1.0E-7 # adjust to suit.  If you use floats, you'll
     # probably want something like 1E-7f (added by Poikilos)
-    Area = 1/2*(-b_vec2[1]*c_vec2[0] + a_vec2[1]*(-b_vec2[0] + c_vec2[0]) + a_vec2[0]*(b_vec2[1] - c_vec2[1]) + b_vec2[0]*c_vec2[1])
-    if Area>kEpsilon or Area<-kEpsilon:
-        s = 1/(2*Area)*(a_vec2[1]*c_vec2[0] - a_vec2[0]*c_vec2[1] + (c_vec2[1] - a_vec2[1])*check_vec2[0] + (a_vec2[0] - c_vec2[0])*check_vec2[1])
-        t = 1/(2*Area)*(a_vec2[0]*b_vec2[1] - a_vec2[1]*b_vec2[0] + (a_vec2[1] - b_vec2[1])*check_vec2[0] + (b_vec2[0] - a_vec2[0])*check_vec2[1])
-        # TODO: fix situation where it fails when clockwise (see
-        # discussion at http://stackoverflow.com/questions/2049582
-        # /how-to-determine-a-point-in-a-2d-triangle )
+    px = check_vec2[0]
+    py = check_vec2[1]
+    ax = a_vec2[0]
+    ay = a_vec2[1]
+    bx = b_vec2[0]
+    by = b_vec2[1]
+    cx = c_vec2[0]
+    cy = c_vec2[1]
+    abx = bx - ax
+    aby = by - ay
+    acx = cx - ax
+    acy = cy - ay
+    Area = 1/2*(abx*acy - aby*acx)
+    # (relative to the size, so slivers along walkmesh seams count,
+    # but triangles flattened to within float rounding don't)
+    min_area = kAreaEpsilon*(abx*abx + aby*aby + acx*acx + acy*acy)
+    if Area>min_area or Area<-min_area:
+        inverse = 1/(2*Area)
+        s = inverse*(ay*cx - ax*cy + (cy - ay)*px + (ax - cx)*py)
+        t = inverse*(ax*by - ay*bx + (ay - by)*px + (bx - ax)*py)
+        # (s and t are barycentric coordinates, so this works for
+        # either winding, unlike PointInTriangle on an edge)
         return  s>kEpsilon and t>kEpsilon and 1-s-t>kEpsilon
     else:
         return False
 
+# region batched geometry
+# numpy versions of the geometry functions above that take whole
+# arrays of coordinates (one row per check), so that many checks cost
+# a few numpy operations instead of a Python call each (see
+# benchmarks/bench_geometry.py for when that is faster, and for the
+# check that the results are the same as the per-call versions).
+
+def is_in_triangle_vec2_batch(check_vec2s, a_vec2s, b_vec2s, c_vec2s):
+    '''
+    Get a bool array that is the result of is_in_triangle_vec2 for each
+    row (the same operations in the same order, so borderline cases
+    match). The arguments can be any arrays (or sequences) with a last
+    dimension of 2 that numpy can broadcast together (such as many
+    points and one triangle, or one point and many triangles).
+    '''
+    p = np.asarray(check_vec2s, dtype=np.float64)
+    a = np.asarray(a_vec2s, dtype=np.float64)
+    b = np.asarray(b_vec2s, dtype=np.float64)
+    c = np.asarray(c_vec2s, dtype=np.float64)
+    ab = b - a
+    ac = c - a
+    area = 1/2*(ab[..., 0]*ac[..., 1] - ab[..., 1]*ac[..., 0])
+    min_area = kAreaEpsilon*(ab[..., 0]*ab[..., 0] + ab[..., 1]*ab[..., 1]
+                             + ac[..., 0]*ac[..., 0] + ac[..., 1]*ac[..., 1])
+    valid = (area > min_area) | (area < -min_area)
+    inverse = 1/(2*np.where(valid, area, 1.0))
+    s = inverse*(a[..., 1]*c[..., 0] - a[..., 0]*c[..., 1]
+                 + (c[..., 1] - a[..., 1])*p[..., 0]
+                 + (a[..., 0] - c[..., 0])*p[..., 1])
+    t = inverse*(a[..., 0]*b[..., 1] - a[..., 1]*b[..., 0]
+                 + (a[..., 1] - b[..., 1])*p[..., 0]
+                 + (b[..., 0] - a[..., 0])*p[..., 1])
+    return valid & (s > kEpsilon) & (t > kEpsilon) & (1-s-t > kEpsilon)
+
+def get_near_line_info_xz_batch(a, b_vec3s, c_vec3s):
+    '''
+    Do get_near_line_info_xz for point a and each line segment from a
+    row of b_vec3s to the same row of c_vec3s (arrays of shape (n, 3)).
+    Returns (points, distances) where points is an (n, 3) array of
+    the nearest points (y is always a[1]) and distances is the squared
+    xz distance to each.
+    '''
+    b = np.asarray(b_vec3s, dtype=np.float64)
+    c = np.asarray(c_vec3s, dtype=np.float64)
+    kMinSegmentLenSquared = 0.00000001  # same as get_near_line_info_xz
+    dx = c[:, 0] - b[:, 0]
+    dy = c[:, 2] - b[:, 2]
+    db_x = a[0] - b[:, 0]
+    db_y = a[2] - b[:, 2]
+    seg_len_squared = (dx * dx) + (dy * dy)
+    segment_enables = ~((seg_len_squared >= -kMinSegmentLenSquared) &
+                        (seg_len_squared <= kMinSegmentLenSquared))
+    t = ((db_x * dx) + (db_y * dy)) / np.where(segment_enables,
+                                               seg_len_squared, 1.0)
+    qx = np.where(t < kEpsilon, b[:, 0],
+                  np.where(t > (1.0 - kEpsilon), c[:, 0], b[:, 0] + (t * dx)))
+    qy = np.where(t < kEpsilon, b[:, 2],
+                  np.where(t > (1.0 - kEpsilon), c[:, 2], b[:, 2] + (t * dy)))
+    qx = np.where(segment_enables, qx, b[:, 0])
+    qy = np.where(segment_enables, qy, b[:, 2])
+    dpqx = a[0] - qx
+    dpqy = a[2] - qy
+    points = np.empty((len(b), 3), dtype=np.float64)
+    points[:, 0] = qx
+    points[:, 1] = a[1]
+    points[:, 2] = qy
+    return points, (dpqx * dpqx) + (dpqy * dpqy)
+
+# endregion batched geometry
+
 #class ItemData:  #changed to dict
 #    name = None
 #    passive_bumper_command = None
@@ -623,6 +867,666 @@ def hitbox_contains_vec3(o, pos):
 
 settings['templates']['properties']['hitbox'] = new_hitbox()
 
+# region spatial hash
+# A spatial hash is a uniform grid stored sparsely in a dict (only
+# occupied cells exist). If cell_size is at least the largest distance
+# that matters, anything closer than that is in the same or an adjacent
+# cell, so only 27 cells ever have to be checked (broadphase).
+def new_spatial_hash(cell_size):
+    ret = {}
+    if cell_size is None or cell_size <= kEpsilon:
+        cell_size = 1.0
+    ret['cell_size'] = cell_size
+    ret['cells'] = {}
+    return ret
+
+def get_spatial_hash_key(sh, pos):
+    cs = sh['cell_size']
+    return (int(math.floor(pos[0] / cs)),
+            int(math.floor(pos[1] / cs)),
+            int(math.floor(pos[2] / cs)))
+
+def spatial_hash_add(sh, pos, value):
+    key = get_spatial_hash_key(sh, pos)
+    cell = sh['cells'].get(key)
+    if cell is None:
+        cell = []
+        sh['cells'][key] = cell
+    cell.append(value)
+
+def spatial_hash_query(sh, pos):
+    '''
+    Get all values in the cell containing pos and in the 26 cells
+    around it (values may be farther than cell_size away, so the caller
+    still has to do the exact distance test).
+    '''
+    results = []
+    cx, cy, cz = get_spatial_hash_key(sh, pos)
+    cells = sh['cells']
+    for x in (cx-1, cx, cx+1):
+        for y in (cy-1, cy, cy+1):
+            for z in (cz-1, cz, cz+1):
+                cell = cells.get((x, y, z))
+                if cell is not None:
+                    results.extend(cell)
+    return results
+# endregion spatial hash
+
+# region walkmesh grid
+# A walkmesh grid is a uniform grid on the xz plane where each cell
+# lists the triangles whose xz bounds overlap the cell, so finding the
+# triangle under a point only tests the few triangles in one cell.
+# 'tris' holds a (a, b, c) tuple of vec3 for each triangle, so
+# polygon_offset (index into glop's indices) is poly_index * 3.
+def new_walkmesh_grid(w_glop, tris_per_cell=2.0):
+    ret = {}
+    wgv = w_glop.vertices
+    wgi = w_glop.indices
+    vd = w_glop.vertex_depth
+    X_i = w_glop._POSITION_OFFSET + 0
+    Y_i = w_glop._POSITION_OFFSET + 1
+    Z_i = w_glop._POSITION_OFFSET + 2
+    poly_side_count = 3  # assumes tris
+    poly_count = int(len(wgi)/poly_side_count)
+    tris = []
+    min_x = None
+    max_x = None
+    min_z = None
+    max_z = None
+    po = 0  # polygon offset
+    for poly_index in range(0, poly_count):
+        tri = []
+        for corner_i in range(poly_side_count):
+            v_offset = wgi[po+corner_i] * vd
+            x = wgv[v_offset+X_i]
+            z = wgv[v_offset+Z_i]
+            tri.append((x, wgv[v_offset+Y_i], z))
+            if min_x is None or x < min_x:
+                min_x = x
+            if max_x is None or x > max_x:
+                max_x = x
+            if min_z is None or z < min_z:
+                min_z = z
+            if max_z is None or z > max_z:
+                max_z = z
+        tris.append((tri[0], tri[1], tri[2]))
+        po += poly_side_count
+    if min_x is None:
+        min_x, max_x, min_z, max_z = 0.0, 0.0, 0.0, 0.0
+    width = max_x - min_x
+    depth = max_z - min_z
+    cell_size = 0.0
+    if poly_count > 0:
+        cell_size = math.sqrt(width * depth * tris_per_cell /
+                              float(poly_count))
+    # don't let a long thin walkmesh make millions of cells:
+    if cell_size < max(width, depth) / 256.0:
+        cell_size = max(width, depth) / 256.0
+    if cell_size <= kEpsilon:
+        cell_size = 1.0
+    cols = int(width / cell_size) + 1
+    rows = int(depth / cell_size) + 1
+    cells = [None] * (cols * rows)
+    for poly_index in range(0, poly_count):
+        tri = tris[poly_index]
+        col_min = int((min(tri[0][0], tri[1][0], tri[2][0]) - min_x) /
+                      cell_size)
+        col_max = int((max(tri[0][0], tri[1][0], tri[2][0]) - min_x) /
+                      cell_size)
+        row_min = int((min(tri[0][2], tri[1][2], tri[2][2]) - min_z) /
+                      cell_size)
+        row_max = int((max(tri[0][2], tri[1][2], tri[2][2]) - min_z) /
+                      cell_size)
+        for row in range(row_min, min(row_max, rows-1) + 1):
+            for col in range(col_min, min(col_max, cols-1) + 1):
+                cell_i = row * cols + col
+                if cells[cell_i] is None:
+                    cells[cell_i] = []
+                cells[cell_i].append(poly_index)
+    # triangles are neighbors if they share an edge (compare positions
+    # since OBJ import doesn't share vertices between faces):
+    neighbors = []
+    edge_polys = {}
+    for poly_index in range(0, poly_count):
+        neighbors.append([])
+        tri = tris[poly_index]
+        for corner_i in range(poly_side_count):
+            a = tri[corner_i]
+            b = tri[(corner_i+1) % poly_side_count]
+            a = (round(a[0], 5), round(a[1], 5), round(a[2], 5))
+            b = (round(b[0], 5), round(b[1], 5), round(b[2], 5))
+            edge = (a, b) if a < b else (b, a)
+            other_polys = edge_polys.get(edge)
+            if other_polys is None:
+                other_polys = []
+                edge_polys[edge] = other_polys
+            for other_index in other_polys:
+                if other_index not in neighbors[poly_index]:
+                    neighbors[poly_index].append(other_index)
+                    neighbors[other_index].append(poly_index)
+            other_polys.append(poly_index)
+    ret['tris'] = tris
+    ret['neighbors'] = neighbors
+    ret['cells'] = cells
+    ret['cell_size'] = cell_size
+    ret['cols'] = cols
+    ret['rows'] = rows
+    ret['minimums'] = (min_x, min_z)
+    return ret
+
+# returns poly_index (polygon_offset/3) of first triangle containing
+# xz of check_vec3, or None
+def walkmesh_grid_find_tri_xz(grid, check_vec3):
+    cs = grid['cell_size']
+    col = int(math.floor((check_vec3[0] - grid['minimums'][0]) / cs))
+    row = int(math.floor((check_vec3[2] - grid['minimums'][1]) / cs))
+    if col < 0 or row < 0 or col >= grid['cols'] or \
+            row >= grid['rows']:
+        return None
+    cell = grid['cells'][row * grid['cols'] + col]
+    if cell is None:
+        return None
+    check_vec2 = check_vec3[0], check_vec3[2]
+    tris = grid['tris']
+    for poly_index in cell:
+        a, b, c = tris[poly_index]
+        if is_in_triangle_vec2(check_vec2, (a[0], a[2]), (b[0], b[2]),
+                               (c[0], c[2])):
+            return poly_index
+    return None
+
+# returns poly_index of the first triangle containing xz of
+# check_vec3 that is within depth shared edges of near_poly_index
+# (checked in breadth-first order), or None
+def walkmesh_grid_find_tri_near_xz(grid, check_vec3, near_poly_index,
+                                   depth):
+    check_vec2 = check_vec3[0], check_vec3[2]
+    tris = grid['tris']
+    neighbors = grid['neighbors']
+    if near_poly_index < 0 or near_poly_index >= len(tris):
+        return None
+    checked = set([near_poly_index])
+    ring = [near_poly_index]
+    for ring_i in range(0, depth+1):
+        next_ring = []
+        for poly_index in ring:
+            a, b, c = tris[poly_index]
+            if is_in_triangle_vec2(check_vec2, (a[0], a[2]),
+                                   (b[0], b[2]), (c[0], c[2])):
+                return poly_index
+            for other_index in neighbors[poly_index]:
+                if other_index not in checked:
+                    checked.add(other_index)
+                    next_ring.append(other_index)
+        ring = next_ring
+    return None
+
+# returns ((x,y,z), distance_squared) for nearest point on any edge of
+# the walkmesh (y is always pos[1] like get_near_line_info_xz), or
+# (None, None) if walkmesh has no triangles. Cells are visited in
+# rings around pos, stopping once no unvisited cell can be closer.
+def walkmesh_grid_get_nearest_xz(grid, pos):
+    result = None
+    closest_distance = None
+    cs = grid['cell_size']
+    cols = grid['cols']
+    rows = grid['rows']
+    min_x, min_z = grid['minimums']
+    cells = grid['cells']
+    tris = grid['tris']
+    center_col = int(math.floor((pos[0] - min_x) / cs))
+    center_row = int(math.floor((pos[2] - min_z) / cs))
+    # start at nearest cell if pos is outside of the grid:
+    center_col = min(max(center_col, 0), cols-1)
+    center_row = min(max(center_row, 0), rows-1)
+    checked = set()
+    for r in range(0, max(cols, rows)):
+        for row in range(center_row-r, center_row+r+1):
+            if row < 0 or row >= rows:
+                continue
+            if row == center_row-r or row == center_row+r:
+                ring_cols = range(center_col-r, center_col+r+1)
+            else:
+                ring_cols = (center_col-r, center_col+r)
+            for col in ring_cols:
+                if col < 0 or col >= cols:
+                    continue
+                cell = cells[row * cols + col]
+                if cell is None:
+                    continue
+                for poly_index in cell:
+                    if poly_index in checked:
+                        continue
+                    checked.add(poly_index)
+                    a, b, c = tris[poly_index]
+                    for edge in ((a, b), (b, c), (c, a)):
+                        this_point, this_distance = \
+                            get_near_line_info_xz(pos, edge[0], edge[1])
+                        if (closest_distance is None) or \
+                                (this_distance < closest_distance):
+                            result = this_point
+                            closest_distance = this_distance
+        if closest_distance is not None:
+            # anything not checked yet is outside of the box of cells
+            # within r of the center cell:
+            margin = min(
+                pos[0] - (min_x + (center_col - r) * cs),
+                (min_x + (center_col + r + 1) * cs) - pos[0],
+                pos[2] - (min_z + (center_row - r) * cs),
+                (min_z + (center_row + r + 1) * cs) - pos[2]
+            )
+            if margin > 0.0 and closest_distance <= margin * margin:
+                break
+    return result, closest_distance
+# endregion walkmesh grid
+
+# region physics store
+# A structure-of-arrays (SoA) store of the position, velocity and flags
+# of glops, indexed by glop_index, so that step can do the physics of
+# many glops with a few numpy operations instead of a Python loop
+# (requires numpy--see settings['world']['soa_physics_enable']).
+# A glop that is only falling is owned by the store: the arrays are its
+# real position and velocity across steps, step doesn't visit it, and
+# only values that change are copied to the glop (for drawing and for
+# other code that reads them). It is released (see PyGlops
+# _release_physics_store_at) when it lands, is bumped, is moved by
+# set_pos or set_coord, or by update_active_sets_at.
+PHYSICS_GROUND_FLAG = 1  # on_ground_enable
+PHYSICS_MOVED_FLAG = 2  # position changed during the last integrate
+PHYSICS_OWNED_FLAG = 4  # the arrays are authoritative (see above)
+PHYSICS_CLIP_FLAG = 8  # in PyGlops _clip_indices when gathered
+
+def new_physics_store(capacity=64):
+    ret = {}
+    ret['capacity'] = 0
+    ret['pos'] = np.zeros((0, 3), dtype=np.float64)
+    ret['vel'] = np.zeros((0, 3), dtype=np.float64)
+    ret['flags'] = np.zeros(0, dtype=np.uint8)
+    ret['owned'] = set()  # indices with PHYSICS_OWNED_FLAG
+    physics_store_reserve(ret, capacity)
+    return ret
+
+def physics_store_reserve(ps, count):
+    '''
+    Make the arrays long enough for glop_index count-1 (grow by
+    doubling so adding glops one at a time doesn't copy every time).
+    '''
+    if count <= ps['capacity']:
+        return
+    capacity = max(count, ps['capacity'] * 2)
+    for key in ['pos', 'vel', 'flags']:
+        old = ps[key]
+        new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+        new[:len(old)] = old
+        ps[key] = new
+    ps['capacity'] = capacity
+
+def physics_store_integrate(ps, gather_indices, own_enables,
+                            clip_indices, glops, got_frame_delay,
+                            world):
+    '''
+    Do the same as the per-glop physics in PyGlops step (friction for
+    glops on the ground, then movement by velocity, then gravity for
+    glops not on the ground) at once for every glop owned by the store
+    and for the glops at gather_indices. Only the glops at
+    gather_indices are read (each becomes owned if its value in
+    own_enables is True, and gets PHYSICS_CLIP_FLAG if it is in
+    clip_indices), and only positions and velocities that changed are
+    written to the glops.
+    Returns a sorted array of the indices that were integrated.
+    '''
+    if len(gather_indices) > 0:
+        gidx = np.array(gather_indices, dtype=np.intp)
+        physics_store_reserve(ps, int(gidx.max()) + 1)
+    pos = ps['pos']
+    vel = ps['vel']
+    flags = ps['flags']
+    if len(gather_indices) > 0:
+        pos[gidx] = [glops[i].get_pos() for i in gather_indices]
+        vel[gidx] = [glops[i].state['velocity'] for i in gather_indices]
+        new_flags = []
+        for gather_i in range(len(gather_indices)):
+            index = gather_indices[gather_i]
+            this_flags = 0
+            if glops[index].state['on_ground_enable']:
+                this_flags |= PHYSICS_GROUND_FLAG
+            if own_enables[gather_i]:
+                this_flags |= PHYSICS_OWNED_FLAG
+                ps['owned'].add(index)
+            if index in clip_indices:
+                this_flags |= PHYSICS_CLIP_FLAG
+            new_flags.append(this_flags)
+        flags[gidx] = new_flags
+        idx = np.union1d(np.flatnonzero(flags & PHYSICS_OWNED_FLAG),
+                         gidx)
+    else:
+        idx = np.flatnonzero(flags & PHYSICS_OWNED_FLAG)
+    if len(idx) < 1:
+        return idx
+    ground = (flags[idx] & PHYSICS_GROUND_FLAG) != 0
+    v = vel[idx]
+    prev_v = v.copy()
+    # friction (only if no upward velocity):
+    vy = v[:, 1]
+    wfd = world['friction_divisor']
+    wfdp = np.where(vy < -kEpsilon, wfd - vy, wfd)
+        # pressure increases friction
+    friction = ground & (vy <= kEpsilon)
+    for axis_i in (0, 2):
+        va = v[:, axis_i]
+        v[:, axis_i] = np.where(friction,
+                                np.where(va > kEpsilon, va / wfdp, 0.),
+                                va)
+    delta = v * got_frame_delay
+    moved = np.any(delta != 0., axis=1)
+    pos[idx] += delta
+    if got_frame_delay > 0.0:
+        v[~ground, 1] -= world['gravity'] * got_frame_delay
+    vel[idx] = v
+    flags[idx] = (flags[idx] & ~np.uint8(PHYSICS_MOVED_FLAG)) | \
+        np.where(moved, PHYSICS_MOVED_FLAG, 0).astype(np.uint8)
+    changed = np.any(v != prev_v, axis=1)
+    # Write back only what changed (_t_ins is set directly so that
+    # owned glops are not released--see _on_change_pos):
+    sync = np.flatnonzero(moved | changed)
+    sync_indices = idx[sync].tolist()
+    new_pos = pos[idx[sync]].tolist()
+    new_v = v[sync].tolist()
+    moved = moved[sync].tolist()
+    changed = changed[sync].tolist()
+    for sync_i in range(len(sync_indices)):
+        this_glop = glops[sync_indices[sync_i]]
+        if moved[sync_i]:
+            this_pos = new_pos[sync_i]
+            this_glop._t_ins.x = this_pos[0]
+            this_glop._t_ins.y = this_pos[1]
+            this_glop._t_ins.z = this_pos[2]
+        if changed[sync_i]:
+            this_glop.state['velocity'][:] = new_v[sync_i]
+    return idx
+# endregion physics store
+
+# region frame profile
+# A rolling record of how long each phase of each frame took (in
+# seconds), so frame spikes can be found without a profiler. step adds
+# the times of its phases, and the backend ends each frame.
+PROFILE_PHASES = ['ai', 'on_update_glops', 'bump', 'movement', 'clip',
+                  'view', 'debug', 'frame']
+
+def new_frame_profile(frame_count=300):
+    ret = {}
+    ret['phases'] = list(PROFILE_PHASES)  # columns (more can be added)
+    ret['frame_count'] = frame_count  # how many frames to keep
+    ret['frames'] = []  # each is a frame number then a time per phase
+    ret['next_i'] = 0  # where in frames the next frame goes when full
+    ret['frame_number'] = 0
+    ret['frame'] = {}  # phase times so far in the current frame
+    return ret
+
+def frame_profile_add(fp, phase, seconds):
+    fpf = fp['frame']
+    if phase in fpf:
+        fpf[phase] += seconds
+    else:
+        if phase not in fp['phases']:
+            fp['phases'].append(phase)
+        fpf[phase] = seconds
+
+def frame_profile_end_frame(fp):
+    fpf = fp['frame']
+    row = [fp['frame_number']]
+    for phase in fp['phases']:
+        row.append(fpf.get(phase, 0.0))
+    if len(fp['frames']) < fp['frame_count']:
+        fp['frames'].append(row)
+    else:
+        fp['frames'][fp['next_i']] = row
+        fp['next_i'] = (fp['next_i'] + 1) % fp['frame_count']
+    fp['frame_number'] += 1
+    fp['frame'] = {}
+
+def get_frame_profile_rows(fp):
+    '''
+    Get the kept frames, oldest first (each is a frame number then a
+    time in seconds for each of fp['phases']).
+    '''
+    i = fp['next_i']
+    return fp['frames'][i:] + fp['frames'][:i]
+
+def get_frame_profile_percentiles(fp, percentiles=(50, 95)):
+    '''
+    Get a dict of phase names, each with a dict such as
+    {'p50': ..., 'p95': ..., 'max': ...} in milliseconds, for the kept
+    frames.
+    '''
+    results = {}
+    frames = fp['frames']
+    for phase_i in range(len(fp['phases'])):
+        ms_list = []
+        for row in frames:
+            if phase_i + 1 < len(row):
+                ms_list.append(row[phase_i + 1] * 1000.0)
+            else:
+                ms_list.append(0.0)  # the phase was added later
+        ms_list.sort()
+        result = {}
+        for percentile in percentiles:
+            value = None
+            if len(ms_list) > 0:
+                value = ms_list[min(len(ms_list) - 1,
+                                    len(ms_list) * percentile // 100)]
+            result['p' + str(percentile)] = value
+        result['max'] = None
+        if len(ms_list) > 0:
+            result['max'] = ms_list[-1]
+        results[fp['phases'][phase_i]] = result
+    return results
+
+def write_frame_profile(fp, path):
+    '''
+    Save the kept frames (in milliseconds) as a CSV file with a
+    frame_number column and a column for each phase, or as JSON (which
+    also has the percentiles) if path ends with ".json".
+    '''
+    rows = get_frame_profile_rows(fp)
+    if path.lower().endswith(".json"):
+        frames = []
+        for row in rows:
+            frame = {'frame_number': row[0]}
+            for phase_i in range(len(fp['phases'])):
+                ms = 0.0
+                if phase_i + 1 < len(row):
+                    ms = row[phase_i + 1] * 1000.0
+                frame[fp['phases'][phase_i]] = ms
+            frames.append(frame)
+        with open(path, 'w') as outs:
+            json.dump({'unit': "ms",
+                       'phases': fp['phases'],
+                       'percentiles': get_frame_profile_percentiles(
+                           fp, percentiles=(50, 95, 99)),
+                       'frames': frames}, outs, indent=1)
+    else:
+        with open(path, 'w') as outs:
+            outs.write(",".join(["frame_number"] + fp['phases']) + "\n")
+            for row in rows:
+                values = [str(row[0])]
+                for phase_i in range(len(fp['phases'])):
+                    ms = 0.0
+                    if phase_i + 1 < len(row):
+                        ms = row[phase_i + 1] * 1000.0
+                    values.append("%.4f" % ms)
+                outs.write(",".join(values) + "\n")
+# endregion frame profile
+
+# region load profile
+# How long each stage of loading took (in seconds), for each file
+# loaded by load_obj and in total, so slow level loads can be broken
+# down. Stages are exclusive: the time for 'hit_range' and 'texture'
+# is not also counted in the stage that caused it (see
+# add_load_time_since). 'other' is the rest of the load_obj time.
+LOAD_STAGES = ['read', 'parse', 'mtl', 'interleave', 'pivot', 'hit_range',
+               'texture', 'mesh', 'add_glop', 'cache_load', 'cache_save',
+               'other']
+NESTED_LOAD_STAGES = ['hit_range', 'texture']
+
+def new_load_profile():
+    ret = {}
+    ret['stages'] = {}  # total seconds for each stage (all files)
+    for stage in LOAD_STAGES:
+        ret['stages'][stage] = 0.0
+    ret['total_s'] = 0.0
+    ret['files'] = []  # see load_profile_begin_file
+    ret['file'] = None  # the file being loaded (in files)
+    return ret
+
+def load_profile_begin_file(lp, path):
+    file_dict = {}
+    file_dict['path'] = path
+    file_dict['cached'] = False
+    file_dict['glops_count'] = 0
+    file_dict['total_s'] = 0.0
+    file_dict['stages'] = {}
+    for stage in LOAD_STAGES:
+        file_dict['stages'][stage] = 0.0
+    lp['files'].append(file_dict)
+    lp['file'] = file_dict
+    return file_dict
+
+def load_profile_add(lp, stage, seconds):
+    lp['stages'][stage] = lp['stages'].get(stage, 0.0) + seconds
+    if lp['file'] is not None:
+        lp['file']['stages'][stage] = \
+            lp['file']['stages'].get(stage, 0.0) + seconds
+
+def load_profile_add_times(lp, times):
+    '''
+    Add a dict of stage times such as WObjFile's load_times or a
+    glop's _load_times.
+    '''
+    for stage in times:
+        load_profile_add(lp, stage, times[stage])
+
+def load_profile_end_file(lp, total_s, glops_count, cached):
+    file_dict = lp['file']
+    if file_dict is None:
+        print("[ PyGlops ] ERROR in load_profile_end_file: no file was"
+              " begun (see load_profile_begin_file)")
+        return
+    file_dict['total_s'] = total_s
+    file_dict['glops_count'] = glops_count
+    file_dict['cached'] = cached
+    # (the known stages can add up to more than total_s if the OBJ was
+    # converted in parallel by load_obj_glop_datas)
+    other_s = max(0.0, total_s - sum(file_dict['stages'].values()))
+    load_profile_add(lp, 'other', other_s)
+    lp['total_s'] += total_s
+    lp['file'] = None
+
+def get_nested_load_s(times):
+    result = 0.0
+    for stage in NESTED_LOAD_STAGES:
+        result += times.get(stage, 0.0)
+    return result
+
+def add_load_time_since(times, stage, start_s, nested_s):
+    '''
+    Add the seconds since start_s to times[stage], except for the time
+    added to NESTED_LOAD_STAGES since nested_s was set (nested_s is
+    get_nested_load_s(times) from when start_s was).
+    '''
+    times[stage] = (times.get(stage, 0.0) + best_timer() - start_s -
+                    (get_nested_load_s(times) - nested_s))
+
+def get_load_profile_lines(lp, file_stage_count=3):
+    '''
+    Get a report of the total time of each stage (slowest first), then
+    each file with its file_stage_count slowest stages.
+    '''
+    results = []
+    total_s = lp['total_s']
+    results.append("load profile: " + str(len(lp['files'])) +
+                   " file(s) in " + ("%.3f" % total_s) + " s")
+    for stage in sorted(lp['stages'], key=lambda k: -lp['stages'][k]):
+        stage_s = lp['stages'][stage]
+        if stage_s <= 0.0:
+            continue
+        percent = 0.0
+        if total_s > 0.0:
+            percent = stage_s / total_s * 100.0
+        results.append("  {:<11} {:9.3f} s {:5.1f}%".format(
+            stage, stage_s, percent))
+    for file_dict in lp['files']:
+        stages = file_dict['stages']
+        slowest = sorted(stages, key=lambda k: -stages[k])
+        slowest = [k for k in slowest[:file_stage_count] if stages[k] > 0]
+        results.append(
+            "  " + os.path.basename(str(file_dict['path'])) +
+            (" (cached)" if file_dict['cached'] else "") + ": " +
+            str(file_dict['glops_count']) + " glop(s) in " +
+            ("%.3f" % file_dict['total_s']) + " s (" +
+            ", ".join([k + " " + ("%.3f" % stages[k]) for k in slowest]) +
+            ")")
+    return results
+
+def write_load_profile(lp, path):
+    '''
+    Save the stage times (in seconds) in total and for each file, as
+    JSON if path ends with ".json" otherwise as YAML (like stats.yml).
+    '''
+    if path.lower().endswith(".json"):
+        with open(path, 'w') as outs:
+            json.dump({'unit': "s",
+                       'total_s': lp['total_s'],
+                       'stages': lp['stages'],
+                       'files': lp['files']}, outs, indent=1)
+        return
+    with open(path, 'w') as outs:
+        outs.write("total_s: " + repr(lp['total_s']) + "\n")
+        outs.write("stages:\n")
+        for stage in lp['stages']:
+            outs.write("  " + stage + ": " + repr(lp['stages'][stage]) +
+                       "\n")
+        outs.write("files:\n")
+        for file_dict in lp['files']:
+            outs.write("  - path: " + str(file_dict['path']) + "\n")
+            outs.write("    cached: " + str(file_dict['cached']) + "\n")
+            outs.write("    glops_count: " +
+                       str(file_dict['glops_count']) + "\n")
+            outs.write("    total_s: " + repr(file_dict['total_s']) +
+                       "\n")
+            outs.write("    stages:\n")
+            for stage in file_dict['stages']:
+                outs.write("      " + stage + ": " +
+                           repr(file_dict['stages'][stage]) + "\n")
+# endregion load profile
+
+def get_land_per_frame(land_params, got_frame_delay):
+    '''
+    Get land units, acceleration and radians per frame (lupf, lapf,
+    lrpf) from land_params (land_speed, land_accel and
+    land_degrees_per_second--see PyGlops update_land_params_at).
+    '''
+    global show_zero_walk_upf_warning_enable
+    global show_zero_degrees_pf_warning_enable
+    lupf = land_params[0] * got_frame_delay
+    if lupf <= 0.:
+        lupf = 0.
+        if show_zero_walk_upf_warning_enable:
+            print("[ PyGlops ] WARNING in update: zero " +
+                  "land units per frame (" + tltf + ")")
+            show_zero_walk_upf_warning_enable = False
+    lapf = land_params[1] * got_frame_delay
+    lrpf = math.radians(land_params[2]) * got_frame_delay
+    if lrpf <= 0.:
+        lrpf = 0.
+        if show_zero_degrees_pf_warning_enable:
+            print("[ PyGlops ] WARNING in update: zero "
+                  "land degrees per frame (this is the last "
+                  "time this message will be shown)")
+            show_zero_degrees_pf_warning_enable = False
+    return lupf, lapf, lrpf
+
+
 class PyGlop:
     # TODO: move initializers to __init__
     # update copy constructor if adding/changing copyable members
@@ -653,6 +1557,7 @@ class PyGlop:
     reach_radius = None
     in_range_indices = None  # ONLY set if bumpable (not bumper)
     _cached_floor_y = None
+    _pos_watcher = None  # called by _on_change_pos if not None
     infinite_inventory_enable = None
     look_target_glop = None
     hitbox = None
@@ -664,6 +1569,10 @@ class PyGlop:
 
     # region runtime variables
     glop_index = None  # set by add_glop
+    _walkmesh_grid = None  # set by new_walkmesh_grid (see
+                           # get_walkmesh_grid) if glop is a walkmesh
+    _load_times = None  # seconds in each load stage while load_obj
+                        # loads this glop (see new_load_profile)
     # endregion runtime variables
 
     # region vars based on OpenGL ES 1.1 MOVED TO material
@@ -749,16 +1658,18 @@ class PyGlop:
                 if len(default_templates) > 0:
                     if 'state' in default_templates:
                         for key in default_templates['state']:
-                            self.state[key] = \
-                                default_templates['state'][key]
+                            # (copy, or every glop would share the
+                            # same velocity list etc.)
+                            self.state[key] = copy.deepcopy(
+                                default_templates['state'][key])
                     else:
                         print("[ PyGlop ] WARNING in _init_glop:"
                               "default_templates has no 'state'"
                               " key")
                     if 'properties' in default_templates:
                         for key in default_templates['properties']:
-                            self.properties[key] = \
-                                default_templates['properties'][key]
+                            self.properties[key] = copy.deepcopy(
+                                default_templates['properties'][key])
                     else:
                         print("[ PyGlop ] WARNING in _init_glop:"
                               "default_templates has no 'properties'"
@@ -770,22 +1681,9 @@ class PyGlop:
                           "and know what you don't need, this"
                           "could cause missing dict crashes")
             #formerly in MeshData:
-            # order MUST match V_POS_INDEX etc above
-
-            # a_position: Munshi prefers vec4 (Kivy prefers vec3)
-            # a_texcoord0: Munshi prefers vec4 (Kivy prefers vec2);
-            #  vTexCoord0; available if enable_tex[0] is true
-            # a_texcoord1: Munshi prefers vec4 (Kivy prefers vec2);
-            #  available if enable_tex[1] is true
-            # a_color: vColor (diffuse color of vertex)
-            # a_normal: vNormal; Munshi prefers vec3 (Kivy also
-            #  prefers vec3)
-            self.vertex_format = [(b'a_position', 4, 'float'),
-                                  (b'a_texcoord0', 4, 'float'),
-                                  (b'a_texcoord1', 4, 'float'),
-                                  (b'a_color', 4, 'float'),
-                                  (b'a_normal', 3, 'float')
-                                  ]
+            # (see vertex_formats for details)
+            self.vertex_format = new_vertex_format(
+                settings['globals']['vertex_format_name'])
             # calculate vertex_depth etc:
             self.on_vertex_format_change()
 
@@ -908,6 +1806,7 @@ class PyGlop:
             target.state['visible_enable'] = \
                 self.state['visible_enable']
             target.vertex_format = copy.deepcopy(self.vertex_format)
+            target.on_vertex_format_change()
             if ref_my_verts_enable:
                 target.vertices = self.vertices
                 target.indices = self.indices
@@ -1105,9 +2004,85 @@ class PyGlop:
                (self.properties.get('hit_radius') is not None)
 
     def calculate_hit_range(self):
-        print("calculate_hit_range should be implemented by subclass.")
-        print("  (setting hitbox to None to avoid using default)")
-        self.properties['hitbox'] = None
+        if self._load_times is None:
+            return self._calculate_hit_range()
+        start_s = best_timer()
+        result = self._calculate_hit_range()
+        self._load_times['hit_range'] = \
+            self._load_times.get('hit_range', 0.0) + best_timer() - start_s
+        return result
+
+    def _calculate_hit_range(self):
+        # TODO: re-implement super method, changing hitbox taking
+        # rotation & scale into account
+        # NOTE: index is set by add_glop so None if done earlier:
+        glop_msg = "new glop"
+        if self.glop_index is not None:
+            glop_msg = str(self.glop_index)
+        if self.name is not None:
+            glop_msg += " '" + self.name + "'"
+        if get_verbose_enable():
+            print("[ PyGlop ] calculate_hit_range (hitbox) for " +
+                  glop_msg + "...")
+        if self.vertices is None:
+            self.properties['hitbox'] = None  # avoid 0-size hitbox
+                                # which would prevent bumps
+            if self.properties['hit_radius'] is None:
+                self.properties['hit_radius'] = new_flag_f()
+            print("[ PyGlop ] hitbox skipped since vertices None.")
+            return None
+        vertex_count = int(len(self.vertices)/self.vertex_depth)
+        if vertex_count>0:
+            v_offset = 0
+            self.properties['hit_radius'] = 0.0
+            hb = self.properties.get('hitbox')
+            hr = self.properties.get('hit_radius')
+            PO = self._POSITION_OFFSET
+            if hb is None:
+                hb = new_hitbox()
+                self.properties['hitbox'] = hb
+            for i in range(0,3):
+                # intentionally set to rediculously far in opposite
+                # direction:
+                hb['minimums'][i] = sys.maxsize
+                hb['maximums'][i] = -sys.maxsize
+            for v_number in range(0, vertex_count):
+                for i in range(0,3):
+                    if self.vertices[v_offset + PO + i] < \
+                            hb['minimums'][i]:
+                        hb['minimums'][i] = \
+                            self.vertices[v_offset+PO+i]
+                    if (self.vertices[v_offset +
+                            PO+i]) > \
+                            hb['maximums'][i]:
+                        hb['maximums'][i] = \
+                            self.vertices[v_offset+PO+i]
+                this_vertex_relative_distance = get_distance_vec3(
+                    self.vertices[v_offset+PO:v_offset+PO+3],
+                    self._pivot_point)
+                if this_vertex_relative_distance > hr:
+                    hr = this_vertex_relative_distance
+                v_offset += self.vertex_depth
+            self.properties['hit_radius'] = hr
+            phi_eye_height = 86.5 * hb['maximums'][1]
+            if 'eye_height' not in self.properties:
+                self.properties['eye_height'] = phi_eye_height
+            if self.properties['eye_height'] > phi_eye_height:
+                print("[ PyGlop ]" +
+                      " WARNING in calculate_hit_range:" +
+                      " eye_height " +
+                      str(self.properties['eye_height']) +
+                      " is beyond phi_eye_height" +
+                      str(phi_eye_height) +
+                      " so is being set to that value")
+                self.properties['eye_height'] = hb['maximums'][1]
+            print("    done calculate_hit_range")
+        else:
+            self.properties['hitbox'] = None  # avoid 0-size hitbox
+                                # which would prevent bumps
+            if self.properties.get('hit_radius') is None:
+                self.properties['hit_radius'] = new_flag_f()
+            print("    skipped (0 vertices).")
 
     def on_process_ai(self, glop_index):
         # this should be implemented in the subclass
@@ -1139,7 +2114,7 @@ class PyGlop:
                         if sv[vo+i] > hb['maximums'][i]:
                             hb['maximums'][i] = sv[vo+i]
                 this_vertex_relative_distance = \
-                    get_distance_vec3(sv[vo:], this_point)
+                    get_distance_vec3(sv[vo:vo+3], this_point)
                 if this_vertex_relative_distance > hr:
                     hr = this_vertex_relative_distance
                 # sv[vo+0] -= this_point[0]
@@ -1159,13 +2134,79 @@ class PyGlop:
         self.apply_vertex_offset(self._pivot_point)
         self._pivot_point = (0.0, 0.0, 0.0)
 
-    def look_at(self, this_glop):
-        print("WARNING: look_at should be implemented by subclass"
-              "which has rotation angle(s) or matr(ix/ices)")
+    def apply_translate(self):
+        vertex_count = int(len(self.vertices)/self.vertex_depth)
+        v_offset = 0
+        for v_number in range(0, vertex_count):
+            self.vertices[v_offset+self._POSITION_OFFSET+0] -= \
+                self._t_ins.x
+            self.vertices[v_offset+self._POSITION_OFFSET+1] -= \
+                self._t_ins.y
+            self.vertices[v_offset+self._POSITION_OFFSET+2] -= \
+                self._t_ins.z
+            self._pivot_point = (self._pivot_point[0] - self._t_ins.x,
+                                 self._pivot_point[1] - self._t_ins.y,
+                                 self._pivot_point[2] - self._t_ins.z)
+            self._t_ins.x = 0.0
+            self._t_ins.y = 0.0
+            self._t_ins.z = 0.0
+            v_offset += self.vertex_depth
+        self.apply_pivot()
+        if self.get_has_hit_range():
+            self.calculate_hit_range()
+
+    def look_at(self, target_glop):
+        if target_glop is not None:
+            self.look_at_pos(target_glop._t_ins.xyz)
+            # pitch = 0.0
+            # pitch = get_angle_between_points(self._t_ins.y,
+            #                                  self._t_ins.z,
+            #                                  target_glop._t_ins.y,
+            #                                  target_glop._t_ins.z)
+            # self._r_ins_x.angle = pitch
+            # yaw = get_angle_between_points(self._t_ins.x,
+            #                                self._t_ins.z,
+            #                                target_glop._t_ins.x,
+            #                                target_glop._t_ins.z)
+            # self._r_ins_y.angle = yaw
+            # print("look at pitch,yaw: " +
+            #     str(int(math.degrees(pitch))) + "," +
+            #     str(int(math.degrees(yaw))))
+        else:
+            global look_at_none_warning_enable
+            if look_at_none_warning_enable:
+                print("[ PyGlop ] look_at got None for target_glop")
+                look_at_none_warning_enable = False
 
     def look_at_pos(self, pos):
-        print("WARNING: look_at_pos should be implemented by"
-              "subclass which has rotation angle(s) or matr(ix/ices)")
+        if pos is not None:
+            pitch = self._r_ins_x.angle
+            yaw = self._r_ins_y.angle
+            if len(pos) > 2:
+                pitch = get_angle_between_points(self._t_ins.y,
+                                                 self._t_ins.z,
+                                                 pos[1], pos[2])
+                yaw = get_angle_between_points(self._t_ins.x,
+                                               self._t_ins.z,
+                                               pos[0], pos[2])
+            else:
+                yaw = get_angle_between_points(self._t_ins.x,
+                                               self._t_ins.z,
+                                               pos[0], pos[1])
+                if get_verbose_enable():
+                    print("[ PyGlop ]"
+                          " WARNING: look_at_pos got 2D coords")
+            self._r_ins_x.angle = pitch
+            self._r_ins_y.angle = yaw
+            # print("look at pitch,yaw: " +
+            #     str(int(math.degrees(pitch))) + "," +
+            #     str(int(math.degrees(yaw))))
+        else:
+            global look_at_pos_none_warning_enable
+            if look_at_pos_none_warning_enable:
+                print(
+                    "[ PyGlop ] ERROR: look_at_pos got None for pos")
+                look_at_pos_none_warning_enable = False
 
     def is_linked_as(self, this_glop, as_rel):
         return self.get_link_as(this_glop, as_rel)
@@ -1204,14 +2245,17 @@ class PyGlop:
 
     # returns tuple containing inventory index in
     # actor_dict['inventory_items'] AND use string that is in uses
+    # returns (inventory index, use) or (-1, None)
     def find_item_with_any_use(self, uses):
         result = -1, None
         if self.actor_dict is not None:
-            for item_dict in self.actor_dict['inventory_items']:
-                if 'uses' in item_dict:
+            items = self.actor_dict['inventory_items']
+            for item_i in range(len(items)):
+                item_dict = items[item_i]
+                if item_dict is not None and 'uses' in item_dict:
                     for i in range(len(item_dict['uses'])):
                         if item_dict['uses'][i] in uses:
-                            result = i, item_dict['uses'][i]
+                            result = item_i, item_dict['uses'][i]
                             break
         return result
 
@@ -1450,6 +2494,20 @@ class PyGlop:
                   " _on_change_pivot")
         pass
 
+    # The subclass should call this after set_pos, set_coord or
+    # anything else that moves the glop (except step), so PyGlops can
+    # stop relying on a position it stored (see _pos_watcher and
+    # PyGlops _on_glop_pos_changed).
+    def _on_change_pos(self):
+        if self._pos_watcher is not None:
+            self._pos_watcher(self)
+
+    # Free what the subclass holds for drawing (such as the mesh and
+    # textures). PyGlops remove_glop_at calls this, after which the
+    # glop isn't used again.
+    def release_resources(self):
+        pass
+
     def get_context(self):
         # implement in subclass since involves graphics implementation
         print("WARNING: get_context should be defined by a subclass")
@@ -1797,11 +2855,15 @@ class PyGlop:
                          str(len(vf)))
             lines.append(min_tab_string + "#COLOR_OFFSET:" +
                          str(self.COLOR_OFFSET))
-            lines.append(
-                min_tab_string + "#len(self.vertex_format[" +
-                "self.COLOR_INDEX]):" +
-                str(len(vf[self.COLOR_INDEX])))
-        channel_count = vf[self.COLOR_INDEX][VFORMAT_VECTOR_LEN_INDEX]
+            if self.COLOR_INDEX >= 0:
+                lines.append(
+                    min_tab_string + "#len(self.vertex_format[" +
+                    "self.COLOR_INDEX]):" +
+                    str(len(vf[self.COLOR_INDEX])))
+        channel_count = 0
+        if self.COLOR_INDEX >= 0:
+            channel_count = \
+                vf[self.COLOR_INDEX][VFORMAT_VECTOR_LEN_INDEX]
         if add_dump_comments_enable:
             lines.append(min_tab_string + "#vertex_bytes_per_pixel:" +
                          str(channel_count))
@@ -1924,15 +2986,53 @@ class PyGlop:
         # above) like:
         # vf[self.POSITION_INDEX][VFORMAT_VECTOR_LEN_INDEX]
 
-    def append_wobject(self, this_wobject, pivot_to_g_enable=True):
+    # Change the vertex format (a list such as from new_vertex_format)
+    # before any vertices are added.
+    def set_vertex_format(self, vertex_format):
+        if self.vertices is not None and len(self.vertices) > 0:
+            print("[ PyGlop ] ERROR in set_vertex_format: "
+                  "the glop already has vertices")
+            return False
+        self.vertex_format = vertex_format
+        self.on_vertex_format_change()
+        return True
+
+    # Set the glop from a dict made by load_obj_glop_data (such as in
+    # a worker process). The pivot in the dict is already applied to
+    # the vertices, so _pivot_point is set to the origin (the caller
+    # should move the glop to glop_data['pivot']--see load_obj).
+    def set_from_glop_data(self, glop_data):
+        self.set_vertex_format(glop_data['vertex_format'])
+        self.name = glop_data['name']
+        self.source_path = glop_data['source_path']
+        self.material = glop_data['material']
+        if glop_data['vertices'] is not None:
+            # The arrays are used directly (no per-element conversion),
+            # as in KivyGlop load_bin.
+            self.vertices = glop_data['vertices']
+            self.indices = glop_data['indices']
+        self._pivot_point = (0.0, 0.0, 0.0)
+
+    # weld_enable: reuse the index of an identical earlier vertex
+    # (same position, texcoord, normal and color) instead of adding a
+    # vertex for every face corner (if None, use
+    # settings['globals']['weld_vertices_enable'])
+    def append_wobject(self, this_wobject, pivot_to_g_enable=True,
+                       weld_enable=None):
         # formerly get_glops_from_wobject formerly set_from_wobject
         # formerly import_wobject; based on _finalize_obj_data
         f_name = "append_wobject"
+        if weld_enable is None:
+            weld_enable = settings['globals']['weld_vertices_enable']
         if this_wobject.face_dicts is None:
             print("WARNING in " + f_name + ": ignoring wobject where" +
                   " face_groups is None (a default face group is" +
                   " made on load if did not exist).")
             return
+        load_times = self._load_times
+        if load_times is not None:
+            nested_s = get_nested_load_s(load_times)
+            start_s = best_timer()
         self.source_path = this_wobject.source_path
         vf = self.vertex_format
         #from vertex_format above:
@@ -1957,21 +3057,8 @@ class PyGlop:
             print("[ PyGlop ] Couldn't find name containing 'pos'"
                   " or 'position' in any vertex format element"
                   " (see pyglops.py PyGlop constructor)")
-        if self._NORMAL_OFFSET<0:
-            IS_SELF_VFORMAT_OK = False
-            print("[ PyGlop ] Couldn't find name containing 'normal'"
-                  " in any vertex format element"
-                  " (see pyglops.py PyGlop constructor)")
-        if self._TEXCOORD0_OFFSET<0:
-            IS_SELF_VFORMAT_OK = False
-            print("[ PyGlop ] Couldn't find name containing 'texcoord'"
-                  " in any vertex format element"
-                  " (see pyglops.py PyGlop constructor)")
-        if self.COLOR_OFFSET<0:
-            IS_SELF_VFORMAT_OK = False
-            print("[ PyGlop ] Couldn't find name containing 'color'"
-                  " in any vertex format element"
-                  " (see pyglops.py PyGlop constructor)")
+        # (normal, texcoord and color are optional--see
+        # vertex_formats)
 
         #vertices_offset = None
         #normals_offset = None
@@ -1990,24 +3077,19 @@ class PyGlop:
         for index in range(0,self.vertex_depth):
             zero_vertex.append(0.0)
         if (vf[p_i][VFORMAT_VECTOR_LEN_INDEX]>3):
-            zero_vertex[3] = 1.0
-            # NOTE: this is done since usually if len is 3,
-            # simple.glsl included with kivy converts it to
-            # vec4 appending 1.0:
-            #attribute vec3 v_pos;
-            #void main (void) {
-            #vec4(v_pos,1.0);
-        else:
-            print("[ PyGlop ] WARNING in append_wobject: vertex"
-                  " depth is 3 where should probably be 4 (index [3]"
-                  " should be 1.0 in order for certain matrix math"
-                  " to work")
+            zero_vertex[self._POSITION_OFFSET+3] = 1.0
+            # NOTE: if len is 3 (such as in the "compact" format),
+            # OpenGL converts it to vec4 appending 1.0 for a vec4
+            # attribute such as a_position in kivyglops.glsl
         # this_offset = self.COLOR_OFFSET
-        channel_count = vf[self.COLOR_INDEX][VFORMAT_VECTOR_LEN_INDEX]
-        for channel_subindex in range(0,channel_count):
-            zero_vertex[self.COLOR_OFFSET+channel_subindex] = -1.0
-                # -1.0 for None # TODO: asdf flag a different way
-                # (other than negative) to work with a unified shader
+        if self.COLOR_OFFSET >= 0:
+            channel_count = \
+                vf[self.COLOR_INDEX][VFORMAT_VECTOR_LEN_INDEX]
+            for channel_subindex in range(0,channel_count):
+                zero_vertex[self.COLOR_OFFSET+channel_subindex] = -1.0
+                    # -1.0 for None # TODO: asdf flag a different way
+                    # (other than negative) to work with a unified
+                    # shader
 
 
         participle="accessing object from list"
@@ -2042,6 +3124,8 @@ class PyGlop:
             if len(self.vertices) > 0:
                 glop_vertex_offset = len(self.vertices)
                     # NOTE: len(self.vertices) is len(vertices)*vd
+                    # (so see next_dest_index for the index of the
+                    # next vertex)
                 self.properties['separable_offsets'].append(
                     glop_vertex_offset)
                 print("[ PyGlop ] appending wobject vertices to " +
@@ -2053,7 +3137,12 @@ class PyGlop:
                       ")'s existing list of 0 vertices")
             # print("[ PyGlop ] ERROR in " + f_name + ": existing"
                   # " vertices found {self.name:'"+str(this_name)+"'}")
+        if self.indices is None:
+            self.indices = []
         vertex_components = zero_vertex[:]
+        next_dest_index = int(len(self.vertices) / vd)
+        weld_indices = {}  # dest index of each unique vertex_components
+                           # tuple, used if weld_enable
 
 
         source_face_index = 0
@@ -2068,10 +3157,12 @@ class PyGlop:
                 # TODO: implement this_wobject.face_dicts[key]['s']
                 # which can be "on" or "off" or None
                 participle = "before processing faces"
-                dest_vertex_index = 0
                 face_count = 0
-                new_texcoord = new_tuple(
-                    vf[self.TEXCOORD0_INDEX][VFORMAT_VECTOR_LEN_INDEX])
+                new_texcoord = new_tuple(2)
+                if self.TEXCOORD0_INDEX >= 0:
+                    new_texcoord = new_tuple(
+                        vf[self.TEXCOORD0_INDEX][
+                            VFORMAT_VECTOR_LEN_INDEX])
                 if this_face_list is None:
                     print("[ PyGlop ] WARNING in append_wobject: " +
                           "faces list in this_wobject.face_groups[" +
@@ -2108,7 +3199,7 @@ class PyGlop:
                     # tcs = this_wobject_this_face[2]
                     # for vertexinfo_index in range(3):
                     vertexinfo_index = 0
-                    source_face_vertex_count = 0
+                    face_dest_indices = []
                     while vertexinfo_index<len(this_wobject_this_face):
                         # print("vertex[" + str(vertexinfo_index) + "]")
                         vertex_info = \
@@ -2288,15 +3379,20 @@ class PyGlop:
                             vertex_components[self._POSITION_OFFSET+element_index] = v[element_index]
                         if (vf[p_i][VFORMAT_VECTOR_LEN_INDEX]>3):
                             vertex_components[self._POSITION_OFFSET+3] = 1.0  # non-position padding value must be 1.0 for matrix math to work correctly
-                        for element_index in range(0,3):
-                            vertex_components[self._NORMAL_OFFSET+element_index] = normal[element_index]
-                        for element_index in range(0,2):
-                            if element_index==1:
-                                vertex_components[self._TEXCOORD0_OFFSET+element_index] = 1-texcoord[element_index]
-                            else:
-                                vertex_components[self._TEXCOORD0_OFFSET+element_index] = texcoord[element_index]
+                        if self._NORMAL_OFFSET >= 0:
+                            for element_index in range(0,3):
+                                vertex_components[self._NORMAL_OFFSET+element_index] = normal[element_index]
+                        if self._TEXCOORD0_OFFSET >= 0:
+                            for element_index in range(0,2):
+                                if element_index==1:
+                                    vertex_components[self._TEXCOORD0_OFFSET+element_index] = 1-texcoord[element_index]
+                                else:
+                                    vertex_components[self._TEXCOORD0_OFFSET+element_index] = texcoord[element_index]
 
-                        if len(v)>3:
+                        if self.COLOR_OFFSET < 0:
+                            # (vertex format has no color)
+                            pass
+                        elif len(v)>3:
                             # use extended vertex info (color) from nonstandard obj file
                             abs_index = 0
                             for element_index in range(4,len(v)):
@@ -2307,54 +3403,52 @@ class PyGlop:
                             # TODO: overlay vertex color using material color as base
                             for element_index in range(0,4):
                                 vertex_components[self.COLOR_OFFSET+element_index] = 0.0
-                        self.vertices.extend(vertex_components)
-                        source_face_vertex_count += 1
+                        dest_index = None
+                        if weld_enable:
+                            weld_key = tuple(vertex_components)
+                            dest_index = weld_indices.get(weld_key)
+                            if dest_index is None:
+                                weld_indices[weld_key] = next_dest_index
+                        if dest_index is None:
+                            dest_index = next_dest_index
+                            self.vertices.extend(vertex_components)
+                            next_dest_index += 1
+                        face_dest_indices.append(dest_index)
                         vertexinfo_index += 1
                     # endwhile vertexinfo_index in face
 
                     participle = "combining triangle indices"
-                    vertexinfo_index = 0
-                    relative_source_face_vertex_index = 0  #required for tracking faces with less than 3 vertices
-                    face_first_vertex_dest_index = dest_vertex_index  # store first face (used for tesselation)
-                    tesselated_f_count = 0
                     #example obj quad (without Texcoord) vertex_index/texcoord_index/normal_index:
                     #f 61//33 62//33 64//33 63//33
-                    #face_vertex_list = list()  # in case verts are out of order, prevent tesselation from connecting wrong verts
-                    while vertexinfo_index < len(this_wobject_this_face):
-                        #face_vertex_list.append(dest_vertex_index)
-                        if vertexinfo_index==2:
-                            #OK to assume dest vertices are in order, since just created them (should work even if source vertices are not in order)
-                            tri = [glop_vertex_offset+dest_vertex_index, glop_vertex_offset+dest_vertex_index+1, glop_vertex_offset+dest_vertex_index+2]
-                            self.indices.extend(tri)
-                            dest_vertex_index += 3
-                            relative_source_face_vertex_index += 3
-                            tesselated_f_count += 1
-                        elif vertexinfo_index>2:
-                            #TESSELATE MANUALLY for faces with more than 3 vertices (connect loose vertex with first vertex and previous vertex)
-                            tri = [glop_vertex_offset+face_first_vertex_dest_index, glop_vertex_offset+dest_vertex_index-1, glop_vertex_offset+dest_vertex_index]
-                            self.indices.extend(tri)
-                            dest_vertex_index += 1
-                            relative_source_face_vertex_index += 1
-                            tesselated_f_count += 1
-                        vertexinfo_index += 1
-
-                    if (tesselated_f_count<1):
-                        print("WARNING: Face tesselated to 0 faces")
-                    #elif (tesselated_f_count>1):
-                        #if get_verbose_enable():
-                            #print("Face tesselated to " + str(tesselated_f_count) + " face(s)")
-
-                    if relative_source_face_vertex_index<source_face_vertex_count:
+                    # TESSELATE MANUALLY for faces with more than 3
+                    # vertices (connect each loose vertex with first
+                    # vertex and previous vertex)
+                    for vertexinfo_index in range(2,
+                                                  len(face_dest_indices)):
+                        self.indices.extend([
+                            face_dest_indices[0],
+                            face_dest_indices[vertexinfo_index-1],
+                            face_dest_indices[vertexinfo_index]
+                        ])
+
+                    if len(face_dest_indices) < 3:
                         print("WARNING: Face has fewer than 3 vertices (problematic obj file " + str(this_wobject.source_path) + ")")
-                        dest_vertex_index += source_face_vertex_count - relative_source_face_vertex_index
                     source_face_index += 1
             participle = "generating pivot point"
+            if load_times is not None:
+                add_load_time_since(load_times, 'interleave', start_s,
+                                    nested_s)
+                nested_s = get_nested_load_s(load_times)
+                start_s = best_timer()
             # if self.properties['hitbox'] is not None:
                 # print("[ PyGlop ] WARNING: self."
                       # 'properties['hitbox'] is not None'
                       # " already during append_wobject")
             if pivot_to_g_enable:
                 self.transform_pivot_to_geometry()
+                if load_times is not None:
+                    add_load_time_since(load_times, 'pivot', start_s,
+                                        nested_s)
             # else:
                 # print("ERROR: can't use pyglop since already has vertices (len(self.indices)>=1)")
 
@@ -2417,6 +3511,16 @@ def copy_material(o, depth=0):
     ret['emissive_color'] = o['emissive_color']
     ret['specular_exponent'] = o['specular_exponent']
 
+# Get a material (see new_material) from one that was saved as JSON
+# (such as in a glop cache file), where tuples became lists.
+def get_material_from_json_dict(o):
+    ret = new_material()
+    for key, value in o.items():
+        if isinstance(value, list):
+            value = tuple(value)
+        ret[key] = value
+    return ret
+
 #variable name ends in xyz so must be ready to be swizzled
 def angles_to_angle_and_matrix(angles_list_xyz):
     result_angle_matrix = [0.0, 0.0, 0.0, 0.0]
@@ -2501,6 +3605,208 @@ def new_light():
     # endregion vars based on OpenGL ES 1.1
     return ret
 
+# region binary glop format
+# A binary glop file is:
+# - glop_bin_magic (8 bytes)
+# - uint32 header length in bytes (little-endian)
+# - header: utf-8 JSON dict (see write_glop_bin), padded with spaces to
+#   a multiple of 4 bytes
+# - header['vertices_count'] float32 values (little-endian)
+# - header['indices_count'] uint32 values (little-endian)
+# so the vertices and indices can be copied into arrays without parsing
+# each value (see read_glop_bin). Use yaml (see KivyGlop save and load)
+# when the file must be human-readable, such as for debugging.
+glop_bin_magic = b"GLOPBIN1"
+
+def is_yaml_path(path):
+    lower_path = path.lower()
+    return lower_path.endswith(".yml") or lower_path.endswith(".yaml")
+
+def write_glop_bin(path, header, vertices, indices):
+    vertex_array = array.array('f', vertices)
+    index_array = array.array('I', indices)
+    if vertex_array.itemsize != 4 or index_array.itemsize != 4:
+        # 'I' is 4 bytes on all common platforms, but check anyway:
+        index_array = array.array('L', indices)
+        if index_array.itemsize != 4:
+            raise ValueError("no 4-byte unsigned array type available")
+    header = dict(header)
+    header['vertices_count'] = len(vertex_array)
+    header['indices_count'] = len(index_array)
+    header_bytes = json.dumps(header).encode('utf-8')
+    if len(header_bytes) % 4 != 0:
+        header_bytes += b" " * (4 - len(header_bytes) % 4)
+    if sys.byteorder != 'little':
+        vertex_array.byteswap()
+        index_array.byteswap()
+    outs = open(path, 'wb')
+    outs.write(glop_bin_magic)
+    outs.write(struct.pack("<I", len(header_bytes)))
+    outs.write(header_bytes)
+    vertex_array.tofile(outs)
+    index_array.tofile(outs)
+    outs.close()
+
+# returns (header dict, array('f') of vertices, array of indices), or
+# raises ValueError if the file is not a complete binary glop (such as
+# if it was truncated).
+def read_glop_bin(path):
+    ins = open(path, 'rb')
+    try:
+        mm = mmap.mmap(ins.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # (mmap can't map an empty file)
+        ins.close()
+        raise ValueError("'" + path + "' is not a binary glop")
+    try:
+        magic_len = len(glop_bin_magic)
+        if mm[:magic_len] != glop_bin_magic:
+            raise ValueError("'" + path + "' is not a binary glop")
+        header_len = struct.unpack("<I",
+                                   mm[magic_len:magic_len+4])[0]
+        pos = magic_len + 4
+        header = json.loads(mm[pos:pos+header_len].decode('utf-8'))
+        pos += header_len
+        vertices = array.array('f')
+        vertices_len = header['vertices_count'] * vertices.itemsize
+        vertices.frombytes(mm[pos:pos+vertices_len])
+        if len(vertices) != header['vertices_count']:
+            raise ValueError("'" + path + "' has " +
+                             str(len(vertices)) + " of " +
+                             str(header['vertices_count']) +
+                             " vertex values")
+        pos += vertices_len
+        indices = array.array('I')
+        if indices.itemsize != 4:
+            indices = array.array('L')
+        indices_len = header['indices_count'] * indices.itemsize
+        indices.frombytes(mm[pos:pos+indices_len])
+        if len(indices) != header['indices_count']:
+            raise ValueError("'" + path + "' has " +
+                             str(len(indices)) + " of " +
+                             str(header['indices_count']) + " indices")
+        if sys.byteorder != 'little':
+            vertices.byteswap()
+            indices.byteswap()
+    finally:
+        mm.close()
+        ins.close()
+    return header, vertices, indices
+# endregion binary glop format
+
+# region parallel obj loading
+# load_obj_glop_data runs in a worker process (see load_obj_glop_datas),
+# so it only uses PyGlop and returns plain data that can be pickled:
+# one dict per object in the OBJ file, with 'vertices' as array('d')
+# (the same values append_wobject makes) and 'indices' as array('I').
+# If pivot_to_g_enable, the pivot is already applied to the vertices
+# and the old pivot point is 'pivot' (see PyGlop set_from_glop_data).
+# 'load_times' is the seconds spent in each load stage (see
+# new_load_profile), including the whole file's in the first dict.
+# The settings of the main process must be passed as params, since the
+# worker may have a fresh copy of this module.
+def load_obj_glop_data(source_path, vertex_format_name="standard",
+                       pivot_to_g_enable=True, weld_enable=True):
+    results = None
+    if not os.path.isfile(source_path):
+        print("[ PyGlops ] ERROR in load_obj_glop_data: '" +
+              str(source_path) + "' not found")
+        return results
+    this_objfile = WObjFile()
+    this_objfile.load(source_path)
+    file_load_times = this_objfile.load_times
+    if this_objfile.wobjects is None or len(this_objfile.wobjects) < 1:
+        print("[ PyGlops ] ERROR in load_obj_glop_data: 0 wobjects" +
+              " could be read from '" + source_path + "'")
+        return results
+    results = []
+    for key in this_objfile.wobjects:
+        this_wobject = this_objfile.wobjects[key]
+        if this_wobject is None:
+            continue
+        this_glop = PyGlop()
+        this_glop._load_times = {}
+        if file_load_times is not None:
+            # (the times for the whole file go with the first glop)
+            this_glop._load_times.update(file_load_times)
+            file_load_times = None
+        this_glop.set_vertex_format(
+            new_vertex_format(vertex_format_name))
+        this_glop.append_wobject(this_wobject, pivot_to_g_enable=False,
+                                 weld_enable=weld_enable)
+        pivot = (0.0, 0.0, 0.0)
+        if pivot_to_g_enable and this_glop.vertices is not None and \
+                len(this_glop.vertices) > 0:
+            # same as transform_pivot_to_geometry then apply_pivot
+            # (but without the subclass' _on_change_pivot):
+            nested_s = get_nested_load_s(this_glop._load_times)
+            start_s = best_timer()
+            center = this_glop.get_center_average_of_vertices()
+            pivot = (center[0], center[1], center[2])
+            this_glop._pivot_point = pivot
+            this_glop.apply_pivot()
+            add_load_time_since(this_glop._load_times, 'pivot', start_s,
+                                nested_s)
+        glop_data = {}
+        glop_data['name'] = this_glop.name
+        glop_data['source_path'] = this_glop.source_path
+        glop_data['material'] = this_glop.material
+        glop_data['vertex_format'] = this_glop.vertex_format
+        glop_data['pivot'] = pivot
+        glop_data['load_times'] = this_glop._load_times
+            # (see load_profile_add_times)
+        glop_data['vertices'] = None
+        glop_data['indices'] = None
+        if this_glop.vertices is not None:
+            # (None if append_wobject skipped it, such as if no faces)
+            glop_data['vertices'] = array.array('d', this_glop.vertices)
+            glop_data['indices'] = array.array('I', this_glop.indices)
+        results.append(glop_data)
+    return results
+
+# Returns a dict where each key is a path in source_paths and each
+# value is the list returned by load_obj_glop_data (or None if it
+# failed). worker_count is the max number of processes (None for one
+# per CPU); paths are converted at the same time (up to that many),
+# so the time is about that of the largest file instead of the sum.
+def load_obj_glop_datas(source_paths, worker_count=None,
+                        pivot_to_g_enable=True):
+    results = {}
+    if len(source_paths) < 1:
+        return results
+    if worker_count is None:
+        worker_count = os.cpu_count()
+    if worker_count is None or worker_count < 1:
+        worker_count = 1
+    worker_count = min(worker_count, len(source_paths))
+    futures = {}
+    try:
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            for source_path in source_paths:
+                futures[source_path] = executor.submit(
+                    load_obj_glop_data, source_path,
+                    vertex_format_name=(
+                        settings['globals']['vertex_format_name']),
+                    pivot_to_g_enable=pivot_to_g_enable,
+                    weld_enable=(
+                        settings['globals']['weld_vertices_enable']))
+            for source_path in source_paths:
+                try:
+                    results[source_path] = \
+                        futures[source_path].result()
+                except:
+                    print("[ PyGlops ] ERROR in load_obj_glop_datas:" +
+                          " could not finish '" + source_path + "':")
+                    view_traceback()
+                    results[source_path] = None
+    except:
+        # such as if the platform can't start processes
+        print("[ PyGlops ] ERROR in load_obj_glop_datas: could not" +
+              " finish the process pool:")
+        view_traceback()
+    return results
+# endregion parallel obj loading
+
 class PyGlops:
     glops = None
     materials = None
@@ -2514,13 +3820,33 @@ class PyGlops:
     player_glop = None
     _player_glop_index = None
     prev_inbounds_camera_translate = None
+    # region active sets (see update_active_sets_at)
     _bumper_indices = None
     _bumpable_indices = None
+    _actor_indices = None
+    _physics_indices = None
+    _clip_indices = None
+    _visible_indices = None
+    _linked_indices = None
+    # endregion active sets
     _world_min_y = None
     _world_grav_acceleration = None
     last_update_s = None
 
     fired_count = None
+    _physics_store = None  # see soa_physics_enable
+    _sleeping_indices = None  # see sleep_glop_at
+    _sleep_hash = None  # sleeping glops (None if changed since made)
+    _projectile_pools = None  # see _get_pooled_projectile
+    _frame_profile = None  # see profile_frame_count
+    _load_profile = None  # see new_load_profile
+    _command_methods = None  # glop commands (see compile_commands)
+    # region slots (see remove_glop_at)
+    _glop_generations = None  # count of removals at each index
+    _free_glop_indices = None  # removed glops' slots to reuse
+    _removal_handles = None  # see remove_killed_enable
+    # endregion slots
+    player1_controller = None  # if None, step ignores keyboard input
 
     def __init__(self, new_glop_method):
         global settings
@@ -2531,6 +3857,11 @@ class PyGlops:
             print("[ PyGlops ] FATAL ERROR: missing settings dict")
             sys.exit(1)
         self._delay_is_available_enable = False
+        self._tick_accumulator_s = 0.0
+        self._ai_time_s = 0.0  # simulated time (see ai_think_seconds)
+        self._ai_time_budget_enable = True  # see ai_budget_seconds
+        self._tick_prev_transforms = []
+        self._tick_shown_transforms = {}
         self._player_indices = []  # player number 1 is 0
         self._visual_debug_enable = False
         self.fired_count = 0
@@ -2552,9 +3883,27 @@ class PyGlops:
         self._walkmeshes = []
         self.glops = []
         self.materials = []
-        self._bumper_indices = []
-        self._bumpable_indices = []
-        self._actor_indices = []
+        self._bumper_indices = {}
+        self._bumpable_indices = {}
+        self._actor_indices = {}
+        self._physics_indices = {}
+        self._clip_indices = {}
+        self._visible_indices = {}
+        self._linked_indices = {}
+        self._sleeping_indices = set()
+        self._projectile_pools = {}
+        self._glop_generations = []
+        self._free_glop_indices = []
+        self._removal_handles = []
+        self._load_profile = new_load_profile()
+        self._frame_profile = None
+        if self.settings['globals']['profile_frame_count'] > 0:
+            self._frame_profile = new_frame_profile(
+                frame_count=self.settings['globals']['profile_frame_count'])
+        self._command_methods = {
+            'hide': self._run_hide_command,
+            'obtain': self._run_obtain_command,
+        }
 
     def __str__(self):
         return "PyGlops engine"
@@ -2618,9 +3967,1796 @@ class PyGlops:
               " graphical output")
     # endupdate
 
+    # def constrain_glop_to_walkmesh(self,
+    #                                this_glop,
+    #                                height_only_enable=False):
+    # these_radii[0] is used to push against side if
+    # height_only_enable=False (to push x,z away from wall)
+    # these_radii[1] is used to push against floor (new y will be
+    # increased by this amount)
+    # walk_state (optional) is the state dict of the glop at this_pos,
+    # where the walkmesh triangle is cached between frames (see
+    # get_walkmesh_info_xz).
+    def get_walk_info(self, this_pos, these_radii,
+            height_only_enable=False, walk_state=None):
+        walk_info = {}
+        walk_info['pos'] = [ this_pos[0], this_pos[1], this_pos[2] ]
+        walk_info['change_enable'] = False
+        if len(self._walkmeshes)>0:
+            walkmesh_result = \
+                self.get_walkmesh_info_xz(this_pos,
+                                          walk_state=walk_state)
+            corrected_pos = None
+            if walkmesh_result is None:
+                # if self.prev_inbounds_camera_translate is not None:
+                     # # this would cause glop to stick to wall
+                     # # against which it pushed
+                     # walk_info['pos'] = \
+                        # [self.prev_inbounds_camera_translate[0]
+                         # self.prev_inbounds_camera_translate[1]
+                         # self.prev_inbounds_camera_translate[2] ]
+                # else:
+                corrected_pos = \
+                    self.get_nearest_walkmesh_vec3_using_xz(this_pos)
+                if corrected_pos is not None:
+                    # Push away from wall (edge of walkmesh), but allow
+                    # sliding along:
+                    pushed_angle = \
+                        get_angle_between_two_vec3_xz(this_pos,
+                                                      corrected_pos)
+                    corrected_pos = \
+                        get_pushed_vec3_xz_rad(corrected_pos,
+                                               these_radii[0],
+                                               pushed_angle)
+                else:
+                    global nearest_not_found_warning_enable
+                    if nearest_not_found_warning_enable:
+                        nearest_not_found_warning_enable = False
+                        print("[ PyGlops ] ERROR in get_walk_info" +
+                              ": could not find point to bring" +
+                              " player in bounds.")
+                walk_info['walkmesh_via'] = "nearest"
+            else:
+                # In bounds, so only change y
+                w_glop = \
+                    self._walkmeshes[walkmesh_result['walkmesh_index']]
+                X_i = w_glop._POSITION_OFFSET + 0
+                Y_i = w_glop._POSITION_OFFSET + 1
+                Z_i = w_glop._POSITION_OFFSET + 2
+                ground_tri = list()
+                # TODO: use vertext format of w_glop for ground_tri
+                # instead of assuming first 3 entries in vertext are
+                # 3D pos
+                wgv = w_glop.vertices
+                wgi = w_glop.indices
+                wrpo = walkmesh_result['polygon_offset']
+                ground_tri.append(
+                    (w_glop.vertices[w_glop.indices[wrpo]*w_glop.vertex_depth+X_i],
+                    w_glop.vertices[w_glop.indices[wrpo]*w_glop.vertex_depth+Y_i],
+                    w_glop.vertices[w_glop.indices[wrpo]*w_glop.vertex_depth+Z_i]) )
+                ground_tri.append(
+                    (w_glop.vertices[w_glop.indices[wrpo+1]*w_glop.vertex_depth+X_i],
+                     w_glop.vertices[w_glop.indices[wrpo+1]*w_glop.vertex_depth+Y_i],
+                     w_glop.vertices[w_glop.indices[wrpo+1]*w_glop.vertex_depth+Z_i]) )
+                ground_tri.append(
+                    (w_glop.vertices[w_glop.indices[wrpo+2]*w_glop.vertex_depth+X_i],
+                     w_glop.vertices[w_glop.indices[wrpo+2]*w_glop.vertex_depth+Y_i],
+                     w_glop.vertices[w_glop.indices[wrpo+2]*w_glop.vertex_depth+Z_i]) )
+                ground_y = get_y_from_xz(ground_tri[0], ground_tri[1], ground_tri[2], this_pos[0], this_pos[2])
+                corrected_pos = [this_pos[0], ground_y + these_radii[1], this_pos[2]]
+                if self._world_min_y is None or ground_y < self._world_min_y:
+                    self._world_min_y = ground_y
+                # if self.prev_inbounds_camera_translate is None or \
+                #    this_pos[1] != \
+                #    self.prev_inbounds_camera_translate[1]:
+                    # print("y:"+str(this_pos[1]))
+                walk_info['walkmesh_via'] = "under"
+            if corrected_pos is not None:
+                if not height_only_enable:
+                    walk_info['change_enable'] = True
+                    walk_info['pos'][0] = corrected_pos[0]
+                    walk_info['pos'][2] = corrected_pos[2]
+                        # TODO: check y (vertical) axis against
+                        # eye height and jump height etc
+                if walk_info['pos'][1] - corrected_pos[1] <= kEpsilon:
+                    walk_info['on_ground_enable'] = True
+                elif walk_info['pos'][1] - corrected_pos[1] > kEpsilon:
+                    # use kEpsilon as a deadzone so that floating
+                    # point errors don't cause physics and hence many
+                    # at_rest events
+                    walk_info['on_ground_enable'] = False
+                    pass
+
+                if corrected_pos[1] > walk_info['pos'][1]:
+                    walk_info['change_enable'] = True
+                    walk_info['pos'][1] = corrected_pos[1]
+                else:
+                    # Hovering, but previous if-else flags for physics
+                    pass
+            global bounds_warning_enable
+            if bounds_warning_enable:
+                print("[ PyGlops ] (verbose message) walkmesh used")
+                bounds_warning_enable = False
+        else:
+            global no_bounds_warning_enable
+            if no_bounds_warning_enable:
+                print("[ PyGlops ] (verbose message) no walkmesh")
+                no_bounds_warning_enable = False
+            pass
+        walk_info['feet_y'] = walk_info['pos'][1] - these_radii[1]
+        return walk_info
+
+    # Run one step (AI, bump loop, movement and physics) where
+    # got_frame_delay is the number of seconds to simulate. This
+    # doesn't need a display (see headlessglops.py), so it can be
+    # run faster than realtime such as for tests and benchmarks.
+    def step(self, got_frame_delay):
+        VMSG = " (verbose message in update) "
+        pgp = self.player_glop.properties
+        dd = debug_dict
+        sg = self.settings['globals']
+        sw = self.settings['world']
+        # step is called by KivyGlops.update, which is called by
+        # KivyGlopsWindow.*update* such as update_glsl
+        # region pre-bump ops
+        # NOT: tried to move regions "pre-bump ops" and
+        # "bump loop" to pyglops but didn't work well
+        # print("coords:"+str(Window.mouse_pos))
+        # see also asp and clip_top in init
+        # screen_w_arc_theta = 32.0
+        #     # actual number is fromprojectionMatrix matrix
+        # screen_h_arc_theta = 18.0
+        #     # actual number is from projectionMatrix matrix
+
+        global missing_bumper_warning_enable
+        global missing_bumpable_warning_enable
+        global missing_radius_warning_enable
+        fp = self._frame_profile
+        phase_start_s = best_timer()  # see frame_profile_add
+        # region ai
+        # Only actors that are due (see ai_think_seconds) think, most
+        # overdue first, until ai_budget_count or ai_budget_seconds is
+        # used up (the rest are still due next step). Others just
+        # follow their target.
+        self._ai_time_s += got_frame_delay
+        now_s = self._ai_time_s
+        think_indices = []
+        lost_choice_indices = set()  # actors whose weapon is gone
+        for a_index in self._actor_indices:
+            actor_glop = self.glops[a_index]
+            ags = actor_glop.state
+            agad = actor_glop.actor_dict
+            if agad is None:
+                print("[ PyGlops ] error in update: " +
+                      "actor_dict is None for bumper named '" +
+                      str(actor_glop.name) + "'")
+                continue
+            if agad.get("ai_enable") is None:
+                continue
+            due_enable = ags['ai_next_s'] is None or \
+                ags['ai_next_s'] <= now_s
+            if ags.get('choice_ii') is not None and \
+                    ags['choice_ii'] >= 0:
+                items = agad['inventory_items']
+                if ags['choice_ii'] >= len(items) or \
+                        items[ags['choice_ii']] is None or \
+                        items[ags['choice_ii']]['name'] == \
+                        EMPTY_ITEM['name']:
+                    due_enable = True  # the chosen weapon is gone
+                    lost_choice_indices.add(a_index)
+            if due_enable:
+                think_indices.append(a_index)
+            else:
+                self._update_ai_target_at(a_index)
+        think_indices.sort(
+            key=lambda index: self.glops[index].state['ai_next_s'] or 0.0)
+        ai_budget_count = sw['ai_budget_count']
+        ai_budget_s = None
+        if self._ai_time_budget_enable and not sw['fixed_step_enable']:
+            # (otherwise the same steps must give the same results)
+            ai_budget_s = sw['ai_budget_seconds']
+        ai_start_s = best_timer()
+        for think_i in range(len(think_indices)):
+            a_index = think_indices[think_i]
+            if a_index not in self._actor_indices:
+                continue  # killed during the loop
+            if (ai_budget_count is not None and
+                    think_i >= ai_budget_count) or \
+                    (ai_budget_s is not None and think_i > 0 and
+                     best_timer() - ai_start_s >= ai_budget_s):
+                for a_index in think_indices[think_i:]:
+                    if a_index in self._actor_indices:
+                        if a_index in lost_choice_indices:
+                            # (don't use it until choosing again)
+                            self.glops[a_index].state['choice_ii'] = -1
+                        self._update_ai_target_at(a_index)
+                break
+            self._think_at(a_index, now_s)
+        # endregion ai
+        phase_end_s = best_timer()
+        if fp is not None:
+            frame_profile_add(fp, 'ai', phase_end_s - phase_start_s)
+        phase_start_s = phase_end_s
+        self.on_update_glops()
+        phase_end_s = best_timer()
+        if fp is not None:
+            frame_profile_add(fp, 'on_update_glops',
+                              phase_end_s - phase_start_s)
+        phase_start_s = phase_end_s
+        # endregion pre-bump ops
+
+        # NOTE: (ANOTHER non-nested LOOP is at end of update,
+        # for physics and unit movement)
+        # region nested bump loop
+        # Broadphase: put bumpers in a spatial hash where each cell is
+        # as big as the biggest possible total_hit_radius (see below),
+        # so only bumpers in the same or an adjacent cell can be in
+        # range of a bumpable and need the exact distance test.
+        max_bumpable_radius = 0.0
+        for bumpable_index in self._bumpable_indices:
+            this_radius = \
+                self.glops[bumpable_index].properties.get('hit_radius')
+            if this_radius is not None and \
+                    this_radius > max_bumpable_radius:
+                max_bumpable_radius = this_radius
+        max_bumper_radius = 0.0
+        for bumper_index in self._bumper_indices:
+            agp = self.glops[bumper_index].properties
+            for radius_name in ['hit_radius', 'reach_radius']:
+                this_radius = agp.get(radius_name)
+                if this_radius is not None and \
+                        this_radius > max_bumper_radius:
+                    max_bumper_radius = this_radius
+        bumper_hash = new_spatial_hash(max_bumpable_radius +
+                                       max_bumper_radius)
+        bumper_i_i = 0
+        for bumper_index in self._bumper_indices:
+            # keep bumper_i_i so near bumpers can be visited in the
+            # same order as _bumper_indices:
+            spatial_hash_add(bumper_hash,
+                             self.glops[bumper_index]._t_ins.xyz,
+                             (bumper_i_i, bumper_index))
+            bumper_i_i += 1
+        for bumpable_index in self._bumpable_indices:
+            e_glop = self.glops[bumpable_index]
+            egn = e_glop.name
+            igp = e_glop.properties
+            igs = e_glop.state
+            if not igp['bump_enable']:
+                continue
+            near_bumpers = spatial_hash_query(bumper_hash,
+                                              e_glop._t_ins.xyz)
+            near_bumpers.sort()
+            near_bumper_indices = set()
+            for bumper_i_i, bumper_index in near_bumpers:
+                near_bumper_indices.add(bumper_index)
+                actor_glop = self.glops[bumper_index]
+                agp = actor_glop.properties
+                rgn = actor_glop.name
+                distance = get_distance_glops(e_glop, actor_glop)
+                if igp['hit_radius'] is None:
+                    if missing_radius_warning_enable:
+                        print("[ PyGlops ] WARNING in" +
+                            " update: Missing radius " +
+                            "while bumped bumpable " +
+                            "named " +
+                            str(egn))
+                        missing_radius_warning_enable = \
+                            False
+                    continue
+                total_hit_radius = 0.0
+                if e_glop.projectile_dict is not \
+                        None:
+                    total_hit_radius = (
+                        igp['hit_radius'] +
+                        agp['hit_radius']
+                    )
+                else:
+                    try:
+                        total_hit_radius = (
+                            igp['hit_radius'] +
+                            agp['reach_radius']
+                        )
+                    except KeyError:
+                        total_hit_radius = igp['hit_radius']
+                        print("ERROR in bumpable_i_i loop: " +
+                              "reach_radius is " +
+                              str(agp.get('reach_radius')) +
+                              " for glop named " + rgn +
+                              " but actor's should never be None")
+                if distance <= total_hit_radius:
+                    # print("total_hit_radius:" +
+                    #     str(total_hit_radius))
+                    if bumper_index in igs['in_range_indices']:
+                        #print("not out of range yet")
+                        continue
+                    # (only bump if ever moved out of range of it)
+                    if bumper_index == bumpable_index:
+                        # can't bump self
+                        continue
+                    if get_verbose_enable():
+                        print("[ PyGlops ]" +
+                            VMSG + "'" +
+                            str(actor_glop.name) +
+                            "' in range of '" +
+                            str(e_glop.name) +
+                            "'")
+                    if agp['bump_enable']:
+                        if (e_glop.projectile_dict is None) or \
+                           (agp['hitbox'] is None) or \
+                           hitbox_contains_vec3(agp['hitbox'],
+                                e_glop._t_ins.xyz):
+                            igs['bumped_by_index'] = bumper_index
+                            igs['bumped_by_index_handle'] = \
+                                self.get_glop_handle_at(bumper_index)
+                            igs['at_rest_event_enable'] = True
+                            # (handled by the movement loop below, so it
+                            # must visit the glop)
+                            self._release_physics_store_at(
+                                bumpable_index)
+                            if bumpable_index in \
+                                    self._sleeping_indices:
+                                self.wake_glop_at(bumpable_index)
+                        else:
+                            # global out_of_hitb
+                            # ox_note_enable
+                            # if out_of_hitbox_n
+                            # ote_enable:
+                            print(
+                                "[ PyGlops ]" +
+                                " (debug only--this" +
+                                " is normal) within" +
+                                " total_hit_radius," +
+                                " but bumpable at " +
+                                str(e_glop.get_pos()) + " is" +
+                                " not in bumper's" +
+                                " hitbox: " +
+                                str(agp['hitbox']))
+                            # out_of_hitbox_n
+                            # ote_enable = False
+                    else:
+                        if get_verbose_enable():
+                            print(
+                                "[ PyGlops ]" +
+                                VMSG + "'" +
+                                str(actor_glop.name) +
+                                "' is not a bumper.")
+                    if not bumper_index in \
+                            igs['in_range_indices']:
+                        igs['in_range_indices'].append(
+                            bumper_index)
+                else:
+                    if bumper_index in igs['in_range_indices']:
+                        igs['in_range_indices'].remove(bumper_index)
+            # end for bumper
+            if igp['hit_radius'] is None:
+                # (the warning was already shown above if any bumper
+                # was near)
+                continue
+            # Bumpers that were not near enough to be in the broadphase
+            # results are out of range, so they can bump again later:
+            for bumper_index in set(igs['in_range_indices']):
+                if (bumper_index in self._bumper_indices) and \
+                        (bumper_index not in near_bumper_indices):
+                    igs['in_range_indices'].remove(bumper_index)
+        # end for bumpable
+        # endregion nested bump loop
+        phase_end_s = best_timer()
+        if fp is not None:
+            frame_profile_add(fp, 'bump', phase_end_s - phase_start_s)
+        phase_start_s = phase_end_s
+        clip_s = 0.0  # (not counted as movement)
+        # (ANOTHER non-nested LOOP is at end of update,
+        # for physics and unit movement)
+
+        # region choice-based movement and physics
+        # --in that order, so you don't go through stuff
+        pgi = self.get_player_glop_index(1)
+        sleep_enable = sw['sleep_enable']
+        sta = self.settings['templates']['actor']
+        template_land_params = (sta['land_speed'], sta['land_accel'],
+                                sta['land_degrees_per_second'])
+        land_per_frames = {}  # key: land_params (see
+                              # update_land_params_at); value: (see
+                              # get_land_per_frame)
+        moving_indices = []  # for waking sleeping glops near them
+        soa_indices = None  # glops for physics_store_integrate to read
+        soa_own_enables = None  # whether the store owns each one after
+        soa_check_enables = None  # key: index; value: whether to clip
+                                  # (True for owned if any time passed)
+        ps = None
+        if sw['soa_physics_enable']:
+            if np is not None:
+                if self._physics_store is None:
+                    self._physics_store = \
+                        new_physics_store(len(self.glops))
+                ps = self._physics_store
+                soa_indices = []
+                soa_own_enables = []
+                soa_check_enables = {}
+            else:
+                global no_numpy_warning_enable
+                if no_numpy_warning_enable:
+                    print("[ PyGlops ] WARNING in step:"
+                          " soa_physics_enable requires numpy, so"
+                          " physics will be done per glop (" + tlt +
+                          ")")
+                    no_numpy_warning_enable = False
+        # Only actors, physics glops and carried glops can move (in
+        # order of index, so carried glops follow their carrier as
+        # before):
+        motivated_indices = set(self._actor_indices)
+        motivated_indices.update(self._physics_indices)
+        motivated_indices.update(self._linked_indices)
+        # (nothing moves sleeping glops--see sleep_glop_at)
+        motivated_indices.difference_update(self._sleeping_indices)
+        if ps is not None:
+            # (the store moves these after this loop)
+            motivated_indices.difference_update(ps['owned'])
+        for motivated_index in sorted(motivated_indices):
+            p1_enable = False
+            if motivated_index == pgi:
+                p1_enable = True
+            m_glop = self.glops[motivated_index]
+            mgs = m_glop.state
+            mgp = m_glop.properties
+            mgid = m_glop.item_dict
+            mgad = m_glop.actor_dict
+            if soa_indices is not None and mgad is None and \
+                    not p1_enable and mgp['physics_enable'] and \
+                    not mgs['on_ground_enable'] and \
+                    not mgs['at_rest_event_enable'] and \
+                    len(mgs['links']) < 1 and \
+                    mgs.get('dst_angles') is None and \
+                    m_glop.name not in sg['fly_enables']:
+                # Nothing below applies to a falling non-actor except
+                # physics, so the store owns it until it lands (see
+                # physics_store_integrate).
+                mgs['dst_angles'] = None
+                soa_indices.append(motivated_index)
+                soa_own_enables.append(True)
+                m_glop._pos_watcher = self._on_glop_pos_changed
+                mgs['idle_s'] = 0.0
+                mgs['prev_on_ground_enable'] = False
+                mgs['constrained_enable'] = False
+                continue
+            land_params = (None, None, None)  # (the template's)
+            if mgad is not None:
+                if mgs['land_params'] is None:
+                    self.update_land_params_at(motivated_index)
+                land_params = mgs['land_params']
+            # (the same for every glop with the same land_params)
+            land_per_frame = land_per_frames.get(land_params)
+            if land_per_frame is None:
+                # (None is the actor template's value, read each step
+                # so changing the template applies to every actor)
+                resolved_land_params = [None, None, None]
+                for param_i in range(3):
+                    resolved_land_params[param_i] = land_params[param_i]
+                    if resolved_land_params[param_i] is None:
+                        resolved_land_params[param_i] = \
+                            template_land_params[param_i]
+                land_per_frame = get_land_per_frame(resolved_land_params,
+                                                    got_frame_delay)
+                land_per_frames[land_params] = land_per_frame
+            lapf = land_per_frame[1]  # land accel per frame
+            lrpf = land_per_frame[2]  # land radians per frame
+
+            # NOTE: Increased z should move object closer to viewer
+            # in right-handed coordinate system
+            choice_local_vel_mult = [0., 0., 0.] # 1.0 is max
+                                                 # joystick tilt:
+                                                 # normally [0],[2]
+            if 'dst_angles' not in mgs:
+                mgs['dst_angles'] = None
+            # mgs['look_theta_multipliers'] = [0., 0., 0.]
+            mgas = m_glop.get_angles()
+            if mgad is not None and mgad.get('target_pos') is not None:
+                # If has target_pos, auto-move to target without
+                # intervention even if is player-controlled glop.
+                src_pos = m_glop.get_pos()
+                dst_pos = mgad['target_pos']
+                mgs['dst_angles'] = get_angles_vec3(
+                    src_pos,
+                    dst_pos,
+                    m_glop.get_angles()
+                )
+                distance = get_distance_vec3_xz(src_pos, dst_pos)
+                tilt = .5
+                run_enable = False
+                sneak_enable = False
+
+                if mgs.get('acquire_radius') is not None:
+                    # if mgad['target_index'] is None:
+                    run_enable = True
+                    if run_enable:
+                        tilt *= 2.
+                    if sneak_enable:
+                        tilt /= 2.
+                    if distance > mgs['acquire_radius']:
+                        # # global velocity
+                        # vmx, vmy = get_rect_from_polar_rad(
+                            # tilt, mgas[1])
+                            # # use current y angle
+                            # # to prevent instant strafe
+                        # choice_local_vel_mult[0] = vmx
+                        # choice_local_vel_mult[2] = vmy
+                        # local velocity
+                        choice_local_vel_mult[2] = tilt
+                    if mgad['target_index'] is not None:
+                        # If has weapon and attack target, auto-attack
+                        # even if is player-controlled glop
+                        if mgs['choice_ii'] >= 0:
+                            try:
+                                self.use_item_at(m_glop,
+                                    mgs['choice_ii'],
+                                    this_use=mgs['desired_use'])
+                            except:
+                                print("[ PyGlops ] " +
+                                    "ERROR in update--" +
+                                    "could not finish" +
+                                    " using item " +
+                                    str(mgs.get('choice_ii')))
+                                view_traceback()
+                        else:
+                            if not mgad['unarmed_melee_enable']:
+                                mgad['target_index'] = None
+                else:
+                    print("[ PyGlops ] ERROR in update:"
+                          " 'target_pos' was set but the engine"
+                          " forgot to calculate 'acquire_radius'")
+            elif p1_enable and self.player1_controller is not None:
+                # for keycode strings, see
+                # http://kivy.org/docs/_modules/kivy/core/window.html
+                # TODO: make a virtual joystick for touch, and
+                # (set mgs['look_theta_multipliers'] or
+                # do math right away and) set look_dest_theta
+                # (and the longer you press before tilting, the faster
+                # the speed; start moving automatically at .5 sec
+                # OPTION 2: double-tap to not move--but start
+                # accelerating immediately while down even then)
+                tilt = .5
+                if self.player1_controller.get_pressed(
+                        self.ui.get_keycode("ctrl")):
+                    tilt /= 2.
+                if self.player1_controller.get_pressed(
+                        self.ui.get_keycode("shift")):
+                    tilt *= 2.
+                if self.player1_controller.get_pressed(
+                        self.ui.get_keycode("a")):
+                    choice_local_vel_mult[0] = -1.  # full speed
+                                                   # so same as
+                                                   # virtual
+                                                   # shoulder button
+                elif self.player1_controller.get_pressed(
+                        self.ui.get_keycode('d')):
+                    choice_local_vel_mult[0] = 1.  # full speed
+                                                   # so same as
+                                                   # virtual
+                                                   # shoulder button
+                if self.player1_controller.get_pressed(
+                        self.ui.get_keycode("w")):
+                    # if self.get_fly_by_name(m_glop.name):
+                        # # intentionally use z,y:
+                        # vmz, vmy = get_rect_from_polar_rad(
+                            # tilt, m_glop._r_ins_x.angle)
+                        # choice_local_vel_mult[2] = vmz
+                        # choice_local_vel_mult[1] = vmy
+                    # else:
+                    choice_local_vel_mult[2] = tilt
+
+                elif self.player1_controller.get_pressed(
+                        self.ui.get_keycode('s')):
+                    # if self.get_fly_by_name(m_glop.name):
+                        # # intentionally use z,y:
+                        # opposite = math.radians(-180)
+                        # if m_glop._r_ins_x.angle < 0:
+                            # opposite *= -1.
+                        # vmz, vmy = get_rect_from_polar_rad(
+                            # tilt, m_glop._r_ins_x.angle + opposite)
+                        # choice_local_vel_mult[2] = vmz
+                        # choice_local_vel_mult[1] = vmy
+                    # else:
+                    choice_local_vel_mult[2] = -tilt
+
+                if self.player1_controller.get_pressed(
+                        self.ui.get_keycode("enter")):
+                    self.use_selected(m_glop)
+
+                if self.player1_controller.get_pressed(
+                        self.ui.get_keycode("spacebar")):
+                    if mgs['on_ground_enable']:
+                        # TODO: make double-jump event handler
+                        choice_local_vel_mult[1] = 1.
+                        # if get_verbose_enable():
+                            # print("[ PyGlops ] (verbose message"
+                                  # " in update: jumped (maximum try)")
+                    else:
+                        # if get_verbose_enable():
+                            # print("[ PyGlops ] (verbose message"
+                                  # " in update: can't jump while"
+                                  # " not on ground.")
+                        pass
+            ## DO NO MORE HIT DETECTION SINCE 1ST CHANGE IS BELOW
+
+            # ACTUAL MOVEMENT is done only if the object is at rest
+            # (see else case below).
+            check_pos_enable = False
+            choice_moved_enable = False
+            soa_glop_enable = False  # see soa_indices
+            choice_world_vel = [0.0, 0.0, 0.0]
+
+            # if m_glop.look_target_glop is not None:
+               # m_glop.look_at(m_glop.look_target_glop)
+                # print(str(m_glop.name) + " looks at " +
+                #       str(m_glop.look_target_glop.name))
+                # print(
+                #     "  at " +
+                #     str(
+                #         get_vec3_from_point(self.camera_glop._t_ins))
+            mgsv = None
+            try:
+                mgsv = mgs['velocity']
+            except KeyError:
+                raise KeyError("(FATAL) state template was not" +
+                      " applied to glop named " + str(m_glop.name) +
+                      " from file '" + str(m_glop.source_path) + "'" +
+                      " but physics-enabled glop must always have" +
+                      " velocity")
+            ar_enable = False
+            if mgs['on_ground_enable'] or \
+                    self.get_fly_by_name(m_glop.name):
+                ar_enable = True
+                # can control own movement
+                # (do not use look_dest_theta directly since wasn't
+                # turned all the way in that direction until after the
+                # movement below could have taken place)
+                # xz coords of edges of 16x16 square are:
+                # move in the direction you are facing
+
+                choice_world_vel_mult = [0., 0., 0.]
+                if choice_local_vel_mult[0] != 0.0 or \
+                        choice_local_vel_mult[1] != 0.0 or \
+                        choice_local_vel_mult[2] != 0.0:
+                    # makes movement relative to rotation
+                    # (which also limits speed when moving diagonally):
+                    moving_r_multiplier = \
+                        math.sqrt((choice_local_vel_mult[0] *
+                                   choice_local_vel_mult[0]) +
+                                  (choice_local_vel_mult[2] *
+                                   choice_local_vel_mult[2]))
+                    if moving_r_multiplier > 1.0:
+                        moving_r_multiplier = 1.0
+                            # Limited so that you can't move faster
+                            # when moving diagonally
+                        # print("[ PyGlops ] WARNING in update:"
+                              # " clipped >100% movement")
+                    choice_world_vel_mult[0] = (moving_r_multiplier *
+                                                math.cos(mgas[1]))
+                    # TODO: (?) make relative to rotation for fly mode:
+                    choice_world_vel_mult[1] = choice_local_vel_mult[1]
+                    choice_world_vel_mult[2] = (moving_r_multiplier *
+                                                math.sin(mgas[1]))
+                    # choice_local* VARS SHOULD NOT BE USED AFTER THIS
+                    # SINCE THEY ARE NOT NEEDED FOR ANYTHING ELSE.
+
+                    choice_world_r_vel = lapf * moving_r_multiplier
+                    radial_xz_velocity = (
+                        math.sqrt((mgsv[0] * mgsv[0]) +
+                                  (mgsv[2] * mgsv[2]))
+                    )
+                    if choice_world_r_vel + radial_xz_velocity < -lapf:
+                        choice_world_r_vel = 0.
+                        # choice_world_r_vel += (
+                            # (choice_world_r_vel +
+                             # radial_xz_velocity) -
+                            # lapf
+                        # )
+                    elif choice_world_r_vel + radial_xz_velocity > lapf:
+                        choice_world_r_vel = 0.
+                        # choice_world_r_vel -= (
+                            # (choice_world_r_vel +
+                             # radial_xz_velocity) -
+                            # lapf
+                        # )
+                    if choice_world_r_vel < kEpsilon:
+                        choice_world_r_vel = 0.0
+
+                    # TODO: reprogram so adding math.radians(-90)
+                    # is not needed (?) or remove these comments if
+                    # works now
+                    # choice_world_vel[0] = \
+                        # lapf*moving_r_multiplier * \
+                        #     math.cos(
+                        #         m_glop._r_ins_y.angle +
+                        #         mgas[1] +
+                        #         math.radians(-90))
+                    # choice_world_vel[1] = \
+                        # lapf * \
+                        #     choice_world_vel_mult[1]
+                    # choice_world_vel[2] = \
+                        # lapf * moving_r_multiplier * \
+                        # math.sin(m_glop._r_ins_y.angle +
+                        #     mgas[1] +
+                        #     math.radians(-90))
+                    for a_i in range(3):
+                        choice_world_vel[a_i] = (
+                            choice_world_vel_mult[a_i] *
+                            lapf  # land accel per frame
+                        )
+                    # choice_world_vel[0] = (choice_world_r_vel *
+                                              # math.cos(mgas[1])
+                    # )
+                    # choice_world_vel[1] = (lapf *
+                                              # choice_world_vel_mult[1]
+                    # )
+                    # choice_world_vel[2] = (choice_world_r_vel *
+                                              # math.sin(mgas[1])
+                    # )
+                    # if (m_glop._t_ins.x + move_by_x > \
+                            # self._world_cube.get_max_x()):
+                        # move_by_x = \
+                            # self._world_cube.get_max_x() - \
+                            # m_glop._t_ins.x
+                        # print(str(m_glop._t_ins.x) + " of max_x:" +
+                            # str(self._world_cube.get_max_x()))
+                    # if (m_glop._t_ins.z + move_by_z > \
+                            # self._world_cube.get_max_z()):
+                        # move_by_z = self._world_cube.get_max_z() - \
+                                    # m_glop._t_ins.z
+                        # print(str(m_glop._t_ins.z) + " of max_z:" +
+                              # str(self._world_cube.get_max_z()))
+                    # if (m_glop._t_ins.x + move_by_x < \
+                            # self._world_cube.get_min_x()):
+                        # move_by_x = self._world_cube.get_min_x() - \
+                                    # m_glop._t_ins.x
+                        # print(str(m_glop._t_ins.x) + " of max_x:" +
+                              # str(self._world_cube.get_max_x()))
+                    # if (m_glop._t_ins.z + move_by_z < \
+                            # self._world_cube.get_min_z()):
+                        # move_by_z = self._world_cube.get_min_z() - \
+                                    # m_glop._t_ins.z
+                        # print(str(m_glop._t_ins.z) + " of max_z:" +
+                              # str(self._world_cube.get_max_z()))
+
+                    # print(str(m_glop._t_ins.xz) + " each " +
+                          # "coordinate should be between matching" +
+                          # " one in " +
+                          # str(self._world_cube.get_min_x()) + "," +
+                          # str(self._world_cube.get_min_z()) +
+                          # " and " +
+                          # str(self._world_cube.get_max_x()) + "," +
+                          # str(self._world_cube.get_max_z()))
+                    # print(str(m_glop._t_ins.xyz) + " each " +
+                          # "coordinate should be between matching" +
+                          # " one in " +
+                          # str(self.world_boundary_min) +
+                          # " and " +
+                          # str(self.world_boundary_max))
+                for axis_i in range(0,3):
+                    if choice_world_vel[axis_i] != 0.0:
+                        choice_moved_enable = True
+                        mgsv[axis_i] += choice_world_vel[axis_i]
+                # for axis_i in range(0,3):
+                    if mgsv[axis_i] != 0.0:
+                        # set _t_ins via set_coord:
+                        m_glop.set_coord(axis_i, mgsv[axis_i])
+
+                # self.prev_inbounds_camera_translate = \
+                    # self.camera_glop._t_ins.x,
+                    # self.camera_glop._t_ins.y,
+                    # self.camera_glop._t_ins.z
+
+                # else:
+                    # self.camera_glop._t_ins.x += \
+                        # self.lupf * \
+                        # choice_local_vel_mult[0]
+                    # self.camera_glop._t_ins.z += \
+                        # self.lupf * \
+                        # choice_local_vel_mult[2]
+
+
+                # TODO:? if mgs['look_theta_multipliers'][1] != 0.0:
+                    # delta_y = lrpf * choice_try_theta_multipliers[1]
+                    # m_glop._r_ins_y.angle += delta_y
+                # if choice_try_theta_multipliers is not None:
+                    # choice_world_turn_theta = \
+                        # choice_try_theta_multipliers[1]
+
+                if mgs['dst_angles'] is not None:
+                    for a_i in range(3):
+                    #if lupf is not None:
+                        delta_theta = mgs['dst_angles'][a_i] - mgas[a_i]
+                        if delta_theta > lrpf:
+                            delta_theta = lrpf
+                        elif delta_theta < -lrpf:
+                            delta_theta = -lrpf
+                        # check kEpsilon to prevent jitter while stopped
+                        if delta_theta > kEpsilon or \
+                                delta_theta < -kEpsilon:
+                            new_a = mgas[a_i] + delta_theta
+                            m_glop.set_angle(a_i, new_a)
+                            if p1_enable and a_i == 1:
+                                if not fequals(m_glop.get_angle(a_i),
+                                               new_a):
+                                    # print(
+                                        # "FAILED to set angle " +
+                                        # str(math.degrees(
+                                          # m_glop.get_angle(a_i))) +
+                                        # " to " +
+                                        # str(math.degrees(new_a)))
+                                    print(
+                                        "FAILED to set angle " +
+                                        str(m_glop.get_angle(a_i)) +
+                                        " to " +
+                                        str(new_a))
+                            # TODO: m_glop._r_ins_y.angle = \
+                                # angle_trunc(m_glop._r_ins_y.angle)
+                            # m_glop._t_ins.x += \
+                                # choice_local_vel_mult[0]
+                            # m_glop._t_ins.z += \
+                                # choice_local_vel_mult[2]
+                    # else:
+                        # print("[ PyGlops ] ERROR in update:"
+                              # " choice_world_turn_theta was set"
+                              # " for unit, but engine forgot to set"
+                              # " lupf")
+
+            # end if on_ground_enable or flying can control own movement
+
+            pcgs = None  # player-controlled glop state
+            if p1_enable:
+                if sg['camera_perspective_number'] == \
+                        self.CAMERA_FIRST_PERSON():
+                    # player-controlled glop
+                    pcgs = self.player_glop.state
+                else:
+                    pcgs = self.camera_glop.state
+
+                if self._visual_debug_enable and pcgs is not None and \
+                        pcgs.get('dst_angles') is not None:
+                    if 'Player' not in debug_dict:
+                        debug_dict['Player'] = {}
+                    pcg = None
+                    if pcgs.get('glop_index') is not None:
+                        pcg = self.glops[pcgs['glop_index']]
+                        debug_dict['Player']['name'] = pcg.name
+                        debug_dict['Player']['angles'] = DebugText(
+                            get_degrees_text, pcg.get_angles(), 6)
+                    debug_dict['Player']['dst_angles'] = DebugText(
+                        get_degrees_text, pcgs['dst_angles'], 6)
+                    debug_dict['Player']['free'] = ar_enable
+
+            if choice_moved_enable:
+                check_pos_enable = True
+            #if (not mgs['on_ground_enable']) or \
+            #   choice_moved_enable:
+            # if not mgs['on_ground_enable']:
+            # if m_glop._cached_floor_y is None:
+                # m_glop._cached_floor_y = self._world_min_y
+                # # TODO: get from walkmesh instead and
+                # # eliminate _cached_floor_y
+            # (this part is under no outer conditions)
+            if mgp['physics_enable']:
+                if mgs.get('show_physics_msg_enable') is None:
+                    if get_verbose_enable():
+                        print("[ PyGlops ] (verbose message " +
+                            "in update) processing first run of" +
+                            " physics for " + m_glop.name)
+                    mgs['show_physics_msg_enable'] = True
+                # walk_info = \
+                    # self.constrain_glop_to_walkmesh(m_glop)
+                # on_ground_enable = \
+                    # walk_info.get('on_ground_enable')
+                # if on_ground_enable is not None:
+                    # if mgs['on_ground_enable'] != \
+                            # on_ground_enable:
+                        # mgs['on_ground_enable'] = \
+                # on_ground_enable
+                        # mgs['at_rest_event_enable'] = \
+                            # True
+                # deprecated this_glop_free_enable = False
+                # if m_glop._cached_floor_y is not None:
+                    # if m_glop._t_ins.y - mgp['hit_radius'] - \
+                       # kEpsilon > m_glop._cached_floor_y:
+                        # # this_glop_free_enable = True
+                        # pass
+                    # else: # STOP object
+                          # # (remove owner and projectile_dict)
+                        # mgs['on_ground_enable'] = True
+                # else:
+                    # pass
+                    # # no cached floor, so move without regard to
+                    # # ground
+                    # # this_glop_free_enable = True
+
+                if mgs['at_rest_event_enable']:
+                        # HIT GROUND (or target if
+                        # mgs.get('bumped_by_index') \
+                        # is not None
+                    mgs['at_rest_event_enable'] = False
+                    bumper_index = self._get_live_index_in(
+                        mgs, 'bumped_by_index')
+                    e_glop = None
+                    r_glop = None
+                    egp = None
+                    rgp = None
+                    if bumper_index is not None:
+                        self.on_bump(motivated_index, bumper_index)
+                        bumpable_index = motivated_index
+                        e_glop = self.glops[bumpable_index]
+                        r_glop = self.glops[bumper_index]
+                        egp = e_glop.properties
+                        rgp = r_glop.properties
+                    else:
+                        self.on_bump_world(motivated_index, 'ground')
+                        bumper_index = motivated_index
+                        bumpable_index = None
+                        r_glop = self.glops[bumper_index]
+                        rgp = r_glop.properties
+                    # TODO: optionally, such as for bottom-heavy
+                    # items: m_glop._r_ins_x.angle = 0.
+                    # if mgsv[2] > kEpsilon:
+                    # if (mgsv[1] < 0.0 - \
+                    #         (kEpsilon + mgp['hit_radius'])):
+                    # print("  HIT GROUND Y:" +
+                    #       str(m_glop._cached_floor_y))
+                    # bump_sound_paths is guaranteed by PyGlop
+                    # _init_glop to exist in glop's properties
+                    if e_glop is not None:
+                        bsps = egp['bump_sound_paths']
+                        if len(bsps) > 0:
+                            rand_i = random.randrange(
+                                0, len(bsps))
+                            self.play_sound(bsps[rand_i])
+                        igpd = e_glop.projectile_dict
+                        # NOTE: already checked
+                        # bumpable_index bump_enable above
+                        # print("distance:" + str(total_hit_radius) +
+                        # " <= total_hit_radius:" +
+                        # str(total_hit_radius))
+                        if igpd is None or \
+                           ('owner' not in igpd) or \
+                           (igpd['owner'] != r_glop.name):
+                            self._internal_bump_glop(bumpable_index,
+                                                     bumper_index)
+                            if get_verbose_enable():
+                                if e_glop is not None:
+                                    print("[ PyGlops ]" + VMSG +
+                                          str(r_glop.name) +
+                                          " bumped " +
+                                          str(e_glop.name))
+                                elif r_glop is not None:
+                                    print("[ PyGlops ]" + VMSG +
+                                          str(r_glop.name) +
+                                          " bumped world")
+                        else:
+                            if get_verbose_enable():
+                                print("[ PyGlops ]" + VMSG +
+                                      "cannot bump own projectile")
+
+                    # NOTE: projectile_dict is already removed above
+                    # by _internal_bump_glop if relevant
+                    if mgid is not None:
+                        if mgid['state'].get('owner') is not None:
+                            del mgid['state']['owner']
+                        if mgid['state'].get('owner_key') is not None:
+                            del mgid['state']['owner_key']
+
+                    # m_glop._t_ins.y = m_glop._cached_floor_y +
+                    #                   mgp['hit_radius']
+                    # check_pos_enable = True
+                    # if mgsv[0] != 0. or \
+                       # mgsv[1] != 0. or \
+                       # mgsv[2] != 0.:
+                        # if get_verbose_enable():
+                            # print("[ PyGlops ] stopped glop" +
+                                  # "{hit_radius:" +
+                                  # str(mgp['hit_radius']) +
+                                  # "; glop._cached_floor_y:" +
+                                  # str(m_glop._cached_floor_y) +
+                                  # "}")
+                    mgsv[1] = 0.0
+                # end at_rest_event_enable
+                # (still inside `if...physics_enable`--and only that)
+                if soa_indices is not None and mgad is None and \
+                        not (mgs['on_ground_enable'] and
+                             mgp['roll_enable']) and \
+                        len(mgs['links']) < 1:
+                    if not mgs['on_ground_enable'] or \
+                            mgsv[0] != 0. or mgsv[1] != 0. or \
+                            mgsv[2] != 0.:
+                        # (a resting glop has nothing to integrate)
+                        soa_glop_enable = True
+                if soa_glop_enable:
+                    # friction, movement and gravity are done for all
+                    # of these glops at once after this loop (see
+                    # physics_store_integrate)
+                    soa_indices.append(motivated_index)
+                    soa_own_enables.append(False)
+                    if not mgs['on_ground_enable'] and \
+                            got_frame_delay > 0.0:
+                        check_pos_enable = True
+                else:
+                    if mgs['on_ground_enable']:
+                        wfd = sw['friction_divisor']
+                        wfdp = wfd
+                        if mgsv[1] < -kEpsilon:
+                            wfdp = wfd + -mgsv[1]  # pressure increases friction
+                            # TODO: real physics for wfdp
+                        if mgsv[1] <= kEpsilon:
+                            # if no upward velocity, do friction
+                            if mgsv[0] > kEpsilon:
+                                mgsv[0] /= wfdp
+                            else:
+                                mgsv[0] = 0.
+                            # mgsv[1] is done later,
+                            # based on gravity
+                            if mgsv[2] > kEpsilon:
+                                mgsv[2] /= wfdp
+                            else:
+                                mgsv[2] = 0.
+                            # this_glop_free_enable = False
+                    src_pos = m_glop.get_pos()
+                    dst_pos = ( src_pos[0] + mgsv[0] * got_frame_delay,
+                                 src_pos[1] + mgsv[1] * got_frame_delay,
+                                 src_pos[2] + mgsv[2] * got_frame_delay
+                    )
+                    if get_verbose_enable():
+                        if mgad is not None and mgp['roll_enable']:
+                            print("[ PyGlops ] WARNING in update:" +
+                                  " roll_enable is True for actor" +
+                                  " '" + m_glop.name + "'")
+
+                    if mgs['on_ground_enable'] and \
+                       mgp.get('hit_radius') is not None and \
+                       mgp['hit_radius'] > 0 and\
+                       mgp['roll_enable']:
+                        # then roll, only if not actor (mgad is None)
+                        # TODO: rolling friction (here or elsewhere)
+                        # TODO: project into object space for accuracy
+                        angles = list(m_glop.get_angles())
+                        rolling_vec_indicies = (0, 2)
+                        rvtis = (2, 1)  # rolling vector theta indices
+                        rvps = ((0, 2), (1, 2))  # rolling vector planes
+                        for rv_i in range(len(rolling_vec_indicies)):
+                            rvi = rolling_vec_indicies[rv_i]
+                            src_2D_pos = (src_pos[rvps[rv_i][0]],
+                                          src_pos[rvps[rv_i][1]])
+                            dst_2D_pos = (dst_pos[rvps[rv_i][0]],
+                                           dst_pos[rvps[rv_i][1]])
+                            # first do trig to get angle from pos delta:
+                            offset_theta = get_angle_vec2(src_2D_pos,
+                                                          dst_2D_pos)
+                            # https://www.mathopenref.com/arclength.html
+                            al = (TAU * mgp['hit_radius'] *
+                                  (offset_theta / TAU))
+                            # Simplifies if have radians & central angle
+                            # but central angle is always acute
+                            # so doesn't provide info useful to engine:
+                            # al = mgp['hit_radius'] * offset_c
+                            angles[rvi] += al
+                            # TODO: why does changing rotation
+                            # make things hit ground too high?
+                            if (angles[rvi] > TAU):
+                                angles[rvi] -= TAU
+                            elif (angles[rvi] < NEG_TAU):
+                                angles[rvi] += TAU
+                        m_glop.set_angles(angles)
+                    # do even if 'on_ground_enable' since may be rolling
+                    m_glop.set_pos(dst_pos)
+
+                    if not mgs['on_ground_enable']:
+                        # process gravity only
+                        # (don't do hit detection again until user
+                        # [& ai at top of this method] sees this frame)
+                        if got_frame_delay > 0.0:
+                            check_pos_enable = True
+                            # print("[ PyGlops ]" + VMSG +
+                                # "GRAVITY AFFECTED:" +
+                                # str(m_glop._t_ins.y) +
+                                # " += " + str(mgsv[1]))
+                            mgsv[1] -= sw['gravity'] * got_frame_delay
+                            # print("[ PyGlops ]" + VMSG +
+                                # "THEN VELOCITY CHANGED TO:" +
+                                # str(mgsv[1]))
+                            # print("[ PyGlops ]" + VMSG +
+                                # "FRAME INTERVAL:" +
+                                # str(got_frame_delay))
+                        else:
+                            if self._delay_is_available_enable:
+                                print("[ PyGlops ] "
+                                      "WARNING in update: no frame"
+                                      " delay is detectable (update"
+                                      " normally runs automatically"
+                                      " once per frame but seems to"
+                                      " be running more often)")
+            # end if physics_enable
+            # AND FORMERLY end on_ground_enable or choice_moved_enable
+
+            # if choice_local_vel_mult[0] != 0.0 or \
+            #   # choice_local_vel_mult[1] != 0.0 or \
+            #   # choice_local_vel_mult[2] != 0.0:
+                # did NOT necessarily move (deltas already checked)
+            if (not mgs['on_ground_enable']):
+                if choice_world_vel[0] != 0.0 or \
+                   choice_world_vel[1] != 0.0 or \
+                   choice_world_vel[2] != 0.0:
+                    # then already did check_pos_enable when set
+                    if get_verbose_enable():
+                        prev_on_ground_enable = \
+                            mgs.get('prev_on_ground_enable')
+                        if prev_on_ground_enable != \
+                                mgs['on_ground_enable']:
+                            print("[ PyGlops ]" + VMSG +
+                                  "glop " + m_glop.name +
+                                  " tried to move, but was not " +
+                                  "at rest (physics in control)")
+            mgs['prev_on_ground_enable'] = mgs['on_ground_enable']
+            mgs['constrained_enable'] = False
+            # deprecated this_glop_free_enable
+            # deprecated stop_this_bumpable_enable
+            for rel in mgs['links']:
+                if rel['r_type'] == "carry":
+                    if m_glop._t_ins.xyz != \
+                            rel['state']['parent_glop']._t_ins.xyz:
+                        m_glop._t_ins.x = \
+                            rel['state']['parent_glop']._t_ins.x
+                        m_glop._t_ins.y = \
+                            rel['state']['parent_glop']._t_ins.y
+                        m_glop._t_ins.z = \
+                            rel['state']['parent_glop']._t_ins.z
+                        check_pos_enable = True
+                    mgs['on_ground_enable'] = True
+                    mgs['constrained_enable'] = True
+                else:
+                    print("[ PyGlops ] ERROR in update: " +
+                          "unknown link r_type " +
+                          str(rel.get('r_type')))
+
+            # if mgp['physics_enable']:
+            if p1_enable:
+                if not 'Player' in dd:
+                    dd['Player'] = {}
+                dd['Player']['check_pos_enable'] = \
+                    check_pos_enable
+            if soa_glop_enable:
+                # clipped after physics_store_integrate moves it
+                soa_check_enables[motivated_index] = check_pos_enable
+            elif check_pos_enable and \
+                    motivated_index in self._clip_indices:
+                clip_start_s = best_timer()
+                self._clip_glop_at(motivated_index)
+                clip_s += best_timer() - clip_start_s
+            if sleep_enable and not soa_glop_enable:
+                if self._update_idle_at(motivated_index,
+                                        got_frame_delay):
+                    moving_indices.append(motivated_index)
+
+        # end for index in glops
+        if ps is not None:
+            soa_idx = physics_store_integrate(
+                ps, soa_indices, soa_own_enables, self._clip_indices,
+                self.glops, got_frame_delay, sw)
+            # Only clipping can make an owned glop land, so owned glops
+            # that don't clip are left to the store (they are moving):
+            soa_flags = ps['flags'][soa_idx]
+            visit_mask = (soa_flags & PHYSICS_CLIP_FLAG) != 0
+            visit_mask |= (soa_flags & PHYSICS_OWNED_FLAG) == 0
+            visit_indices = soa_idx[visit_mask].tolist()
+            if sleep_enable:
+                moving_indices.extend(soa_idx[~visit_mask].tolist())
+            for index in visit_indices:
+                owned_enable = index in ps['owned']
+                if owned_enable:
+                    check_pos_enable = got_frame_delay > 0.0
+                else:
+                    check_pos_enable = soa_check_enables[index]
+                if check_pos_enable and index in self._clip_indices:
+                    clip_start_s = best_timer()
+                    if self._clip_glop_at(index) and owned_enable:
+                        ps['pos'][index] = self.glops[index].get_pos()
+                    clip_s += best_timer() - clip_start_s
+                if owned_enable:
+                    igs = self.glops[index].state
+                    if igs['on_ground_enable'] or \
+                            igs['at_rest_event_enable']:
+                        # landed, so step does the rest
+                        self._release_physics_store_at(index)
+                if sleep_enable:
+                    if self._update_idle_at(index, got_frame_delay):
+                        moving_indices.append(index)
+        if len(moving_indices) > 0 and len(self._sleeping_indices) > 0:
+            self._wake_glops_near(moving_indices)
+        if len(self._removal_handles) > 0:
+            for handle in self._removal_handles:
+                index = self.get_glop_index_by_handle(handle)
+                if index is not None:
+                    self.remove_glop_at(index)
+            self._removal_handles = []
+        if fp is not None:
+            frame_profile_add(
+                fp, 'movement', best_timer() - phase_start_s - clip_s)
+            frame_profile_add(fp, 'clip', clip_s)
+        # movitated_glop out of scope
+        # for index in self._bumper_indices:
+            # m_glop = self.glops[index]
+            # walk_info = self.constrain_glop_to_walkmesh(m_glop)
+            # on_ground_enable = walk_info.get('on_ground_enable')
+            # if on_ground_enable is not None:
+                # if mgs['on_ground_enable'] != on_ground_enable:
+                    # mgs['on_ground_enable'] = on_ground_enable
+                    # print(
+                        # "[ PyGlops ] WARNING: update changed" +
+                        # " rest state of " + m_glop.name + " to " +
+                        # str(on_ground_enable) + " but at_rest " +
+                        # "events were not fired nor was manual" +
+                        # " programming done (not yet implemented)")
+        # endregion choice-based movement and physics
+    # end step
+
+    # Set actor_dict['target_pos'] to where the actor's target_index
+    # (or else moveto_index) glop is now.
+    def _update_ai_target_at(self, a_index):
+        agad = self.glops[a_index].actor_dict
+        # NOTE: moveto_index and target_index are guaranteed
+        # to exist by set_as_actor_at
+        if self._get_live_index_in(agad, 'target_index') is not None:
+            agad['target_pos'] = \
+                self.glops[agad['target_index']]._t_ins.xyz
+        elif self._get_live_index_in(agad, 'moveto_index') is not None:
+            if agad['moveto_index'] not in self._visible_indices:
+                agad['moveto_index'] = None
+                if get_verbose_enable():
+                    print("[ PyGlops ] (verbose "
+                          "message) actor"
+                          " lost target since glop at"
+                          " moveto_index is now invisible")
+            else:
+                agad['target_pos'] = \
+                    self.glops[agad['moveto_index']]._t_ins.xyz
+
+    # Let an actor with ai_enable choose a target (on_process_ai) and a
+    # weapon and acquire_radius for it (kept until it thinks again),
+    # then schedule when it thinks again: every ai_think_seconds within
+    # ai_near_distance of the player, less often farther away.
+    def _think_at(self, a_index, now_s):
+        VMSG = " (verbose message in update) "
+        sg = self.settings['globals']
+        sw = self.settings['world']
+        actor_glop = self.glops[a_index]
+        ags = actor_glop.state
+        agp = actor_glop.properties
+        agad = actor_glop.actor_dict
+        self.on_process_ai(a_index)
+        self._update_ai_target_at(a_index)
+        if agad['target_pos'] is not None:
+            ags['acquire_radius'] = agp['reach_radius']
+
+            src_pos = actor_glop._t_ins.xyz
+            dst_pos = agad['target_pos']
+            # acquire_radius is changed below if using
+            # ranged weapon
+            distance = get_distance_vec3_xz(src_pos,
+                                            dst_pos)
+
+            ags['desired_use'] = None
+            ags['choice_ii'] = -1  # inventory index
+            if agad.get('target_index') is not None:
+                weapon_index = None
+                # NOTE: uses is determined by item_dict,
+                # ranges is by actor_dict (unless use contains
+                # "shoot_", then ranges are determined by
+                # item_dict)
+                # Start desired_* as None in case item is no
+                # longer in inventory.
+                if agad['inventory_index'] >= 0:
+                    try_item = agad['inventory_items'][agad['inventory_index']]
+                    if 'uses' in try_item:
+                        for this_use in try_item['uses']:
+                            if this_use in sg['attack_uses']:
+                                ags['desired_use'] = this_use
+                                # attack guarantees
+                                # attack_types exists
+                                # (via set_as_item)
+                                ags['choice_ii'] = \
+                                    agad['inventory_index']  # guaranteed to exist by set_as_actor_at
+                        # TODO: loop again and look for melee
+                    #else item has no use
+                if ags['choice_ii'] < 0:
+                    # If weapon is not selected, choose
+                    # random weapon even if selected a slot.
+                    dii, du = actor_glop.find_item_with_any_use(
+                        sg['attack_uses'])
+                    ags['choice_ii'] = \
+                        dii
+                    ags['desired_use'] = \
+                        du
+                if ags['choice_ii'] >= 0:
+                    this_use = ags['desired_use']
+                    try_item = \
+                        agad['inventory_items'][ags['choice_ii']]
+                    if "shoot_" in this_use:
+                        if 'ranges' in try_item and \
+                                (try_item['ranges'].get(this_use) is not None):
+                            ags['acquire_radius'] = \
+                                try_item['ranges'][this_use]
+                        else:
+                            # TODO: predict arc to determine
+                            # range instead
+                            ags['acquire_radius'] = \
+                                20.
+                            if get_verbose_enable():
+                                print("[ PyGlops ]" +
+                                    VMSG + "used " +
+                                    "default acquire " +
+                                    "radius " +
+                                    str(ags['acquire_radius']) +
+                                    " since item['ranges']['" +
+                                    this_use +
+                                    "'] was not set")
+                    else:
+                        if this_use in agad['ranges']:
+                            ags['acquire_radius'] = \
+                                agad['ranges'][this_use]
+                        else:
+                            # TODO: predict arc to determine
+                            # range instead
+                            ags['acquire_radius'] = 20.
+                            if get_verbose_enable():
+                                print(
+                                    "[ PyGlops ] " +
+                                    "(verbose message " +
+                                    "in update) used" +
+                                    " default acquire " +
+                                    "radius " +
+                                    str(ags['acquire_radius']) +
+                                    ' since ' +
+                                    "actor_dict['ranges']['" +
+                                    this_use +
+                                    "'] was not set")
+                else:
+                    ags['acquire_radius'] = agp['reach_radius']
+            # ACTUAL MOVEMENT is done by step, in
+            # # region choice-based movement and physics
+        think_s = sw['ai_think_seconds']
+        pgi = self.get_player_glop_index(1)
+        if pgi is not None and pgi != a_index and \
+                sw['ai_near_distance'] > 0.0:
+            distance = get_distance_vec3_xz(
+                actor_glop._t_ins.xyz, self.glops[pgi]._t_ins.xyz)
+            if distance > sw['ai_near_distance']:
+                think_s *= distance / sw['ai_near_distance']
+                if think_s > sw['ai_far_think_seconds']:
+                    think_s = sw['ai_far_think_seconds']
+        ags['ai_next_s'] = now_s + think_s
+
+    def _clip_glop_at(self, motivated_index):
+        # Keep the glop on the walkmesh (or above
+        # settings['world']['ground'] if there are no walkmeshes)
+        # and set on_ground_enable (and at_rest_event_enable if it
+        # landed). Called by step for glops that moved. Returns True if
+        # it moved the glop.
+        m_glop = self.glops[motivated_index]
+        mgs = m_glop.state
+        mgp = m_glop.properties
+        sw = self.settings['world']
+        dd = debug_dict
+        const_ground_enable = True
+        walk_info = None
+        walkmesh_enable = True
+        if walkmesh_enable:
+            if len(self._walkmeshes) > 0:
+                const_ground_enable = False
+                #constrained_pos = [m_glop._t_ins.x,
+                #                   m_glop._t_ins.y,
+                #                   m_glop._t_ins.z]
+                if mgp['hitbox'] is not None:
+                    walk_info = self.get_walk_info(
+                        m_glop._t_ins.xyz,
+                        (mgp['hitbox']['maximums'][0],
+                         -mgp['hitbox']['minimums'][1]),
+                        walk_state=mgs)
+                else:
+                    walk_info = self.get_walk_info(
+                        m_glop._t_ins.xyz,
+                        (mgp['hit_radius'],
+                         mgp['hit_radius']),
+                        walk_state=mgs)
+                if (motivated_index == \
+                        self.get_player_glop_index(1)):
+                    if 'Player' not in dd:
+                        dd['Player'] = {}
+                    dd['Player']['walkmesh_via'] = \
+                        walk_info['walkmesh_via']
+                    dd['Player']['feet_y'] = \
+                        walk_info['feet_y']
+
+            else:
+                walkmesh_enable = False
+        if const_ground_enable:
+            walk_info = {}
+            walk_info['pos'] = [
+                m_glop._t_ins.x, \
+                m_glop._t_ins.y, \
+                m_glop._t_ins.z
+                ]
+            walk_info['change_enable'] = False
+            height_only_enable = True
+            corrected_pos = [
+                m_glop._t_ins.x,
+                m_glop._t_ins.y,
+                m_glop._t_ins.z
+                ]
+            if corrected_pos[1] < sw['ground']:
+                corrected_pos[1] = sw['ground']
+            hit_ground_enable = None
+            if not height_only_enable:
+                walk_info['change_enable'] = True
+                walk_info['pos'][0] = corrected_pos[0]
+                walk_info['pos'][2] = corrected_pos[2]
+                    # TODO: check y (vertical) axis against
+                    # eye height and jump height etc
+            # region pasted from get_walk_info
+            if walk_info['pos'][1] - corrected_pos[1] < \
+                    kEpsilon:
+                walk_info['on_ground_enable'] = True
+            elif walk_info['pos'][1] - corrected_pos[1] > \
+                    kEpsilon:
+                # Hovering higher than kEpsilon--
+                # use kEpsilon as a deadzone so that
+                # floating point errors don't cause physics
+                # and hence many at_rest events
+                walk_info['on_ground_enable'] = False
+
+            if corrected_pos[1] > walk_info['pos'][1]:
+                walk_info['change_enable'] = True
+                walk_info['pos'][1] = corrected_pos[1]
+            else:
+                # Hovering, but previous if-else flags for
+                # physics
+                pass
+            # endregion pasted from get_walk_info
+
+        on_ground_enable = walk_info.get('on_ground_enable')
+        if on_ground_enable is not None:
+            if mgs['on_ground_enable'] != on_ground_enable:
+                mgs['on_ground_enable'] = on_ground_enable
+                if on_ground_enable:
+                    mgs['at_rest_event_enable'] = True
+                    # frame of hit is shown to player and ai
+                    # BEFORE event is handled
+                else:
+                    pass
+                    # mgs[
+                    #     "not_at_rest_event_enable"
+                    #     ] = True
+                    # TODO: (?) make an on_not_at_rest event
+        if walk_info['change_enable']:
+            # frame of hit is shown to player and ai
+            # BEFORE event is handled
+            m_glop._t_ins.x = walk_info['pos'][0]
+            #if on_ground_enable is True:
+            m_glop._t_ins.y = walk_info['pos'][1]
+            m_glop._t_ins.z = walk_info['pos'][2]
+            return True
+        return False
+
+    # Let step visit the glop again if the physics store owns it
+    # (see physics_store_integrate). The glop's own position and
+    # velocity are already up to date.
+    def _release_physics_store_at(self, index):
+        ps = self._physics_store
+        if ps is None or index not in ps['owned']:
+            return
+        ps['owned'].remove(index)
+        ps['flags'][index] = 0
+        self.glops[index]._pos_watcher = None
+
+    # Called by a glop's _on_change_pos when something other than step
+    # moves it. A sleeping glop is woken, and if it has physics it is
+    # no longer on the ground, so step checks the ground where it is
+    # now instead of leaving it floating.
+    def _on_glop_pos_changed(self, this_glop):
+        index = this_glop.glop_index
+        if index is None:
+            return
+        self._release_physics_store_at(index)
+        if index in self._sleeping_indices:
+            self.wake_glop_at(index)
+            if this_glop.properties['physics_enable']:
+                this_glop.state['on_ground_enable'] = False
+
+    # Add the glop to (or remove it from) each active set that depends
+    # on its properties and state, so step only visits glops that can
+    # move. This is done by add_glop, set_as_actor_at, set_as_item_at,
+    # hide_glop, show_glop, throw_glop, set_physics_enable_at,
+    # set_clip_enable_at etc., but call it yourself (or
+    # update_active_sets) after changing physics_enable, clip_enable,
+    # visible_enable or links directly once the glop is added. It also
+    # wakes the glop and releases it from the physics store, so call it
+    # after changing other state (such as velocity) of a sleeping or
+    # falling glop directly.
+    def update_active_sets_at(self, index):
+        self._release_physics_store_at(index)
+        if index in self._sleeping_indices:
+            self.wake_glop_at(index)
+        this_glop = self.glops[index]
+        tgp = this_glop.properties
+        tgs = this_glop.state
+        for active_set, enable in (
+                (self._physics_indices, tgp['physics_enable']),
+                (self._clip_indices, tgp['clip_enable']),
+                (self._visible_indices, tgs['visible_enable']),
+                (self._linked_indices, len(tgs['links']) > 0)):
+            if enable:
+                active_set[index] = None
+            else:
+                active_set.pop(index, None)
+
+    # Do update_active_sets_at for every glop (such as after changing
+    # the flags of many glops directly).
+    def update_active_sets(self):
+        for index in range(len(self.glops)):
+            if self.glops[index] is None:
+                continue  # removed
+            self.update_active_sets_at(index)
+
+    def set_physics_enable_at(self, index, enable):
+        self.glops[index].properties['physics_enable'] = enable
+        self.update_active_sets_at(index)
+
+    def set_clip_enable_at(self, index, enable):
+        self.glops[index].properties['clip_enable'] = enable
+        self.update_active_sets_at(index)
+
+    # Make step skip the glop (its velocity becomes zero) until
+    # wake_glop_at. It is woken if it is bumped, thrown or moved (see
+    # _on_glop_pos_changed), if update_active_sets_at is called for it
+    # (such as when it gets links), or if a moving glop comes within
+    # wake_radius (see settings['world']['sleep_enable']).
+    def sleep_glop_at(self, index):
+        this_glop = self.glops[index]
+        mgsv = this_glop.state['velocity']
+        mgsv[0] = 0.0
+        mgsv[1] = 0.0
+        mgsv[2] = 0.0
+        this_glop.state['idle_s'] = 0.0
+        this_glop._pos_watcher = self._on_glop_pos_changed
+        self._sleeping_indices.add(index)
+        self._sleep_hash = None
+
+    def wake_glop_at(self, index):
+        if index in self._sleeping_indices:
+            self._sleeping_indices.remove(index)
+            self._sleep_hash = None
+            self.glops[index]._pos_watcher = None
+        self.glops[index].state['idle_s'] = 0.0
+
+    def get_sleeping_at(self, index):
+        return index in self._sleeping_indices
+
+    # Return True if the glop is moving; otherwise count how long it
+    # has been idle and sleep_glop_at if at least sleep_seconds (only
+    # for glops that nothing but a bump or velocity would move).
+    def _update_idle_at(self, index, got_frame_delay):
+        m_glop = self.glops[index]
+        mgs = m_glop.state
+        mgsv = mgs['velocity']
+        sw = self.settings['world']
+        ss = sw['sleep_speed']
+        if (mgsv[0] * mgsv[0] + mgsv[1] * mgsv[1] +
+                mgsv[2] * mgsv[2] >= ss * ss) or \
+                (m_glop.properties['physics_enable'] and
+                 not mgs['on_ground_enable']):
+            mgs['idle_s'] = 0.0
+            return True
+        if m_glop.actor_dict is not None or \
+                mgs['at_rest_event_enable'] or \
+                len(mgs['links']) > 0 or \
+                mgs.get('dst_angles') is not None or \
+                m_glop is self.camera_glop or \
+                index == self.get_player_glop_index(1):
+            mgs['idle_s'] = 0.0
+            return False
+        mgs['idle_s'] += got_frame_delay
+        if mgs['idle_s'] >= sw['sleep_seconds']:
+            self.sleep_glop_at(index)
+        return False
+
+    # Wake sleeping glops within wake_radius of the hit_radius of any
+    # of the given (moving) glops.
+    def _wake_glops_near(self, indices):
+        wr = self.settings['world']['wake_radius']
+        max_radius = 0.0
+        for index in indices:
+            this_radius = self.glops[index].properties.get('hit_radius')
+            if this_radius is not None and this_radius > max_radius:
+                max_radius = this_radius
+        sh = self._sleep_hash
+        if sh is None or \
+                sh['max_radius'] + max_radius + wr > sh['cell_size']:
+            max_sleeping_radius = 0.0
+            for index in self._sleeping_indices:
+                this_radius = \
+                    self.glops[index].properties.get('hit_radius')
+                if this_radius is not None and \
+                        this_radius > max_sleeping_radius:
+                    max_sleeping_radius = this_radius
+            sh = new_spatial_hash(max_sleeping_radius + max_radius + wr)
+            sh['max_radius'] = max_sleeping_radius
+            for index in self._sleeping_indices:
+                spatial_hash_add(sh, self.glops[index].get_pos(), index)
+            self._sleep_hash = sh
+        wake_indices = set()
+        for index in indices:
+            m_glop = self.glops[index]
+            m_radius = m_glop.properties.get('hit_radius')
+            if m_radius is None:
+                m_radius = 0.0
+            for s_index in spatial_hash_query(sh, m_glop.get_pos()):
+                if s_index in wake_indices:
+                    continue
+                s_glop = self.glops[s_index]
+                s_radius = s_glop.properties.get('hit_radius')
+                if s_radius is None:
+                    s_radius = 0.0
+                if get_distance_glops(m_glop, s_glop) <= \
+                        m_radius + s_radius + wr:
+                    wake_indices.add(s_index)
+        for s_index in wake_indices:
+            self.wake_glop_at(s_index)
+
+    # region slots
+    # Put the glop in self.glops (in the slot of a removed glop if any)
+    # and set its glop_index. Return the index.
+    def _claim_glop_index(self, this_glop):
+        if len(self._free_glop_indices) > 0:
+            index = self._free_glop_indices.pop()
+            self.glops[index] = this_glop
+        else:
+            index = len(self.glops)
+            self.glops.append(this_glop)
+            if index >= len(self._glop_generations):
+                self._glop_generations.append(0)
+        this_glop.glop_index = index
+        this_glop.state['glop_index'] = index
+        return index
+
+    # Get a handle (a tuple of the index and how many glops were
+    # removed from that slot) that stays valid until the glop is
+    # removed even if another glop reuses the slot, or None if there is
+    # no glop at index.
+    def get_glop_handle_at(self, index):
+        if index is None or index < 0 or index >= len(self.glops) or \
+                self.glops[index] is None:
+            return None
+        return (index, self._glop_generations[index])
+
+    # Get the index of the glop for a handle from get_glop_handle_at,
+    # or None if that glop was removed.
+    def get_glop_index_by_handle(self, handle):
+        if handle is None:
+            return None
+        index, generation = handle
+        if index < len(self.glops) and self.glops[index] is not None \
+                and self._glop_generations[index] == generation:
+            return index
+        return None
+
+    # Return this_dict[key] (a glop index), or None (and set it to
+    # None) if the glop was removed. The handle is kept as key +
+    # "_handle" when an index is first seen, so a glop added to the
+    # same slot later isn't mistaken for the one that was there.
+    def _get_live_index_in(self, this_dict, key):
+        index = this_dict.get(key)
+        if index is None:
+            return None
+        handle_key = key + "_handle"
+        handle = this_dict.get(handle_key)
+        if handle is None or handle[0] != index:
+            handle = self.get_glop_handle_at(index)
+            this_dict[handle_key] = handle
+        if self.get_glop_index_by_handle(handle) is None:
+            this_dict[key] = None
+            this_dict[handle_key] = None
+            return None
+        return index
+
+    # Remove the glop from the scene, along with the glops it carries,
+    # so its slot can be reused by the next glop added (and so step no
+    # longer visits it). Indices stored before then are checked using
+    # handles (see get_glop_handle_at). Return False if it is the
+    # camera, a player or a walkmesh. Don't call this during step (such
+    # as from on_bump)--see settings['globals']['remove_killed_enable'].
+    def remove_glop_at(self, index):
+        this_glop = None
+        if self.get_glop_handle_at(index) is not None:
+            this_glop = self.glops[index]
+        if this_glop is None:
+            print("[ PyGlops ] ERROR in remove_glop_at: there is no"
+                  " glop at " + str(index))
+            return False
+        if this_glop is self.camera_glop or \
+                this_glop is self.player_glop or \
+                index in self._player_indices or \
+                this_glop in self._walkmeshes:
+            print("[ PyGlops ] ERROR in remove_glop_at: '" +
+                  str(this_glop.name) + "' is the camera, a player or"
+                  " a walkmesh")
+            return False
+        tgs = this_glop.state
+        if this_glop.actor_dict is not None:
+            for item_dict in this_glop.actor_dict['inventory_items']:
+                if item_dict is None or item_dict.get('state') is None:
+                    continue
+                item_index = self._get_live_index_in(
+                    item_dict['state'], 'glop_index')
+                if item_index is None:
+                    continue
+                item_glop = self.glops[item_index]
+                if item_glop.get_link_as(this_glop, "carry") > -1:
+                    item_glop.state['links'] = []
+                    self.remove_glop_at(item_index)
+        if tgs['visible_enable']:
+            self.hide_glop(this_glop)
+        self._release_physics_store_at(index)
+        this_glop.release_resources()
+        for active_set in (self._bumper_indices,
+                           self._bumpable_indices,
+                           self._actor_indices,
+                           self._physics_indices,
+                           self._clip_indices,
+                           self._visible_indices,
+                           self._linked_indices):
+            active_set.pop(index, None)
+        for b_index in self._bumpable_indices:
+            bgs = self.glops[b_index].state
+            if index in bgs['in_range_indices']:
+                bgs['in_range_indices'].remove(index)
+        if index in self._sleeping_indices:
+            self._sleeping_indices.remove(index)
+            self._sleep_hash = None
+            this_glop._pos_watcher = None
+        self._projectile_pools.pop(index, None)
+        for pool in self._projectile_pools.values():
+            if index in pool:
+                pool.remove(index)
+        self.glops[index] = None
+        this_glop.glop_index = None
+        tgs['glop_index'] = None
+        self._glop_generations[index] += 1
+        self._free_glop_indices.append(index)
+        # compact (empty slots at the end are dropped):
+        while len(self.glops) > 0 and self.glops[-1] is None:
+            self.glops.pop()
+            self._free_glop_indices.remove(len(self.glops))
+        return True
+    # endregion slots
+
+    # Save the load profile (see write_load_profile).
+    def save_load_profile(self, path):
+        write_load_profile(self._load_profile, path)
+        return True
+
+    # Save the phase times of recent frames (see profile_frame_count)
+    # as CSV, or as JSON if path ends with ".json" (see
+    # write_frame_profile).
+    def save_frame_profile(self, path):
+        if self._frame_profile is None:
+            print("[ PyGlops ] ERROR in save_frame_profile: the frame"
+                  " profiler is off (profile_frame_count is 0)")
+            return False
+        write_frame_profile(self._frame_profile, path)
+        return True
+
     def get_verbose_enable(self):
         return get_verbose_enable()
 
+    def play_sound(self, path, loop=False):
+        # implement in subclass if sound is available
+        pass
+
     def spawn_pex_particles(self, path, pos, radius=1.0, duration_seconds=None):
         if self.ui is not None:
             self.ui.spawn_pex_particles(path, pos, radius, duration_seconds)
@@ -2659,9 +5795,7 @@ class PyGlops:
             pre_commands = "hide"  # default behavior is to hold item in
                                    # inventory invisibly
         if pre_commands is not None:
-            command_list = pre_commands.split(";")
-            for command_original in command_list:
-                command = command_original.strip()
+            for command in split_glop_commands(pre_commands):
                 if command != "obtain":
                     self._run_command(
                         command, bumpable_index, bumper_index,
@@ -2683,7 +5817,8 @@ class PyGlops:
             semicolon_separated_commands, bumpable_index, bumper_index,
             bypass_handlers_enable=False):
         if semicolon_separated_commands is not None:
-            command_list = semicolon_separated_commands.split(";")
+            command_list = \
+                split_glop_commands(semicolon_separated_commands)
             if get_verbose_enable():
                 print("[ PyGlops ] (verbose message) command_list: " +
                       str(command_list))
@@ -2699,51 +5834,43 @@ class PyGlops:
                 command, bumpable_index, bumper_index,
                 bypass_handlers_enable=bypass_handlers_enable)
 
+    # Split a command string such as item_dict['bump'] and check each
+    # command against the known ones (_command_methods) now rather than
+    # during each bump. Return a tuple of the known commands (unknown
+    # ones are shown as errors and skipped).
+    def compile_commands(self, semicolon_separated_commands,
+                         sender_name="unknown"):
+        results = []
+        for command in split_glop_commands(semicolon_separated_commands):
+            if command in self._command_methods:
+                results.append(command)
+            else:
+                print("[ PyGlops ] ERROR in compile_commands via " +
+                      sender_name + ": skipped unknown glop command '" +
+                      command + "' in " +
+                      str(semicolon_separated_commands))
+        return tuple(results)
+
+    # Get the compiled item_dict['bump'] (see compile_commands), which
+    # is only compiled again if item_dict['bump'] changed.
+    def _get_bump_commands(self, item_dict):
+        ids = item_dict.setdefault('state', {})
+        if ids.get('bump_source') is not item_dict['bump']:
+            ids['bump_commands'] = self.compile_commands(
+                item_dict['bump'], sender_name="_get_bump_commands")
+            ids['bump_source'] = item_dict['bump']
+        return ids['bump_commands']
+
     def _run_command(self, command, bumpable_index, bumper_index,
             bypass_handlers_enable=False):
         # if get_verbose_enable():
         #     print("[ PyGlops ] (verbose message) _run_command(" +
                   # command + ", ...)")
         # normally run by _internal_bump_glop (such as via _run_* above)
-        if command=="hide":
-            self.hide_glop(self.glops[bumpable_index])
-            self.glops[bumpable_index].properties['bump_enable'] = False
-        elif command=="obtain":
-            #first, fire the (blank) overridable event handlers:
-            egn = self.glops[bumpable_index].name
-            rgn = self.glops[bumper_index].name
-            self._deprecated_on_obtain_glop_by_name(egn, rgn)  # handler
-            self.on_obtain_glop(bumpable_index, bumper_index)  # handler
-            for j in range(len(self._bumpable_indices)):
-                if self._bumpable_indices[j] == bumpable_index:
-                    self._bumpable_indices[j] = None
-                        # can't delete until bump loop is done in update
-
-            # Add it to player's item list if "fits" in inventory:
-            if self.glops[bumper_index].actor_dict is not None:
-                rg = self.glops[bumper_index]
-                eg = self.glops[bumpable_index]
-                item_event = rg.push_glop_item(eg, bumpable_index)
-                # Then manually transfer the glop to the player if it
-                # fit (a game can override `push_item` to control
-                # fit_enable):
-                if item_event['fit_enable']:
-                    eg.item_dict['owner'] = rg.name
-                    eg.item_dict['owner_key'] = bumper_index
-                    item_event['calling method'] = "_run_command"
-                    # process item event so selected inventory slot gets
-                    # updated in case that is the found slot for the
-                    # item:
-                    self.after_selected_item(item_event)
-                if get_verbose_enable():
-                    print(command + " " + eg.name + " {fit:" +
-                          str(item_event['fit_enable']) + "}")
-            else:
-                print("[ PyGlops ] ERROR in _run_command: tried to"
-                      " give item to non-actor (only add actors to"
-                      " self._bumper_indices; add items to"
-                      " self._bumpable_indices instead)")
-                view_traceback()
+        command_method = self._command_methods.get(command)
+        if command_method is not None:
+            command_method(bumpable_index, bumper_index,
+                           bypass_handlers_enable=bypass_handlers_enable)
         else:
             print(
                 "Glop named " +
@@ -2752,6 +5879,47 @@ class PyGlops:
                 str(command)
             )
 
+    def _run_hide_command(self, bumpable_index, bumper_index,
+            bypass_handlers_enable=False):
+        self.hide_glop(self.glops[bumpable_index])
+        self.glops[bumpable_index].properties['bump_enable'] = False
+
+    def _run_obtain_command(self, bumpable_index, bumper_index,
+            bypass_handlers_enable=False):
+        #first, fire the (blank) overridable event handlers:
+        egn = self.glops[bumpable_index].name
+        rgn = self.glops[bumper_index].name
+        self._deprecated_on_obtain_glop_by_name(egn, rgn)  # handler
+        self.on_obtain_glop(bumpable_index, bumper_index)  # handler
+        self._bumpable_indices.pop(bumpable_index, None)
+
+        # Add it to player's item list if "fits" in inventory:
+        if self.glops[bumper_index].actor_dict is not None:
+            rg = self.glops[bumper_index]
+            eg = self.glops[bumpable_index]
+            item_event = rg.push_glop_item(eg, bumpable_index)
+            self.update_active_sets_at(bumpable_index)
+            # Then manually transfer the glop to the player if it
+            # fit (a game can override `push_item` to control
+            # fit_enable):
+            if item_event['fit_enable']:
+                eg.item_dict['owner'] = rg.name
+                eg.item_dict['owner_key'] = bumper_index
+                item_event['calling method'] = "_run_command"
+                # process item event so selected inventory slot gets
+                # updated in case that is the found slot for the
+                # item:
+                self.after_selected_item(item_event)
+            if get_verbose_enable():
+                print("obtain " + eg.name + " {fit:" +
+                      str(item_event['fit_enable']) + "}")
+        else:
+            print("[ PyGlops ] ERROR in _run_obtain_command: tried"
+                  " to give item to non-actor (only add actors to"
+                  " self._bumper_indices; add items to"
+                  " self._bumpable_indices instead)")
+            view_traceback()
+
     def hide_glop(self, this_glop):
         print("ERROR: hide_glop should be implemented by a sub-class"
               " since it is specific to graphics implementation")
@@ -2838,10 +6006,9 @@ class PyGlops:
                 "meshes/sprite-square.obj", pivot_to_g_enable=True)
         else:
             w_glop = self.new_glop_method()
-            w_glop.glop_index = len(self.glops)
-            w_glop.state['glop_index'] = w_glop.glop_index
-            self.glops.append(w_glop)
-            indices = [len(self.glops)-1]
+            self._claim_glop_index(w_glop)
+            self.update_active_sets_at(w_glop.glop_index)
+            indices = [w_glop.glop_index]
             if self.glops[indices[0]] is not w_glop:
                 #then address multithreading paranoia
                 indices = None
@@ -2867,11 +6034,7 @@ class PyGlops:
                 item_dict['fires_glops'].append(fg)
                 fg.set_texture_diffuse(item_dict['fired_sprite_path'])
                 fg.look_target_glop = self.camera_glop
-                for j in range(len(self._bumpable_indices)):
-                    if self._bumpable_indices[j] == indices[i]:
-                        self._bumpable_indices[j] = None
-                            # can't delete until bump loop is done
-                            # in update
+                self._bumpable_indices.pop(indices[i], None)
 
                 if get_verbose_enable():
                     print("[ PyGlops ] (verbose message)"
@@ -2940,6 +6103,14 @@ class PyGlops:
             eg = self.glops[bumpable_index]
             egn = eg.name
             egid = eg.item_dict
+            # (the handlers below may change its state directly)
+            self._release_physics_store_at(bumpable_index)
+            if bumpable_index in self._sleeping_indices:
+                self.wake_glop_at(bumpable_index)
+        if bumper_index is not None:
+            self._release_physics_store_at(bumper_index)
+            if bumper_index in self._sleeping_indices:
+                self.wake_glop_at(bumper_index)
         # Prevent repeated bumping until out of range again:
         if bumper_index is not None:
             if bumper_index not in eg.state['in_range_indices']:
@@ -2972,8 +6143,9 @@ class PyGlops:
                       " PROJECTILE HIT _internal_bump_glop"
                       " found projectile_dictbump")  # debug only
             if bumper_index is not None:
-                self.on_attacked_glop(bumper_index,
-                                      egpd['owner_key'], egpd)
+                self.on_attacked_glop(
+                    bumper_index,
+                    self._get_live_index_in(egpd, 'owner_key'), egpd)
             if len(eg.properties['bump_sound_paths']) > 0:
                 rand_i = random.randrange(
                     0, len(eg.properties['bump_sound_paths']))
@@ -3049,12 +6221,9 @@ class PyGlops:
                     if egid['bump'] is None:
                         # verbose message already shown above
                         return
-                    # self._run_semicolon_separated_
-                    # commands(egid['bump'],
-                    # bumpable_index, bumper_index);
-                    commands = egid['bump'].split(";")
+                    # (compiled once, not split for every bump):
+                    commands = self._get_bump_commands(egid)
                     for command in commands:
-                        command = command.strip()
                         if get_verbose_enable():
                             bumper_name_msg = "'" + rgn + "'"
                             if rgn is None:
@@ -3077,8 +6246,8 @@ class PyGlops:
                                 print("[ PyGlops ] ERROR:"
                                       " _internal_bump_glop: obtained"
                                       " projectile while airborne")
-                        self._run_command(command, bumpable_index,
-                                          bumper_index)
+                        self._command_methods[command](
+                            bumpable_index, bumper_index)
                 else:
                     if get_verbose_enable():
                         bumper_name_msg = "'" + str(rgn) + "'"
@@ -3125,6 +6294,8 @@ class PyGlops:
         #lines.append(min_tab_string+this_name+":")
         lines.append(min_tab_string+"glops:")
         for i in range(0,len(self.glops)):
+            if self.glops[i] is None:
+                continue  # removed
             lines.append(min_tab_string+tab_string+"-")
             self.glops[i].emit_yaml(
                 lines, min_tab_string+tab_string+tab_string)
@@ -3140,10 +6311,13 @@ class PyGlops:
               " on_explode_glop (and check for None before using"
               " variables other than pos)")
 
-    def explode_glop_at(self, index, projectile_dict=None):
-        print("[ PyGlops ] subclass should implement on_explode_glop"
-              " (and check for None before using variables other than"
-              " pos)")
+    def explode_glop_at(self, index, weapon_dict=None):
+        self.on_explode_glop( \
+            self.glops[index]._t_ins.xyz, \
+            self.glops[index].properties['hit_radius'], \
+            index,
+            weapon_dict)
+        self.kill_glop_at(index, weapon_dict)
 
     def set_camera_mode(self, person_number):
         self.settings['globals']['camera_perspective_number'] = \
@@ -3190,8 +6364,10 @@ class PyGlops:
                               "['actor_properties']")
 
             a_glop.calculate_hit_range()
-            self._bumper_indices.append(index)
-            self._actor_indices.append(index)
+            self.update_land_params_at(index)
+            self._bumper_indices[index] = None
+            self._actor_indices[index] = None
+            self.update_active_sets_at(index)
             if get_verbose_enable():
                 print("[ PyGlops ] Set [" + str(index) + "] '" + \
                       str(a_glop.name) + "' as bumper")
@@ -3215,6 +6391,25 @@ class PyGlops:
                       " glop at index is " + str(self.glops[index]))
         #return result
 
+    # Keep the actor's land_speed, land_accel and
+    # land_degrees_per_second as state['land_params'] so step doesn't
+    # look them up for every glop on every frame. Any that are None
+    # stay None, and step uses the actor template's value for them
+    # (so changing the template applies without calling this).
+    # set_as_actor_at does this, but call it after changing them in
+    # actor_dict.
+    def update_land_params_at(self, index):
+        this_glop = self.glops[index]
+        tgad = this_glop.actor_dict
+        land_params = []
+        for key in ('land_speed', 'land_accel',
+                    'land_degrees_per_second'):
+            value = None
+            if tgad is not None:
+                value = tgad.get(key)
+            land_params.append(value)
+        this_glop.state['land_params'] = tuple(land_params)
+
     #always reimplement this so the camera is correct subclass
     def new_glop_method(self):
         print("[ PyGlops ] ERROR: new_glop_method for PyGlop"
@@ -3237,6 +6432,8 @@ class PyGlops:
         if name is not None:
             if len(self.glops)>0:
                 for index in range(0,len(self.glops)):
+                    if self.glops[index] is None:
+                        continue  # removed
                     if name==self.glops[index].name:
                         result=self.glops[index]
         return result
@@ -3260,6 +6457,8 @@ class PyGlops:
             this_objfile = WObjFile()
             participle = "loading WObjFile"
             this_objfile.load(source_path)
+            load_profile_add_times(self._load_profile,
+                                   this_objfile.load_times)
             if this_objfile.wobjects is None:
                 print("ERROR: wobjects None from '" + source_path + "'")
                 return None
@@ -3274,6 +6473,7 @@ class PyGlops:
                 if this_wobject is not None:
                     participle = "converting wobject..."
                     this_pyglop = new_glop_method()
+                    this_pyglop._load_times = {}  # see load_obj
                     this_pyglop.append_wobject(
                         this_wobject,
                         pivot_to_g_enable=pivot_to_g_enable)
@@ -3319,6 +6519,8 @@ class PyGlops:
         result = False
         if glop_name is not None:
             for i in range(0,len(self.glops)):
+                if self.glops[i] is None:
+                    continue  # removed
                 if self.glops[i].name == glop_name:
                     return self.set_as_item_at(i, template_dict,
                         pivot_to_g_enable=pivot_to_g_enable)
@@ -3421,6 +6623,9 @@ class PyGlops:
             print("[ PyGlops ] WARNING in " + f_name + ": no 'name'" +
                   " in given item dict")
         item_dict['state'] = {}
+        if item_dict.get('bump') is not None:
+            # (check the commands now instead of during each bump)
+            self._get_bump_commands(item_dict)
 
     def set_as_item_at(self, i, template_dict, pivot_to_g_enable=False):
         result = False
@@ -3431,6 +6636,8 @@ class PyGlops:
         self.preprocess_item(item_dict, sender_name="set_as_item_at")
         self.glops[i].item_dict['glop_name'] = self.glops[i].name
         self.glops[i].item_dict['state']['glop_index'] = i
+        self.glops[i].item_dict['state']['glop_index_handle'] = \
+            self.get_glop_handle_at(i)
         self.glops[i].state['glop_index'] = i
         drop_enable = True
         if 'drop_enable' in item_dict:
@@ -3458,7 +6665,8 @@ class PyGlops:
         this_glop = self.glops[i]
         tgp = self.glops[i].properties
         tgv = this_glop.vertices
-        self._bumpable_indices.append(i)
+        self._bumpable_indices[i] = None
+        self.update_active_sets_at(i)
         if tgv is None:
             print("[ PyGlops ] WARNING: new item has no vertices"
                   " (setting hit_radius to 0)")
@@ -3518,7 +6726,8 @@ class PyGlops:
             ids = item_dict['state']
             item_glop = None
             if 'glop_index' in ids:
-                this_glop_index = ids['glop_index']
+                this_glop_index = self._get_live_index_in(
+                    ids, 'glop_index')
                 if this_glop_index is not None:
                     item_glop = self.glops[this_glop_index]
                 #else not a glop--continue anyway
@@ -3687,6 +6896,52 @@ class PyGlops:
             view_traceback()
             print("  '''")
 
+    # Get a copy of fires_glop that throw_glop made before and that can
+    # be thrown again: a hidden one, or else the oldest one if there
+    # are projectile_pool_max (it is hidden first). Return None if a
+    # new copy is needed. Carried copies are never reused.
+    def _get_pooled_projectile(self, fires_glop):
+        if fires_glop.glop_index is None:
+            return None
+        pool = self._projectile_pools.get(fires_glop.glop_index)
+        if pool is None:
+            return None
+        reuse_i = None
+        for pool_i in range(len(pool)):
+            this_glop = self.glops[pool[pool_i]]
+            if len(this_glop.state['links']) > 0:
+                continue
+            if not this_glop.state['visible_enable']:
+                reuse_i = pool_i
+                break
+            if reuse_i is None:
+                reuse_i = pool_i  # the oldest (if pool is full)
+        if reuse_i is None:
+            return None
+        pool_max = self.settings['globals']['projectile_pool_max']
+        result = self.glops[pool[reuse_i]]
+        if result.state['visible_enable']:
+            if pool_max is None or len(pool) < pool_max:
+                return None
+            self.hide_glop(result)
+        pool.append(pool.pop(reuse_i))  # it is now the newest
+        # reset what a new copy wouldn't have:
+        result.projectile_dict = None
+        rgs = result.state
+        rgsv = rgs['velocity']
+        rgsv[0] = 0.0
+        rgsv[1] = 0.0
+        rgsv[2] = 0.0
+        rgs['at_rest_event_enable'] = False
+        if 'bumped_by_index' in rgs:
+            del rgs['bumped_by_index']
+        rgs['dst_angles'] = None
+        rgs['walkmesh_index'] = None
+        rgs['walkmesh_polygon_offset'] = None
+        result.set_angles(fires_glop.get_angles())
+        self.wake_glop_at(result.glop_index)
+        return result
+
     # throw_copy: if did not provide original_glop, item_dict must
     # have fires_glops key that is list of *Glop objects
     # duplicate_enable: if True, copies the object (by instance);
@@ -3748,8 +7003,15 @@ class PyGlops:
                         # print("[ PyGlops ]" + VMSG +
                               # "calling copy_as_mesh_instance for" +
                               # "fires_glop")
+                    pooled_enable = False
                     if duplicate_enable:
-                        fired_glop = fires_glop.copy_as_mesh_instance()
+                        fired_glop = \
+                            self._get_pooled_projectile(fires_glop)
+                        if fired_glop is not None:
+                            pooled_enable = True
+                        else:
+                            fired_glop = \
+                                fires_glop.copy_as_mesh_instance()
                     else:
                         fired_glop = fires_glop
                     if og is None or fired_glop is not og:
@@ -3775,6 +7037,8 @@ class PyGlops:
                     fgpd = fired_glop.projectile_dict
                     fgpd['owner'] = user_glop.name
                     fgpd['owner_key'] = user_glop.glop_index
+                    fgpd['owner_key_handle'] = \
+                        self.get_glop_handle_at(user_glop.glop_index)
                     if user_glop.glop_index is None:
                         print("[ PyGlops ] ERROR in throw_glop:"
                               " user_glop.glop_index is None")
@@ -3869,24 +7133,20 @@ class PyGlops:
                     fired_glop.state['visible_enable'] = True
 
                     if fired_glop.glop_index is None:
-                        self.glops.append(fired_glop)
-                        fired_glop_index = None
-                        # Check identity for multithreading paranoia:
-                        if self.glops[len(self.glops) - 1] is \
-                                fired_glop:
-                            fired_glop_index = len(self.glops) - 1
-                        else:
-                            print("[ PyGlops ] NOTE in throw_glop: "
-                                  "correcting an incorrect glop index"
-                                  " directly after adding to glops")
-                            fired_glop_index = \
-                                self.index_of_mesh(fired_glop.name)
-                        fired_glop.glop_index = fired_glop_index
-                        fired_glop.state['glop_index'] = \
-                            fired_glop_index
+                        fired_glop_index = \
+                            self._claim_glop_index(fired_glop)
+                        if duplicate_enable and \
+                                fires_glop.glop_index is not None:
+                            pool = self._projectile_pools.get(
+                                fires_glop.glop_index)
+                            if pool is None:
+                                pool = []
+                                self._projectile_pools[
+                                    fires_glop.glop_index] = pool
+                            pool.append(fired_glop_index)
                         # NOTE: show_glop is done below in all cases
                     else:
-                        if duplicate_enable:
+                        if duplicate_enable and not pooled_enable:
                             print("[ PyGlop ] WARNING in throw_glop:"
                                   " not adding to glop list"
                                   " fired_glop.glop_index already set"
@@ -3917,7 +7177,7 @@ class PyGlops:
                         if inventory_index is not None:
                             event_dict = user_glop.pop_glop_item(
                                 inventory_index)
-                            event_dict['calling method'] = throw_glop
+                            event_dict['calling method'] = "throw_glop"
                             self.after_selected_item(event_dict)
                         else:
                             print("[ PyGlop ] ERROR in throw_glop: "
@@ -3929,6 +7189,9 @@ class PyGlops:
                         if og is not None:
                             if len(og.state['links']) > 0:
                                 og.state['links'] = []
+                                if og.glop_index is not None:
+                                    self.update_active_sets_at(
+                                        og.glop_index)
                             if get_verbose_enable():
                                 print("[ PyGlops ]" + VMSG + "removed" +
                                       " relations from item_glop" +
@@ -3945,11 +7208,14 @@ class PyGlops:
 
                     self.show_glop(fired_glop.glop_index)
                         # adds to display, such as adding mesh to canvas
-                    fired_glop.properties['physics_enable'] = True
+                    self.set_physics_enable_at(fired_glop.glop_index,
+                                               True)
                     fired_glop.state['on_ground_enable'] = False
+                    self.wake_glop_at(fired_glop.glop_index)
                     fired_glop.properties['bump_enable'] = True
                     # item is bumpable (but only actor can be bumper)
-                    self._bumpable_indices.append(fired_glop.glop_index)
+                    self._bumpable_indices[fired_glop.glop_index] = None
+                    self.update_active_sets_at(fired_glop.glop_index)
 
 
                     # TODO: why was this nonsense here:
@@ -4089,7 +7355,7 @@ class PyGlops:
 
     def on_killed_glop(self, index, projectile_dict):
         pass
-        if get_is_verbose():
+        if get_verbose_enable():
             print("[ PyGlops ] (verbose message in on_killed_glop)"
                   " subclass can implement on_killed_glop")
 
@@ -4099,9 +7365,16 @@ class PyGlops:
         # self.glops[index].properties['bump_enable'] = False
         if self.glops[index].actor_dict is not None:
             self.glops[index].actor_dict['alive_enable'] = False
+            # (dead actors don't think or pick things up)
+            self._actor_indices.pop(index, None)
+            self._bumper_indices.pop(index, None)
         else:
             print("[ PyGlop ] WARNING in kill_glop_at: '" +
                   self.glops[index].name + "' is not an actor")
+        if self.settings['globals']['remove_killed_enable'] and \
+                index != self.get_player_glop_index(1):
+            # (removed at the end of step since step may still use it)
+            self._removal_handles.append(self.get_glop_handle_at(index))
 
     #def bump_glop(self, egn, rgn):
     #    return None
@@ -4113,6 +7386,12 @@ class PyGlops:
     def on_bump(self, glop_index, bumper_index):
         return None
 
+    # Called by step for each living actor that has ai_enable, before
+    # it moves toward target_index or moveto_index (so a subclass can
+    # choose them here).
+    def on_process_ai(self, glop_index):
+        pass
+
     # bumped into world (normally 'ground'--though that
     # could be edge of walkmesh too)
     def on_bump_world(self, glop_index, description):
@@ -4142,62 +7421,29 @@ class PyGlops:
     def on_obtain_glop(self, bumpable_index, bumper_index):
         return None
 
+    # Get the walkmesh grid of w_glop (see new_walkmesh_grid), creating
+    # it if use_walkmesh_at did not already do so.
+    def get_walkmesh_grid(self, w_glop):
+        if w_glop._walkmesh_grid is None:
+            w_glop._walkmesh_grid = new_walkmesh_grid(w_glop)
+        return w_glop._walkmesh_grid
+
     # returns modified position (except y)
     def get_nearest_walkmesh_vec3_using_xz(self, pos):
         result = None
         closest_distance = None
-        poly_sides_count = 3
-        # corners = list()
-        # for i in range(0,poly_sides_count):
-            # corners.append( (0.0, 0.0, 0.0) )
         for this_glop in self._walkmeshes:
-            face_i = 0
-            indices_count = len(this_glop.indices)
-            # assumes tris (see also poly_side_count locals)
-
-            while (face_i<indices_count):
-                wrpo0 = v_offset+this_glop._POSITION_OFFSET+0
-                wrpo1 = v_offset+this_glop._POSITION_OFFSET+1
-                wrpo2 = v_offset+this_glop._POSITION_OFFSET+2
-                gvd = this_glop.vertex_depth
-                verts = this_glop.vertices
-                v_offset = this_glop.indices[face_i]*gvd
-                a_vertex = verts[wrpo0], verts[wrpo1], verts[wrpo2]
-                v_offset = this_glop.indices[face_i+1]*gvd
-                b_vertex = verts[wrpo0], verts[wrpo1], verts[wrpo2]
-                v_offset = this_glop.indices[face_i+2]*gvd
-                c_vertex = verts[wrpo0], verts[wrpo1], verts[wrpo2]
-                # side_a_distance = \
-                    # get_distance_vec3_xz(pos, a_vertex, b_vertex)
-                # side_b_distance = \
-                    # get_distance_vec3_xz(pos, b_vertex, c_vertex)
-                # side_c_distance = \
-                    # get_distance_vec3_xz(pos, c_vertex, a_vertex)
-                this_point, this_distance = get_near_line_info_xz(
-                    pos, a_vertex, b_vertex)
-                tri_distance = this_distance
-                tri_point = this_point
-
-                this_point, this_distance = get_near_line_info_xz(
-                    pos, b_vertex, c_vertex)
-                if this_distance < tri_distance:
-                    tri_distance = this_distance
-                    tri_point = this_point
-
-                this_point, this_distance = get_near_line_info_xz(
-                    pos, c_vertex, a_vertex)
-                if this_distance < tri_distance:
-                    tri_distance = this_distance
-                    tri_point = this_point
-
-                if (closest_distance is None) or \
-                        (tri_distance<closest_distance):
-                    result = tri_point[0], tri_point[1], tri_point[2]
-                        # ok to return y since already swizzled
-                        # (get_near_line_info_xz copies source's y
-                        # to return's y)
-                    closest_distance = tri_distance
-                face_i += poly_sides_count
+            tri_point, tri_distance = walkmesh_grid_get_nearest_xz(
+                self.get_walkmesh_grid(this_glop), pos)
+            if tri_point is None:
+                continue
+            if (closest_distance is None) or \
+                    (tri_distance<closest_distance):
+                result = tri_point[0], tri_point[1], tri_point[2]
+                    # ok to return y since already swizzled
+                    # (get_near_line_info_xz copies source's y
+                    # to return's y)
+                closest_distance = tri_distance
         return result
 
     def get_nearest_walkmesh_vertex_using_xz(self, pos):
@@ -4246,44 +7492,93 @@ class PyGlops:
         return result
 
     def is_in_any_walkmesh_xz(self, check_vec3):
-        return get_walkmesh_info_xz(check_vec3) is not None
+        return self.get_walkmesh_info_xz(check_vec3) is not None
 
     # get container walkmesh and poly index that is closest on xz plane
-    # returns: (walkmesh, polygon_index) tuple
-    def get_walkmesh_info_xz(self, check_vec3):
+    # returns: dict with 'walkmesh_index' and 'polygon_offset' (index
+    # of the triangle's first entry in the walkmesh glop's indices)
+    # walk_state: a glop's state (optional)--if present, the triangle
+    # under the glop last time (and its neighbors) is checked first
+    # (then only later walkmeshes, which override it), and the result
+    # is saved there for next time.
+    def get_walkmesh_info_xz(self, check_vec3, walk_state=None):
         result = None
-        X_i = 0
-        second_i = 2  # actually z since ignoring y
-        check_vec2 = check_vec3[X_i], check_vec3[second_i]
-        walkmesh_i = 0
-        while walkmesh_i < len(self._walkmeshes):
-            w_glop = self._walkmeshes[walkmesh_i]
-            wgv = w_glop.vertices
-            wgi = w_glop.indices
-            X_i = w_glop._POSITION_OFFSET + 0
-            si = w_glop._POSITION_OFFSET + 2  # second index
-            vd = w_glop.vertex_depth
-            poly_side_count = 3  # assumes tris
-            poly_count = int(len(wgi)/poly_side_count)
-            po = 0  # polygon offset
-            for poly_index in range(0,poly_count):
-                if is_in_triangle_vec2(
-                        check_vec2,
-                        (wgv[wgi[po]*vd+X_i], wgv[wgi[po]*vd+si]),
-                        (wgv[wgi[po+1]*vd+X_i], wgv[wgi[po+1]*vd+si]),
-                        (wgv[wgi[po+2]*vd+X_i], wgv[wgi[po+2]*vd+si])):
+        poly_side_count = 3  # assumes tris
+        first_walkmesh_i = 0
+        if walk_state is not None:
+            walkmesh_i = walk_state.get('walkmesh_index')
+            po = walk_state.get('walkmesh_polygon_offset')
+            if walkmesh_i is not None and po is not None and \
+                    walkmesh_i < len(self._walkmeshes):
+                poly_index = walkmesh_grid_find_tri_near_xz(
+                    self.get_walkmesh_grid(
+                        self._walkmeshes[walkmesh_i]),
+                    check_vec3, int(po/poly_side_count),
+                    self.settings['world']['walkmesh_neighbor_depth'])
+                if poly_index is not None:
                     result = dict()
                     result['walkmesh_index'] = walkmesh_i
-                    result['polygon_offset'] = po
-                    break
-                po += poly_side_count
+                    result['polygon_offset'] = \
+                        poly_index * poly_side_count
+                    # (only a later walkmesh can override it, so
+                    # overlapping walkmeshes give the same result as
+                    # searching all of them)
+                    first_walkmesh_i = walkmesh_i + 1
+        walkmesh_i = first_walkmesh_i
+        while walkmesh_i < len(self._walkmeshes):
+            w_glop = self._walkmeshes[walkmesh_i]
+            poly_index = walkmesh_grid_find_tri_xz(
+                self.get_walkmesh_grid(w_glop), check_vec3)
+            if poly_index is not None:
+                # (a later walkmesh overrides an earlier one)
+                result = dict()
+                result['walkmesh_index'] = walkmesh_i
+                result['polygon_offset'] = poly_index * poly_side_count
             walkmesh_i += 1
+        if walk_state is not None:
+            if result is not None:
+                walk_state['walkmesh_index'] = result['walkmesh_index']
+                walk_state['walkmesh_polygon_offset'] = \
+                    result['polygon_offset']
+            else:
+                walk_state['walkmesh_index'] = None
+                walk_state['walkmesh_polygon_offset'] = None
         return result
 
+    def use_walkmesh_at(self, index, hide=True):
+        if self.glops[index] not in self._walkmeshes:
+            self._walkmeshes.append(self.glops[index])
+            sw = self.settings['world']
+            if sw.get('gravity_enable') is None:
+                sw['gravity_enable'] = True
+                print("[ PyGlops ] use_walkmesh_at set "
+                      "world gravity_enable to True "
+                      "in settings dict since was None")
+            print("[ PyGlops ] Applying walkmesh translate " +
+                  str(self.glops[index]._t_ins.xyz))
+            self.glops[index].apply_translate()
+            print("[ PyGlops ]   pivot:" +
+                  str(self.glops[index]._pivot_point))
+            # index the triangles now that vertices are in world space
+            # (so get_walk_info doesn't check every triangle):
+            # (also finds neighboring triangles--see
+            # walkmesh_grid_find_tri_near_xz):
+            self.glops[index]._walkmesh_grid = \
+                new_walkmesh_grid(self.glops[index])
+            if hide:
+                self.hide_glop(self.glops[index])
+
     def use_walkmesh(self, name, hide=True):
-        print("[ PyGlops ] ERROR: use_walkmesh should be implemented in"
-              " a subclass since it is dependent on display method")
-        return False
+        result = False
+        #for this_glop in self.glops:
+        for index in range(0, len(self.glops)):
+            if self.glops[index] is None:
+                continue  # removed
+            if self.glops[index].name == name:
+                result = True
+                self.use_walkmesh_at(index, hide=hide)
+                break
+        return result
 
     def get_similar_names(self, partial_name):
         results = None
@@ -4292,6 +7587,8 @@ class PyGlops:
             partial_name_lower = partial_name.lower()
             results = list()
             for this_glop in self.glops:
+                if this_glop is None:
+                    continue  # removed
                 checked_count += 1
                 if this_glop.name is not None:
                     if partial_name_lower in this_glop.name.lower():
@@ -4311,6 +7608,8 @@ class PyGlops:
             results = list()
             for index in range(0,len(self.glops)):
                 this_glop = self.glops[index]
+                if this_glop is None:
+                    continue  # removed
                 checked_count += 1
                 #print("checked "+this_glop.name.lower())
                 if this_glop.source_path is not None:
@@ -4329,6 +7628,8 @@ class PyGlops:
             results = list()
             for index in range(0,len(self.glops)):
                 this_glop = self.glops[index]
+                if this_glop is None:
+                    continue  # removed
                 checked_count += 1
                 #print("checked "+this_glop.name.lower())
                 if this_glop.name is not None and \
@@ -4356,6 +7657,8 @@ class PyGlops:
             results = {} # [list() for i in range(results_len + 1)]
             for index in range(0,len(self.glops)):
                 this_glop = self.glops[index]
+                if this_glop is None:
+                    continue  # removed
                 checked_count += 1
                 #print("checked "+this_glop.name.lower())
                 #match_indices = [None]*results_len
@@ -4428,6 +7731,8 @@ class PyGlops:
         result = -1
         name_lower = name.lower()
         for i in range(0,len(self.glops)):
+            if self.glops[i] is None:
+                continue  # removed
             source_name = None
             source_name_lower = None
             if self.glops[i].source_path is not None:
@@ -4455,6 +7760,8 @@ class PyGlops:
                       name_msg)
                 if (i + 1 < len(self.glops)):
                     for j in range(i+1, len(self.glops)):
+                        if self.glops[j] is None:
+                            continue  # removed
                         sub_source_name_lower = None
                         if self.glops[j].source_path is not None:
                             sub_source_name_lower = os.path.basename(
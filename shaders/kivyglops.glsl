@@ -12,6 +12,7 @@ attribute vec4  a_normal;
 uniform mat4 modelview_mat;
 uniform mat4 projection_mat;
 uniform bool texture0_enable;
+uniform bool vertex_color_disable;  // true if vertex format has no a_color
 //uniform material  material_state;
 
 varying vec4 v_color;
@@ -31,7 +32,12 @@ void main (void) {
     vec4 pos = modelview_mat * a_position; //vec4(v_pos,1.0);
     v_pos = projection_mat * pos;
     gl_Position = v_pos;
-    v_color = a_color;
+    if (vertex_color_disable) {
+        v_color = vec4(0.0, 0.0, 0.0, 0.0);  // same as PyGlop default
+    }
+    else {
+        v_color = a_color;
+    }
     uv_vec = a_texcoord0;
     v_normal = a_normal.xyz;
 }
@@ -25,6 +25,10 @@ from kivy.uix.boxlayout import BoxLayout
 from kivyglops import *
 from common import *
 set_verbose_enable(True)
+settings['globals']['load_worker_count'] = None
+    # convert uncached OBJ files passed to load_objs in one worker
+    # process per CPU (safe since the app only starts under
+    # if __name__ == "__main__": below)
 
 import math
 import os
@@ -118,10 +122,14 @@ class MainScene(KivyGlops):
         #    print("Found possible walkmesh: "+name)
         #    is_ok = self.use_walkmesh(name, hide=True)
 
+        # Load every OBJ file with one load_objs call, so uncached
+        # files are converted at the same time (see load_worker_count
+        # above):
+        obj_paths = []
         if test_shader_enable:
             test_name = "shader-test.obj"
             test_path = os.path.join("meshes", test_name)
-            self.load_obj(test_path)
+            obj_paths.append(test_path)
 
         if test_medieval_enable:
 
@@ -143,10 +151,15 @@ class MainScene(KivyGlops):
             if seaport_path is None:
                 seaport_path = os.path.join(testing_path, seaport_name)
             if os.path.isfile(seaport_path):
-                self.load_obj(seaport_path, pivot_to_g_enable=True)
+                obj_paths.append(seaport_path)
             else:
                 #try_path
                 print("[ testing ] ERROR: can't find '" + seaport_name + "'")
+        if test_space_enable:
+            obj_paths.append("meshes/spaceship,simple-denapes.obj")
+        self.load_objs(obj_paths, pivot_to_g_enable=True)
+
+        if test_medieval_enable:
             #medseaport1b-lowpoly (including dependencies) is available from http://www.expertmultimedia.com/usingpython/resources/Environments,Outdoor-Manmade/seaport.zip
 
             # self.load_obj("medseaport1b-minimal.obj")
@@ -214,7 +227,7 @@ class MainScene(KivyGlops):
             self.set_player_fly(1, True)
             self.set_hud_background("example_hud.png")
             self.set_background_cylmap("maps/starfield_cylindrical_map.jpg")
-            self.load_obj("meshes/spaceship,simple-denapes.obj")
+            # (meshes/spaceship,simple-denapes.obj was loaded above)
 
             ship_info = dict()
             ship_info['hp'] = 1.0
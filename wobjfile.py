@@ -8,6 +8,7 @@ import sys  # exception etc
 import math
 import traceback
 import uuid
+from timeit import default_timer as best_timer
 
 tab_string = "  "
 
@@ -49,6 +50,10 @@ def get_fvec6(values,start_index=0):
 def get_fvec7(values,start_index=0):
     return (float(values[start_index]), float(values[start_index+1]), float(values[start_index+2]), float(values[start_index+3]), float(values[start_index+4]), float(values[start_index+5]), float(values[start_index+6]))
 
+# Get the args after the command in a line split by bytes.split().
+def get_args_string(parts):
+    return b" ".join(parts[1:]).decode("utf-8")
+
 #def get_fvec4(values,start_index=0):
     #result = None
     #if len(values)-start_index>=4:
@@ -456,9 +461,16 @@ class WObjFile:
         self.texcoords_not_2_warning_enable = True
         # self.NYI_s_enable = True
         self.short_name_in_messages_enable = True
+        self.load_times = None  # seconds spent by the latest load in
+                                # each stage (see load)
 
+    # Load filename (and the mtl file it uses). Afterward, load_times
+    # is a dict with the seconds spent reading the file ('read'),
+    # loading the mtl file ('mtl') and everything else ('parse').
     def load(self, filename):
         f_name = "load"
+        load_start_s = best_timer()
+        self.load_times = {'read': 0.0, 'parse': 0.0, 'mtl': 0.0}
         if (self.filename is not None):
             print("[ WObjFile ] WARNING in load: WObjFile already " + \
                   "loaded; loading '" + filename + "' in place of '" + \
@@ -497,20 +509,204 @@ class WObjFile:
                 absolute_vt_count = 0
                 absolute_vn_count = 0
                 individuated_v_count = 0
-                v_map = None
+                v_map = None  # key is absolute index, value is index in
+                              # this_object.vertices
                 vt_map = None
                 vn_map = None
+                face_corners = None
                 this_o_name = None
                 # this_face_group = None
                 group_names = ["default"]  # formerly this_face_group_name
                 smoothing_param = None
                 # this_face_group_key = None
-                for line in open(filename, "r"):
-                    line_strip = line.strip()
-                    while ("\t" in line_strip):
-                        line_strip = line_strip.replace("\t", " ")
-                    while ("  " in line):
-                        line = line.replace("  ", " ")
+                read_start_s = best_timer()
+                ins = open(filename, "rb")
+                data = ins.read()
+                ins.close()
+                self.load_times['read'] = best_timer() - read_start_s
+                # NOTE: bytes.split() with no param splits on any
+                # whitespace (and ignores repeated whitespace), and
+                # splitlines handles \n, \r\n or \r like open(filename)
+                lines = data.splitlines()
+                line_total = len(lines)
+                while line_counting_number <= line_total:
+                    line_bytes = lines[line_counting_number-1]
+                    parts = line_bytes.split()
+                    command_bytes = None
+                    if len(parts) > 0:
+                        command_bytes = parts[0]
+                    # region fast path for commands in mesh data blocks
+                    if command_bytes == b"v":
+                        if prev_usable_command != "v":
+                            # this is non-spec to account for
+                            # non-spec v commands that aren't
+                            # preceded by `o` command
+                            if this_object is not None:
+                                # NOTE: this_object.name is guaranteed
+                                self.wobjects[this_object.name] = this_object
+                                show_object_faces_msg(this_object, msg_filename)
+                                this_object = None
+                            if this_o_name is None: # do AFTER using name as key for adding previous object to self.wobjects
+                                this_o_name = self._get_unused_wobject_key()
+                                print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) `o` command should precede `v` command--compensating for out-of-spec obj file by using generated name '" + this_o_name + "'")
+                            v_map = dict()
+                            vt_map = dict()
+                            vn_map = dict()
+                            face_corners = dict()  # key is an f arg such
+                                                   # as b"1/1/1"
+                            this_object = WObject()
+                            this_object.name = this_o_name
+                            this_o_name = None  # consume it
+                            this_object.source_path = filename
+                            this_object.mtl_filename = this_mtl_filename
+                            this_object.vertices = list()
+                            this_wobject_v_count = 0
+                            this_wobject_vt_count = 0
+                            this_wobject_vn_count = 0
+                            if len(comments)>0:
+                                for i in range(0,len(comments)):
+                                    this_object.append_opening_comment(comments[i])
+                                del comments[:]
+                            prev_usable_command = "v"
+                        # NOTE: references a v by vertex# are relative to file instead of 'o', but this is detected & fixed below (for each object discovered) since file may not match spec
+                        this_object.has_any_data_enable = True
+                        run_len = self._load_value_lines(lines, line_counting_number, b"v", absolute_v_list, msg_filename)
+                        absolute_v_count += run_len
+                        line_counting_number += run_len
+                        continue
+                    elif this_object is None:
+                        pass  # (show error in slow path below)
+                    elif command_bytes == b"vt":
+                        this_object.has_any_data_enable = True
+                        run_len = self._load_value_lines(lines, line_counting_number, b"vt", absolute_vt_list, msg_filename)
+                        absolute_vt_count += run_len
+                        prev_usable_command = "vt"
+                        line_counting_number += run_len
+                        continue
+                    elif command_bytes == b"vn":
+                        # NOTE: presence of normals supercedes smoothing groups
+                        this_object.has_any_data_enable = True
+                        run_len = self._load_value_lines(lines, line_counting_number, b"vn", absolute_vn_list, msg_filename)
+                        absolute_vn_count += run_len
+                        prev_usable_command = "vn"
+                        line_counting_number += run_len
+                        continue
+                    elif command_bytes == b"f":
+                        this_object.has_any_data_enable = True
+                        if prev_usable_command != "f":
+                            if group_names is None:
+                                group_names = ["default"]
+                            if this_object.face_groups is None:
+                                this_object.face_groups = {}
+                            smoothing_key = smoothing_param
+                            smoothing_mode = None
+                            if smoothing_param is None or \
+                               smoothing_param=="on" or \
+                               smoothing_param=="off":
+                                smoothing_key = this_object._get_unused_face_list_key()
+                                smoothing_mode = smoothing_param
+                            else:
+                                smoothing_mode = "on"
+
+                            if this_object.face_dicts is None:
+                                this_object.face_dicts = {}
+                            if smoothing_key not in this_object.face_dicts:
+                                this_object.face_dicts[smoothing_key] = {}
+                            this_object.face_dicts[smoothing_key]["s"] = smoothing_mode
+                            this_faces = []
+                            this_object.face_dicts[smoothing_key]["faces"] = this_faces
+                            for group_name in group_names:
+                                if group_name not in this_object.face_groups:
+                                    this_object.face_groups[group_name] = []
+                                if not smoothing_key in this_object.face_groups[group_name]:
+                                    this_object.face_groups[group_name].append(smoothing_key)
+                            prev_usable_command = "f"
+                        this_face = []
+                        try:
+                            for arg in parts[1:]:
+                                face_corner = face_corners.get(arg)
+                                if face_corner is not None:
+                                    # same vertex_number etc as last time
+                                    this_face.append(list(face_corner))
+                                    continue
+                                absolute_v_index = None
+                                absolute_vt_index = None
+                                absolute_vn_index = None
+                                vertex_number = None
+                                texcoord_number = None
+                                normal_number = None
+                                values = arg.split(b"/")
+                                #subtract offsets from values since obj file not only uses counting numbers but also numbers unique in entire file (as opposed to starting over for each object):
+                                if len(values[FACE_V]) > 0:  # if not blank
+                                    stated_v_number = int(values[FACE_V])
+                                    if stated_v_number>=1:
+                                        absolute_v_index = stated_v_number - 1
+                                    elif stated_v_number<0:  # negative index is relative in obj standard
+                                        absolute_v_index = absolute_v_count + stated_v_number  # + since negative
+                                    else:
+                                        print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) vertex number 0 in obj is nonstandard and will be skipped")
+                                    if absolute_v_index is not None:
+                                        vertex_number = v_map.get(absolute_v_index)
+                                        if vertex_number is None:
+                                            vertex_number = this_wobject_v_count
+                                            v_map[absolute_v_index] = vertex_number
+                                            this_object.vertices.append(absolute_v_list[absolute_v_index])
+                                            individuated_v_count += 1
+                                            this_wobject_v_count += 1
+                                if len(values) >= 2 and len(values[FACE_TC]) > 0:
+                                    stated_texcoord_number = int(values[FACE_TC])
+                                    if stated_texcoord_number>=1:
+                                        absolute_vt_index = stated_texcoord_number - 1
+                                    elif stated_texcoord_number<0:  # negative index is relative in obj standard
+                                        absolute_vt_index = absolute_vt_count + stated_texcoord_number  # + since negative
+                                    else:
+                                        print(msg_filename + " (" + str(line_counting_number) + ",0): (PARSER WARNING) texcoord number 0 on obj is nonstandard and will be skipped")
+                                    if absolute_vt_index is not None:
+                                        texcoord_number = vt_map.get(absolute_vt_index)
+                                        if texcoord_number is None:
+                                            texcoord_number = this_wobject_vt_count
+                                            vt_map[absolute_vt_index] = texcoord_number
+                                            if this_object.texcoords is None:
+                                                this_object.texcoords = list()
+                                            this_object.texcoords.append(absolute_vt_list[absolute_vt_index])
+                                            this_wobject_vt_count += 1
+                                if len(values) >= 3 and len(values[FACE_VN]) > 0:
+                                    stated_normal_number = int(values[FACE_VN])
+                                    if stated_normal_number>=1:
+                                        absolute_vn_index = stated_normal_number - 1
+                                    elif stated_normal_number<0:  # negative index is relative in obj standard
+                                        absolute_vn_index = absolute_vn_count + stated_normal_number  # + since negative
+                                    else:
+                                        print(msg_filename + " (" + str(line_counting_number) + ",0): (PARSER WARNING) normal number 0 on obj is nonstandard and will be skipped")
+                                    if absolute_vn_index is not None:
+                                        normal_number = vn_map.get(absolute_vn_index)
+                                        if normal_number is None:
+                                            normal_number = this_wobject_vn_count
+                                            vn_map[absolute_vn_index] = normal_number
+                                            if this_object.normals is None:
+                                                this_object.normals = list()
+                                            this_object.normals.append(absolute_vn_list[absolute_vn_index])
+                                            this_wobject_vn_count += 1
+                                if texcoord_number is None and texcoord_number_warning_enable:
+                                    print(msg_filename + " (" + str(line_counting_number) + ",0): (PARSER WARNING) vertex texcoord_number is None when adding to face")
+                                    print("(this is the last texcoord_number warning that will be shown for this input file)")
+                                    print("")
+                                    texcoord_number_warning_enable = False
+                                this_face.append([vertex_number,texcoord_number,normal_number])  # this is OBJ vertex_format
+                                if b"-" not in arg:
+                                    # (negative numbers are relative, so
+                                    # only cache positive ones)
+                                    face_corners[arg] = this_face[-1][:]
+                        except ValueError:
+                            print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) face has a vertex number that is not an integer, so the face will be skipped: '" + get_args_string(parts) + "'")
+                            this_face = None
+                        if this_face is not None:
+                            this_faces.append(this_face)
+                        line_counting_number += 1
+                        continue
+                    # endregion fast path for commands in mesh data blocks
+                    line_strip = line_bytes.decode("utf-8").strip()
+                    line_strip = line_strip.replace("\t", " ")
                     if (len(line_strip)>0) and (line_strip[0] != "#"):
                         if this_object is not None:
                             this_object.has_any_data_enable = True
@@ -518,14 +714,10 @@ class WObjFile:
                         args_string = ""
                         if space_index>-1:
                             command = line_strip[:space_index]
-                            if len(line_strip) >= (space_index+1):  # TODO: audit this weird check
-                                args_string = line_strip[space_index+1:].strip()
+                            args_string = line_strip[space_index+1:].strip()
                         else:
                             command = line_strip
-                        if len(args_string)>0:
-                            params = args_string.split(" ")  # line_strip[space_index+1:].strip()
-                        else:
-                            params = []
+                        params = [param.decode("utf-8") for param in parts[1:]]
                         if command=="mtllib":
                             this_mtl_filename = args_string
                             if (this_mtl_filename[:2]=="./") or (this_mtl_filename[:2]==".\\"):
@@ -544,7 +736,9 @@ class WObjFile:
                             if self.wmaterials is not None:
                                 print("[ WObjFile ] WARNING: wmaterial already " + \
                                       "initialized; overriding from '" + this_mtl_path + "'")
+                            mtl_start_s = best_timer()
                             self.wmaterials = get_wmaterial_dict_from_mtl(this_mtl_path)
+                            self.load_times['mtl'] += best_timer() - mtl_start_s
                         elif command=="o":
                             if len(params) > 0:
                                 this_o_name = params[0]  # this_object.name = params[0]
@@ -553,98 +747,8 @@ class WObjFile:
                                 group_names = params
                             else:
                                 group_names = ["default"]  # as per spec
-                        elif command=="v":
-                            if prev_usable_command != command:
-                                # this is non-spec to account for
-                                # non-spec v commands that aren't
-                                # preceded by `o` command
-                                if this_object is not None:
-                                    # NOTE: this_object.name is guaranteed
-                                    self.wobjects[this_object.name] = this_object
-                                    show_object_faces_msg(this_object, msg_filename)
-                                    this_object = None
-                                    #v_offset += len(this_object.vertices)
-                                    #vt_offset += len(this_object.texcoords)
-                                    #vn_offset += len(this_object.normals)
-                                if this_o_name is None: # do AFTER using name as key for adding previous object to self.wobjects
-                                    this_o_name = self._get_unused_wobject_key()
-                                    print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) `o` command should precede `v` command--compensating for out-of-spec obj file by using generated name '" + this_o_name + "'")
-                                v_map = dict()
-                                vt_map = dict()
-                                vn_map = dict()
-                                this_object = WObject()
-                                this_object.name = this_o_name
-                                this_o_name = None  # consume it
-                                this_vertex_group_type = None
-                                this_object.source_path = filename
-                                this_object.mtl_filename = this_mtl_filename
-                                this_wobject_v_count = 0
-                                this_wobject_vt_count = 0
-                                this_wobject_vn_count = 0
-                                if len(comments)>0:
-                                    for i in range(0,len(comments)):
-                                        this_object.append_opening_comment(comments[i])
-                                    #comments[:] = []
-                                    del comments[:]
-                                    #comments.clear()  # requires python 3.3 or later
-                            # NOTE: references a v by vertex# are relative to file instead of 'o', but this is detected & fixed at end of this method (for each object discovered) since file may not match spec
-                            if this_object.vertices is None:
-                                this_object.vertices = list()
-                            args = args_string.split(" ")
-                            result_v = (0.0, 0.0, 0.0)
-                            if len(args)>=7:
-                                result_v = get_fvec7(args)  #allow nonstandard x,y,z,r,g,b,a (position then color) format
-                            elif len(args)>=6:
-                                result_v = get_fvec6(args)  #allow nonstandard x,y,z,r,g,b (position then color) format
-                            elif len(args)>=3:
-                                result_v = get_fvec3(args)
-                            if len(args)!=3 and len(args)!=6 and len(args)!=7:
-                                print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT WARNING) vertex must have 3 total coordinate values (or 3 followed by 3 to 4 color channels for 6 to 7 total): '" + args_string + "'")
-                                if len(args)>=2:
-                                    result_v = get_fvec3( (args[0], 0.0, args[1]) )  #assume x,z for 2d vert
-                                if len(args)>=1:
-                                    result_v = get_fvec3( (args[0], 0.0, 0.0) )  #assume x,z for 2d vert
-                            # this_object.vertices.append(result_v)
-                            absolute_v_list.append(result_v)
-                            absolute_v_count += 1
-                            #v_offset += 1
                         elif this_object is not None:
-                            if command=="vt":
-                                args = args_string.split(" ")
-                                result_vt = (0.0, 0.0)
-                                if len(args)>=2:
-                                    result_vt = get_fvec2(args)
-                                if (self.texcoords_not_2_warning_enable):
-                                    if (len(args)!=2):
-                                        if (len(args)<2):
-                                            print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) texcoord missing coordinate (expected u v after vt but only got one param) so texture may not be applied correctly: '" + args_string + "'")
-                                        else:
-                                            if len(args)!=3:
-                                                print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) texcoords must have 2 (vt u v) or 3 (vt u v w) coordinates: '" + args_string + "'")
-                                            else:
-                                                print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT WARNING / NOT YET IMPLEMENTED) texcoord with 3 coordinates (vt u v w) so w may be ignored: '" + args_string + "'")
-                                        print("(this is the last texcoords input warning that will be shown)")
-                                        print("")
-                                        self.texcoords_not_2_warning_enable = False
-                                # this_object.texcoords.append(result_vt)
-                                absolute_vt_list.append(result_vt)
-                                absolute_vt_count += 1
-                                #still increment since is reference to index obj file:
-                                #vt_offset += 1
-
-                            elif command=="vn":
-                                # NOTE: presence of normals supercedes smoothing groups
-                                args = args_string.split(" ")
-                                result_vn = (0.0, 0.0, 0.0)
-                                if len(args)>=3:
-                                    result_vn = get_fvec3(args)
-                                if len(args)!=3:
-                                    print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) normal must have 3 coordinates: '" + args_string + "'")
-                                # this_object.normals.append(result_vn)
-                                absolute_vn_list.append(result_vn)
-                                absolute_vn_count += 1
-                                #vn_offset += 1
-                            elif command=="l":
+                            if command=="l":
                                 # polyline
                                 if this_object.polylines is None:
                                     this_object.polylines = []
@@ -662,16 +766,14 @@ class WObjFile:
                                     else:
                                         print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) line vertex number 0 in obj is nonstandard and will be skipped")
                                     if absolute_v_index is not None:
-                                        abs_v_i_s = str(absolute_v_index)
-                                        if abs_v_i_s in v_map:
+                                        if absolute_v_index in v_map:
+                                            vertex_number = v_map[absolute_v_index]
                                             absolute_v_index = None  # prevents copying same one to wobject again below
-                                            vertex_number = v_map[abs_v_i_s]
                                         else:
-                                            v_map[abs_v_i_s] = vertex_number
+                                            v_map[absolute_v_index] = vertex_number
                                     if absolute_v_index is not None:
                                         if this_object.vertices is None:
                                             this_object.vertices = list()
-                                        v_num_s = str(vertex_number)
                                         this_object.vertices.append(absolute_v_list[absolute_v_index])
                                         individuated_v_count += 1
                                         this_wobject_v_count += 1
@@ -680,139 +782,6 @@ class WObjFile:
                                     this_object.polylines.append(this_polyline)
                                 else:
                                     print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) bad polyline skipped (should have absolute counting number of existing vertex from 'v' command in file)")
-                            elif command=="f":
-                                if prev_usable_command != command:
-                                    if group_names is None:
-                                        group_names = ["default"]
-                                    if this_object.face_groups is None:
-                                        this_object.face_groups = {}
-                                    smoothing_key = smoothing_param
-                                    smoothing_mode = None
-                                    if smoothing_param is None or \
-                                       smoothing_param=="on" or \
-                                       smoothing_param=="off":
-                                        smoothing_key = this_object._get_unused_face_list_key()
-                                        smoothing_mode = smoothing_param
-                                    else:
-                                        smoothing_mode = "on"
-
-                                    if this_object.face_dicts is None:
-                                        this_object.face_dicts = {}
-                                    if smoothing_key not in this_object.face_dicts:
-                                        this_object.face_dicts[smoothing_key] = {}
-                                    this_object.face_dicts[smoothing_key]["s"] = smoothing_mode
-                                    this_object.face_dicts[smoothing_key]["faces"] = []
-                                    for group_name in group_names:
-                                        if group_name not in this_object.face_groups:
-                                            this_object.face_groups[group_name] = []
-                                        if not smoothing_key in this_object.face_groups[group_name]:
-                                            this_object.face_groups[group_name].append(smoothing_key)
-
-                                args = args_string.split(" ")
-                                this_face = []
-                                for i in range(0,len(args)):
-                                    absolute_v_index = None
-                                    absolute_vt_index = None
-                                    absolute_vn_index = None
-                                    vertex_number = None
-                                    texcoord_number = None
-                                    normal_number = None
-                                    values = args[i].split("/")
-                                    #subtract offsets from values since obj file not only uses counting numbers but also numbers unique in entire file (as opposed to starting over for each object):
-                                    if len(values)>=1:
-                                        values[FACE_V] = values[FACE_V].strip()
-                                        if len(values[FACE_V])>0:  # if not blank string
-                                            stated_v_number = int(values[FACE_V])
-                                            if stated_v_number>=1:
-                                                absolute_v_index = stated_v_number - 1
-                                                vertex_number = this_wobject_v_count  # ok since adding it below
-                                            elif stated_v_number<0:  # negative index is relative in obj standard
-                                                absolute_v_index = absolute_v_count + stated_v_number  # + since negative
-                                                vertex_number = this_wobject_v_count  # ok since adding it below
-                                            else:
-                                                print(msg_filename + " (" + str(line_counting_number) + ",0): (INPUT ERROR) vertex number 0 in obj is nonstandard and will be skipped")
-                                            if absolute_v_index is not None:
-                                                abs_v_i_s = str(absolute_v_index)
-                                                if abs_v_i_s in v_map:
-                                                    absolute_v_index = None  # prevents copying same one to wobject again below
-                                                    vertex_number = v_map[abs_v_i_s]
-                                                else:
-                                                    v_map[abs_v_i_s] = vertex_number
-                                    if len(values)>=2:
-                                        values[FACE_TC] = values[FACE_TC].strip()
-                                        if len(values[FACE_TC])>0:  # if not blank string
-                                            #texcoord_number = int(values[FACE_TC])-vt_offset
-                                            stated_texcoord_number = int(values[FACE_TC])
-                                            if stated_texcoord_number>=1:
-                                                absolute_vt_index = stated_texcoord_number - 1
-                                                texcoord_number = this_wobject_vt_count  # ok since adding it below
-                                            elif stated_texcoord_number<0:  # negative index is relative in obj standard
-                                                absolute_vt_index = absolute_v_count + stated_v_number  # + since negative
-                                                texcoord_number = this_wobject_vt_count  # ok since adding it below
-                                            else:
-                                                print(msg_filename + " (" + str(line_counting_number) + ",0): (PARSER WARNING) texcoord number 0 on obj is nonstandard and will be skipped")
-                                            if absolute_vt_index is not None:
-                                                abs_vt_i_s = str(absolute_vt_index)
-                                                if abs_vt_i_s in vt_map:
-                                                    absolute_vt_index = None  # prevents copying same one to wobject again below
-                                                    texcoord_number = vt_map[abs_vt_i_s]
-                                                else:
-                                                    vt_map[abs_vt_i_s] = texcoord_number
-                                    if len(values)>=3:
-                                        values[FACE_VN] = values[FACE_VN].strip()
-                                        if len(values[FACE_VN])>0:  # if not blank string
-                                            #normal_number = int(values[FACE_VN])-vn_offset
-                                            stated_normal_number = int(values[FACE_VN])
-                                            if stated_normal_number>=1:
-                                                absolute_vn_index = stated_normal_number - 1
-                                                normal_number = this_wobject_vn_count  # ok since adding it below
-                                            elif stated_normal_number<0:  # negative index is relative in obj standard
-                                                absolute_vn_index = absolute_vn_count + stated_normal_number  # + since negative
-                                                normal_number = this_wobject_vn_count  # ok since adding it below
-                                            else:
-                                                print(msg_filename + " (" + str(line_counting_number) + ",0): (PARSER WARNING) normal number 0 on obj is nonstandard and will be skipped")
-                                            if absolute_vn_index is not None:
-                                                abs_vn_i_s = str(absolute_vn_index)
-                                                if abs_vn_i_s in vn_map:
-                                                    absolute_vn_index = None  # prevents copying same one to wobject again below
-                                                    normal_number = vn_map[abs_vn_i_s]
-                                                else:
-                                                    vn_map[abs_vn_i_s] = normal_number
-                                    if absolute_v_index is not None:
-                                        if this_object.vertices is None:
-                                            this_object.vertices = list()
-                                        v_num_s = str(vertex_number)
-                                        this_object.vertices.append(absolute_v_list[absolute_v_index])
-                                        individuated_v_count += 1
-                                        this_wobject_v_count += 1
-                                    if absolute_vt_index is not None:
-                                        if this_object.texcoords is None:
-                                            this_object.texcoords = list()
-                                        vt_num_s = str(texcoord_number)
-                                        this_object.texcoords.append(absolute_vt_list[absolute_vt_index])
-                                        this_wobject_vt_count += 1
-                                    if absolute_vn_index is not None:
-                                        if this_object.normals is None:
-                                            this_object.normals = list()
-                                        vn_num_s = str(normal_number)
-                                        this_object.normals.append(absolute_vn_list[absolute_vn_index])
-                                        this_wobject_vn_count += 1
-                                    if texcoord_number_warning_enable:
-                                        if texcoord_number is None:
-                                            print(msg_filename + " (" + str(line_counting_number) + ",0): (PARSER WARNING) vertex texcoord_number is None when adding to face")
-                                            print("(this is the last texcoord_number warning that will be shown for this input file)")
-                                            print("")
-                                            texcoord_number_warning_enable = False
-                                    this_face.append([vertex_number,texcoord_number,normal_number])  # this is OBJ vertex_format
-                                this_object.face_dicts[smoothing_key]["faces"].append(this_face)
-                                if added_face_msg_enable:
-                                    # TODO: asdf this misses some meshes (or another part of this code does)
-                                    #print("added face to '" + str(this_object.name) + "' face list key '" + smoothing_key + "': " + str(this_face))
-                                    added_face_msg_enable = False
-                                    if not added_face_msg_enable:
-                                        #print("(this is the last face message that will be shown for this input file)")
-                                        #print("")
-                                        pass
                             elif command=="usemtl":
                                 if self.wmaterials is not None:
                                     if args_string in self.wmaterials.keys():
@@ -880,6 +849,94 @@ class WObjFile:
             if len(self.wobjects)<1:
                 print("[ WObjFile ] WARNING: " + f_name + " got 0 objects from '" + msg_filename + "'")
         #else ignore since already has file does not exist error
+        self.load_times['parse'] = (best_timer() - load_start_s
+                                    - self.load_times['read']
+                                    - self.load_times['mtl'])
+
+    # Load the values of the run of lines (such as of "v" commands)
+    # starting at the given line counting number into target (a list of
+    # tuples) and return how many lines were used (at least 1).
+    def _load_value_lines(self, lines, line_counting_number, command,
+                          target, msg_filename):
+        value_count = 3
+        if command == b"vt":
+            value_count = 2
+        start = line_counting_number - 1
+        end = start + 1
+        prefix = command + b" "
+        line_total = len(lines)
+        while end < line_total and lines[end].startswith(prefix):
+            end += 1
+        run_len = end - start
+        # Split the whole run at once, then check that every line had
+        # the usual value count (if so, every (value_count+1)th token
+        # is the command):
+        tokens = b" ".join(lines[start:end]).split()
+        stride = value_count + 1
+        if len(tokens) == run_len * stride and \
+                tokens[::stride].count(command) == run_len:
+            del tokens[::stride]
+            try:
+                values = iter(list(map(float, tokens)))
+                    # (a list, since the tuples need float objects
+                    # anyway and an array would unbox and rebox each)
+                # zip the same iterator to get value_count at a time:
+                target.extend(zip(*([values] * value_count)))
+                return run_len
+            except ValueError:
+                pass  # show the line number of the bad value below
+        # Otherwise, load each line separately (to handle nonstandard
+        # value counts, and to show the line number of any error):
+        for line_index in range(start, end):
+            parts = lines[line_index].split()
+            args_string = get_args_string(parts)
+            msg_prefix = (msg_filename + " (" + str(line_index+1) +
+                          ",0): ")
+            try:
+                values = tuple(map(float, parts[1:]))
+            except ValueError:
+                print(msg_prefix + "(INPUT ERROR) " + command.decode() +
+                      " has a value that is not a number, so using 0:"
+                      " '" + args_string + "'")
+                values = (0.0,) * value_count
+            if len(values) == value_count:
+                target.append(values)
+            elif command == b"v":
+                result_v = (0.0, 0.0, 0.0)
+                if len(values)>=7:
+                    result_v = values[:7]  #allow nonstandard x,y,z,r,g,b,a (position then color) format
+                elif len(values)>=6:
+                    result_v = values[:6]  #allow nonstandard x,y,z,r,g,b (position then color) format
+                elif len(values)>=3:
+                    result_v = values[:3]
+                elif len(values)>=1:
+                    result_v = (values[0], 0.0, 0.0)  #assume x for 1d or 2d vert
+                if len(values)!=6 and len(values)!=7:
+                    print(msg_prefix + "(INPUT WARNING) vertex must have 3 total coordinate values (or 3 followed by 3 to 4 color channels for 6 to 7 total): '" + args_string + "'")
+                target.append(result_v)
+            elif command == b"vt":
+                result_vt = (0.0, 0.0)
+                if len(values)>=2:
+                    result_vt = values[:2]
+                if (self.texcoords_not_2_warning_enable):
+                    if (len(values)<2):
+                        print(msg_prefix + "(INPUT ERROR) texcoord missing coordinate (expected u v after vt but only got one param) so texture may not be applied correctly: '" + args_string + "'")
+                    else:
+                        if len(values)!=3:
+                            print(msg_prefix + "(INPUT ERROR) texcoords must have 2 (vt u v) or 3 (vt u v w) coordinates: '" + args_string + "'")
+                        else:
+                            print(msg_prefix + "(INPUT WARNING / NOT YET IMPLEMENTED) texcoord with 3 coordinates (vt u v w) so w may be ignored: '" + args_string + "'")
+                    print("(this is the last texcoords input warning that will be shown)")
+                    print("")
+                    self.texcoords_not_2_warning_enable = False
+                target.append(result_vt)
+            else:
+                result_vn = (0.0, 0.0, 0.0)
+                if len(values)>=3:
+                    result_vn = values[:3]
+                print(msg_prefix + "(INPUT ERROR) normal must have 3 coordinates: '" + args_string + "'")
+                target.append(result_vn)
+        return run_len
 
     def _get_unused_wobject_key(self):
         # this_o_name = None